@@ -0,0 +1,106 @@
+"""
+Semeia a tabela transacoes com milhões de linhas e mostra o EXPLAIN ANALYZE das consultas do RepoTransacaoLeitura.
+
+Uso (contra um Postgres local, nunca produção):
+    DATABASE_URL=postgresql://... PYTHONPATH=$(pwd) poetry run python benchmarks/explain_transacoes.py --linhas 3000000
+"""
+
+from datetime import datetime
+from typing import List
+
+import dotenv
+import typer
+
+dotenv.load_dotenv(".env")
+
+from sqlalchemy import func, text  # noqa: E402
+
+from src.dominio.transacao.entidade import Transacao  # noqa: E402
+from src.dominio.transacao.tipos import TipoTransacao  # noqa: E402
+from src.infra.database.connection import engine, get_session, metadata  # noqa: E402
+from src.libs.tipos import Intervalo  # noqa: E402
+
+app = typer.Typer()
+
+INDICES = {
+    "ix_transacoes_usuario_id_caixa",
+    "ix_transacoes_usuario_id_tipo_caixa",
+    "ix_transacoes_lower_wamid",
+}
+
+
+def semear(linhas: int, usuarios: int) -> None:
+    with engine.begin() as conexao:
+        conexao.execute(
+            text(
+                "INSERT INTO usuarios (id, nome, sobrenome, telefone, email) "
+                "SELECT gen_random_uuid(), 'Bench', 'Mark', '55949' || lpad(i::text, 8, '0'), "
+                "'bench' || i || '@caderneta.chat' FROM generate_series(1, :usuarios) AS i"
+            ),
+            {"usuarios": usuarios},
+        )
+        conexao.execute(
+            text(
+                "INSERT INTO transacoes (id, usuario_id, valor, categoria, destino, tipo, caixa, competencia, wamid) "
+                "SELECT gen_random_uuid(), u.ids[1 + (i % array_length(u.ids, 1))], (random() * 1000)::numeric(10, 2), "
+                "'OUTROS', 'BENCH', CASE WHEN i % 2 = 0 THEN 'credito' ELSE 'debito' END, "
+                "now() - (random() * interval '730 days'), now(), 'wamid.' || md5(i::text) "
+                "FROM generate_series(1, :linhas) AS i, "
+                "(SELECT array_agg(id) AS ids FROM usuarios WHERE nome = 'Bench') AS u"
+            ),
+            {"linhas": linhas},
+        )
+        conexao.execute(text("ANALYZE transacoes"))
+
+
+def explain(consulta: str) -> List[str]:
+    with engine.connect() as conexao:
+        return [linha[0] for linha in conexao.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {consulta}")]
+
+
+def compilar(query) -> str:
+    return str(query.statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+@app.command()
+def main(linhas: int = 3_000_000, usuarios: int = 2_000, semear_dados: bool = True) -> None:
+    metadata.create_all(engine)
+    if semear_dados:
+        typer.echo(f"Semeando {linhas} transações para {usuarios} usuários...")
+        semear(linhas, usuarios)
+
+    session = get_session()
+    with engine.connect() as conexao:
+        usuario_id, wamid = conexao.execute(text("SELECT usuario_id, wamid FROM transacoes LIMIT 1")).one()
+
+    intervalo = Intervalo(datetime(datetime.now().year, 1, 1), datetime.now())
+    consultas = {
+        "buscar_por_intervalo_e_usuario": session.query(Transacao)
+        .filter(
+            Transacao.usuario_id == usuario_id,
+            Transacao.caixa >= intervalo.inicio,
+            Transacao.caixa <= intervalo.fim,
+        )
+        .order_by(Transacao.caixa),
+        "buscar_por_intervalo_usuario_e_tipo": session.query(Transacao)
+        .filter(
+            Transacao.usuario_id == usuario_id,
+            Transacao.caixa >= intervalo.inicio,
+            Transacao.caixa <= intervalo.fim,
+            Transacao.tipo == TipoTransacao.CREDITO,
+        )
+        .order_by(Transacao.caixa),
+        "buscar_por_wamid": session.query(Transacao).filter(
+            func.lower(Transacao.wamid) == func.lower(wamid), Transacao.usuario_id == usuario_id
+        ),
+    }
+
+    for nome, query in consultas.items():
+        plano = explain(compilar(query))
+        indices_usados = sorted(indice for indice in INDICES if any(indice in linha for linha in plano))
+        typer.echo(f"\n### {nome} -> índices: {', '.join(indices_usados) or 'nenhum (seq scan)'}")
+        typer.echo("\n".join(plano))
+
+
+if __name__ == "__main__":
+    app()
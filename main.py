@@ -10,6 +10,7 @@ from starlette.staticfiles import StaticFiles
 from src.dominio.assinatura.resources import StripeRouter
 from src.dominio.transacao.resources import TransacaoRouter
 from src.infra.middlewares.assinatura import AssinaturaMiddleware
+from src.infra.middlewares.sessao import SessaoMiddleware
 
 from src.infra.middlewares.whatsapp import WhatsAppOnboardMiddleware
 from src.dominio.bot.resources import BotRouter
@@ -44,6 +45,8 @@ app.add_middleware(
 
 app.add_middleware(WhatsAppOnboardMiddleware)
 app.add_middleware(AssinaturaMiddleware)
+# Por último para ficar por fora: os middlewares acima também usam a sessão da requisição
+app.add_middleware(SessaoMiddleware)
 
 app.include_router(BotRouter)
 app.include_router(UsuarioRouter)
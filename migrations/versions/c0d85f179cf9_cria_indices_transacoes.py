@@ -0,0 +1,78 @@
+"""cria indices transacoes
+
+Revision ID: c0d85f179cf9
+Revises: 739dfe8247d0
+Create Date: 2026-10-18 10:12:41.381502
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c0d85f179cf9"
+down_revision: Union[str, None] = "739dfe8247d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDICES = ("ix_transacoes_usuario_id_caixa", "ix_transacoes_usuario_id_tipo_caixa", "ix_transacoes_lower_wamid")
+
+
+def _descartar_indice_invalido(nome: str) -> None:
+    """
+    Um CREATE INDEX CONCURRENTLY interrompido deixa o índice marcado como INVALID. Ele continua existindo,
+    então o if_not_exists o pularia; por isso é removido antes de ser recriado.
+    """
+    invalido = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :nome AND NOT i.indisvalid"
+            ),
+            {"nome": nome},
+        )
+        .scalar()
+    )
+    if invalido:
+        op.drop_index(nome, table_name="transacoes", postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não roda dentro de transação; assim a tabela continua aceitando escritas durante a criação
+    with op.get_context().autocommit_block():
+        for nome in INDICES:
+            _descartar_indice_invalido(nome)
+
+        op.create_index(
+            "ix_transacoes_usuario_id_caixa",
+            "transacoes",
+            ["usuario_id", "caixa"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_transacoes_usuario_id_tipo_caixa",
+            "transacoes",
+            ["usuario_id", "tipo", "caixa"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_transacoes_lower_wamid",
+            "transacoes",
+            [sa.text("lower(wamid)")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_transacoes_lower_wamid", table_name="transacoes", postgresql_concurrently=True)
+        op.drop_index("ix_transacoes_usuario_id_tipo_caixa", table_name="transacoes", postgresql_concurrently=True)
+        op.drop_index("ix_transacoes_usuario_id_caixa", table_name="transacoes", postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""cria indices usuarios
+
+Revision ID: df3996e931ea
+Revises: c0d85f179cf9
+Create Date: 2026-10-18 15:02:17.204815
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "df3996e931ea"
+down_revision: Union[str, None] = "c0d85f179cf9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Falha se já houver telefone ou email duplicado; os duplicados precisam ser resolvidos antes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_usuarios_telefone",
+            "usuarios",
+            ["telefone"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_usuarios_email",
+            "usuarios",
+            ["email"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_usuarios_email", table_name="usuarios", postgresql_concurrently=True)
+        op.drop_index("ix_usuarios_telefone", table_name="usuarios", postgresql_concurrently=True)
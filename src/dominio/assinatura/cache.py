@@ -0,0 +1,144 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import inspect
+
+from src.dominio.assinatura.entidade import StatusAssinatura
+from src.dominio.assinatura.repo import RepoAssinaturaLeitura
+from src.dominio.usuario.entidade import Usuario
+from src.infra.cache import obter_redis
+from src.infra.database.connection import get_session
+from src.infra.log import setup_logging
+from src.utils.cache import CacheLRU
+
+logger = setup_logging()
+
+SEM_ASSINATURA = "nenhuma"
+
+
+@dataclass(frozen=True)
+class SituacaoAssinatura:
+    status: StatusAssinatura
+    stripe_id: str
+
+
+class CacheStatusAssinatura:
+    """
+    Status da assinatura de cada usuário, sem consultar `assinaturas` a cada requisição.
+
+    Se a busca do usuário já trouxe a assinatura (joinedload), ela é usada direto. O Redis guarda o status por
+    ASSINATURAS_CACHE_TTL e é invalidado pelos webhooks do Stripe; o LRU local tem TTL curto porque a
+    invalidação não alcança os outros processos.
+    """
+
+    PREFIXO = "assinaturas:usuario"
+
+    def __init__(self, ttl: Optional[int] = None, cache_local: Optional[CacheLRU[str]] = None) -> None:
+        self.ttl = ttl or int(os.getenv("ASSINATURAS_CACHE_TTL", 60 * 60))
+        self.cache_local = cache_local or CacheLRU(
+            tamanho_maximo=int(os.getenv("ASSINATURAS_CACHE_LOCAL_TAMANHO", 10_000)),
+            ttl=float(os.getenv("ASSINATURAS_CACHE_LOCAL_TTL", 30)),
+        )
+
+    def _chave(self, usuario_id: UUID) -> str:
+        return f"{self.PREFIXO}:{usuario_id}"
+
+    @staticmethod
+    def _serializar(situacao: Optional[SituacaoAssinatura]) -> str:
+        if situacao is None:
+            return SEM_ASSINATURA
+        return json.dumps({"status": situacao.status.value, "stripe_id": situacao.stripe_id})
+
+    @staticmethod
+    def _desserializar(valor: str) -> Optional[SituacaoAssinatura]:
+        if valor == SEM_ASSINATURA:
+            return None
+        dados = json.loads(valor)
+        return SituacaoAssinatura(status=StatusAssinatura(dados["status"]), stripe_id=dados["stripe_id"])
+
+    @staticmethod
+    def _consultar(usuario: Usuario) -> Optional[SituacaoAssinatura]:
+        if "assinatura" in inspect(usuario).unloaded:
+            assinatura = RepoAssinaturaLeitura(session=get_session()).buscar_por_id_usuario(usuario.id)
+        else:
+            assinatura = usuario.assinatura
+
+        if assinatura is None:
+            return None
+        return SituacaoAssinatura(status=assinatura.status, stripe_id=assinatura.stripe_id)
+
+    def obter(self, usuario: Usuario) -> Optional[SituacaoAssinatura]:
+        valor = self.cache_local.obter(usuario.id)
+        if valor is not None:
+            return self._desserializar(valor)
+
+        chave = self._chave(usuario.id)
+        try:
+            armazenado = obter_redis().get(chave)
+        except RedisError as erro:
+            logger.warning(f"Cache de assinaturas indisponível: {erro}")
+            return self._consultar(usuario)
+
+        if armazenado is not None:
+            valor = armazenado.decode()
+        else:
+            valor = self._serializar(self._consultar(usuario))
+            try:
+                obter_redis().set(chave, valor, ex=self.ttl)
+            except RedisError as erro:
+                logger.warning(f"Não foi possível salvar a assinatura no cache: {erro}")
+
+        self.cache_local.salvar(usuario.id, valor)
+        return self._desserializar(valor)
+
+    def invalidar(self, usuario_id: UUID) -> None:
+        self.cache_local.remover(usuario_id)
+        try:
+            obter_redis().delete(self._chave(usuario_id))
+        except RedisError as erro:
+            logger.warning(f"Não foi possível invalidar a assinatura do usuário {usuario_id}: {erro}")
+
+
+class JanelaAviso:
+    """
+    Libera um aviso por usuário a cada `janela` segundos (SET NX com TTL no Redis).
+
+    Sem Redis, o LRU local ainda segura a repetição dentro do mesmo processo. Se o aviso não chegar a ser
+    enviado, `devolver` reabre a janela para a próxima mensagem do usuário.
+    """
+
+    def __init__(self, nome: str, janela: int) -> None:
+        self.nome = nome
+        self.janela = janela
+        self.cache_local: CacheLRU[bool] = CacheLRU(tamanho_maximo=10_000, ttl=janela)
+
+    def _chave(self, usuario_id: UUID) -> str:
+        return f"avisos:{self.nome}:{usuario_id}"
+
+    def liberar(self, usuario_id: UUID) -> bool:
+        if self.cache_local.obter(usuario_id):
+            return False
+        self.cache_local.salvar(usuario_id, True)
+
+        try:
+            return bool(obter_redis().set(self._chave(usuario_id), 1, nx=True, ex=self.janela))
+        except RedisError as erro:
+            logger.warning(f"Janela de avisos indisponível: {erro}")
+            return True
+
+    def devolver(self, usuario_id: UUID) -> None:
+        self.cache_local.remover(usuario_id)
+        try:
+            obter_redis().delete(self._chave(usuario_id))
+        except RedisError as erro:
+            logger.warning(f"Não foi possível reabrir a janela de avisos do usuário {usuario_id}: {erro}")
+
+
+cache_status_assinatura = CacheStatusAssinatura()
+aviso_assinatura_cancelada = JanelaAviso(
+    "assinatura_cancelada", janela=int(os.getenv("ASSINATURAS_JANELA_AVISO", 60 * 60 * 24))
+)
@@ -1,8 +1,10 @@
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import select
+
 from src.dominio.assinatura.entidade import Assinatura
-from src.infra.database.repo import RepoLeitura
+from src.infra.database.repo import RepoLeitura, RepoLeituraAsync
 
 
 class RepoAssinaturaLeitura(RepoLeitura):
@@ -11,3 +13,11 @@ class RepoAssinaturaLeitura(RepoLeitura):
 
     def buscar_por_id_usuario(self, id_usuario: UUID) -> Assinatura:
         return self.session.query(Assinatura).filter(Assinatura.usuario_id == id_usuario).first()
+
+
+class RepoAssinaturaLeituraAsync(RepoLeituraAsync):
+    async def buscar_por_stripe_subscription_id(self, subscription_id: str) -> Optional[Assinatura]:
+        return await self.session.scalar(select(Assinatura).where(Assinatura.stripe_id == subscription_id).limit(1))
+
+    async def buscar_por_id_usuario(self, id_usuario: UUID) -> Optional[Assinatura]:
+        return await self.session.scalar(select(Assinatura).where(Assinatura.usuario_id == id_usuario).limit(1))
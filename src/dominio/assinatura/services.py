@@ -1,3 +1,4 @@
+import asyncio
 import os
 import traceback
 from datetime import datetime, timedelta
@@ -6,6 +7,7 @@ from typing import Dict, Any, Tuple
 import stripe
 from stripe import Customer, Subscription
 
+from src.dominio.assinatura.cache import aviso_assinatura_cancelada, cache_status_assinatura
 from src.dominio.assinatura.entidade import Assinatura, StatusAssinatura
 from src.dominio.assinatura.repo import RepoAssinaturaLeitura
 from src.dominio.bot.entidade import WhatsAppBot
@@ -40,6 +42,7 @@ async def handle_invoice_paid(invoice: Dict[str, Any]) -> None:
                 assinatura.registrar_pagamento()
                 uow.repo_escrita.adicionar(assinatura)
                 uow.commit()
+                cache_status_assinatura.invalidar(assinatura.usuario_id)
     except Exception as e:
         logger.error(f"Error processing paid invoice: {e}")
 
@@ -86,6 +89,7 @@ async def handle_subscription_updated(subscription: Dict[str, Any]) -> None:
 
             uow.repo_escrita.adicionar(assinatura)
             uow.commit()
+            cache_status_assinatura.invalidar(assinatura.usuario_id)
     except Exception as e:
         traceback.print_exc()
         logger.error(
@@ -104,7 +108,7 @@ async def handle_trial_will_end(subscription: Dict[str, Any]) -> None:
     mensagem += "🎁 Como cortesia, estamos oferecendo 15% de desconto na primeira mensalidade se você realizar a contratação nos próximos 3 dias. Não perca essa chance!\n\n"
     mensagem += "Quer saber mais detalhes ou tirar alguma dúvida? Estamos à disposição. Nos envie um email para contato@caderneta.chat"
 
-    bot.responder(mensagem, cliente.phone)
+    await bot.responder_async(mensagem, cliente.phone)
 
 
 EVENT_HANDLERS = {
@@ -165,6 +169,7 @@ def criar_assinatura_entidade(id_stripe: str, usuario: Usuario) -> Assinatura:
         uow.repo_escrita.adicionar(assinatura)
 
         uow.commit()
+        cache_status_assinatura.invalidar(usuario.id)
         return assinatura
 
 
@@ -174,3 +179,36 @@ def criar_customer_portal_link(subscription_id: str):
     link = stripe.billing_portal.Session.create(customer=customer_id, locale="pt-BR")
 
     return link
+
+
+async def avisar_assinatura_cancelada(bot: WhatsAppBot, usuario: Usuario) -> None:
+    """
+    Envia o link do portal do Stripe para quem tem a assinatura cancelada.
+
+    O status vem do cache de assinaturas; o link e a mensagem são gerados no máximo uma vez por
+    ASSINATURAS_JANELA_AVISO para cada usuário. Se o link ou o envio falhar, a janela é devolvida e o aviso
+    volta a ser tentado na próxima mensagem.
+    """
+    situacao = cache_status_assinatura.obter(usuario)
+    if situacao is None or situacao.status != StatusAssinatura.CANCELADA:
+        return
+    if not aviso_assinatura_cancelada.liberar(usuario.id):
+        return
+
+    try:
+        link = await asyncio.to_thread(criar_customer_portal_link, subscription_id=situacao.stripe_id)
+
+        mensagem = (
+            f"Olá, {usuario.nome}! 👋\n\n"
+            "Notamos que sua assinatura foi cancelada. 📅\n\n"
+            "Sentimos sua falta e gostaríamos de entender o motivo. "
+            "Há algo que possamos fazer para melhorar sua experiência?\n\n"
+            "Acesse o link abaixo e renove sua assinatura:\n"
+            f"{link.url}"
+            "Se quiser tirar dúvidas, entre em contato conosco: cadernetapp@gmail.com\n\n"
+        )
+
+        await bot.responder_async(mensagem, usuario.telefone)
+    except BaseException:
+        aviso_assinatura_cancelada.devolver(usuario.id)
+        raise
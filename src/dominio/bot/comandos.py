@@ -1,3 +1,4 @@
+import asyncio
 import calendar
 import logging
 import os
@@ -10,12 +11,15 @@ import dotenv
 
 from const import REGEX_WAMID, MENSAGEM_CADASTRO_BPO
 from src.dominio.bot.entidade import GerenciadorComandos
+from src.dominio.graficos.cache import cache_graficos
 from src.dominio.graficos.services import (
-    criar_grafico_fluxo_de_caixa,
-    criar_grafico_receitas_e_despesas,
-    criar_grafico_lucro,
+    criar_grafico_fluxo_de_caixa_async,
+    criar_grafico_receitas_e_despesas_async,
+    criar_grafico_lucro_async,
 )
 from src.dominio.transacao.entidade import Real
+from src.dominio.transacao.exportador import EXPORTADORES, para_registros
+from src.dominio.transacao.repo import RepoTransacaoLeitura
 from src.dominio.transacao.tipos import TipoTransacao
 from src.dominio.usuario.entidade import Usuario
 from src.dominio.usuario.onboard import UserContext, OnboardingState, UserData, Onboard
@@ -47,10 +51,12 @@ def ajuda(*args: List[str], **kwargs: Any) -> str:
 
 
 @bot.comando("listar fluxo", "Lista fluxo de caixa no mês", aliases=["fluxo", "fluxo mm/aa"])
-def listar_fluxo(*args: List[str], **kwargs: Any) -> str:
+async def listar_fluxo(*args: List[str], **kwargs: Any) -> str:
     usuario: Usuario = kwargs.get("usuario")
     intervalo = kwargs.get("intervalo") or intervalo_mes_atual()
-    transacoes = bot.repo_transacao_leitura.buscar_por_intervalo_e_usuario(usuario_id=usuario.id, intervalo=intervalo)
+    transacoes = await bot.ler_transacoes(
+        lambda repo: repo.buscar_por_intervalo_e_usuario(usuario_id=usuario.id, intervalo=intervalo)
+    )
 
     if not transacoes:
         return "Você ainda não registrou nenhuma despesa ou receita este mês"
@@ -64,28 +70,31 @@ def listar_fluxo(*args: List[str], **kwargs: Any) -> str:
 
 
 @bot.comando("grafico fluxo", "Devolve gráfico de fluxo de caixa do mês", aliases=["grafico fluxo mm/aa"])
-def grafico_fluxo(*args: List[str], **kwargs: Any) -> str:
+async def grafico_fluxo(*args: List[str], **kwargs: Any) -> str:
     uploader = Uploader()
     usuario: Usuario = kwargs.get("usuario")
     intervalo = kwargs.get("intervalo") or intervalo_mes_atual()
 
-    transacoes = bot.repo_transacao_leitura.buscar_por_intervalo_e_usuario_ordenando_por_data_e_valor(
-        usuario_id=usuario.id, intervalo=intervalo
-    )
+    chave_cache = cache_graficos.chave(usuario.id, "fluxo", intervalo)
+    if url_em_cache := cache_graficos.obter(chave_cache):
+        return url_em_cache
 
-    if not transacoes:
+    fluxo_diario = await bot.ler_transacoes(lambda repo: repo.fluxo_diario(usuario_id=usuario.id, intervalo=intervalo))
+
+    if not fluxo_diario:
         return "Você ainda não registrou nenhuma despesa ou receita este mês"
 
-    grafico = criar_grafico_fluxo_de_caixa(transacoes=transacoes)
+    grafico = await criar_grafico_fluxo_de_caixa_async(fluxo_diario=fluxo_diario)
     nome_arquivo = f"{grafico['nome_arquivo']}.png"
     caminho_arquivo: str = uploader.upload_file(nome_arquivo, grafico["dados"])
+    cache_graficos.salvar(chave_cache, caminho_arquivo)
     return caminho_arquivo
 
 
 @bot.comando(
     "receitas e despesas", "Devolve gráfico de receitas e despesas mo mês", aliases=["balanco", "balanco mm/aa"]
 )
-def grafico_balanco(*args: List[str], **kwargs: Any) -> str:
+async def grafico_balanco(*args: List[str], **kwargs: Any) -> str:
     now = datetime.now()
     uploader = Uploader()
     inicio = primeira_hora(now.replace(day=1))
@@ -99,37 +108,49 @@ def grafico_balanco(*args: List[str], **kwargs: Any) -> str:
     usuario: Usuario = kwargs.get("usuario")
     intervalo = kwargs.get("intervalo") or intervalo_mes_atual(inicio=inicio, fim=fim)
 
-    transacoes = bot.repo_transacao_leitura.buscar_por_intervalo_e_usuario(usuario_id=usuario.id, intervalo=intervalo)
+    chave_cache = cache_graficos.chave(usuario.id, "balanco", intervalo)
+    if url_em_cache := cache_graficos.obter(chave_cache):
+        return url_em_cache
 
-    if not transacoes:
+    totais_mensais = await bot.ler_transacoes(
+        lambda repo: repo.totais_mensais(usuario_id=usuario.id, intervalo=intervalo)
+    )
+
+    if not totais_mensais:
         return "Você ainda não registrou nenhuma despesa ou receita este mês"
 
-    grafico = criar_grafico_receitas_e_despesas(transacoes=transacoes)
+    grafico = await criar_grafico_receitas_e_despesas_async(totais_mensais=totais_mensais)
     nome_arquivo = f"{grafico['nome_arquivo']}.png"
 
     caminho_arquivo: str = uploader.upload_file(nome_arquivo, grafico["dados"])
+    cache_graficos.salvar(chave_cache, caminho_arquivo)
 
     return caminho_arquivo
 
 
 @bot.comando("lucro", "Gráfico de lucro, receitas e gastos")
-def lucro(*args: List[str], **kwargs: Any) -> str:
+async def lucro(*args: List[str], **kwargs: Any) -> str:
     usuario: Usuario = kwargs.get("usuario")
     intervalo = kwargs.get("intervalo") or intervalo_mes_atual()
     uploader = Uploader()
 
-    transacoes = bot.repo_transacao_leitura.buscar_por_intervalo_e_usuario(usuario_id=usuario.id, intervalo=intervalo)
+    chave_cache = cache_graficos.chave(usuario.id, "lucro", intervalo)
+    if url_em_cache := cache_graficos.obter(chave_cache):
+        return url_em_cache
 
-    if not transacoes:
+    resumo = await bot.ler_transacoes(lambda repo: repo.totais_periodo(usuario_id=usuario.id, intervalo=intervalo))
+
+    if not resumo.quantidade:
         return "Você ainda não registrou nenhuma despesa ou receita este mês"
 
-    grafico = criar_grafico_lucro(transacoes=transacoes)
-    nome_arquivo = f"{grafico['nome_arquivo']}.png"
+    grafico = await criar_grafico_lucro_async(resumo=resumo)
+    nome_arquivo = f"{grafico['nome_arquivo']}.{grafico['formato']}"
     caminho_arquivo: str = uploader.upload_file(nome_arquivo, grafico["dados"])
+    cache_graficos.salvar(chave_cache, caminho_arquivo)
     return caminho_arquivo
 
 
-@bot.comando(REGEX_WAMID, "Remove transação por wamid", oculto=True)
+@bot.comando(REGEX_WAMID, "Remove transação por wamid", oculto=True, padrao=True)
 def remover_transacao(*args: Tuple[str], **kwargs: Any) -> str:
     wamid_transacao = str(args[0])
     usuario: Usuario = kwargs.get("usuario")
@@ -137,10 +158,12 @@ def remover_transacao(*args: Tuple[str], **kwargs: Any) -> str:
 
     try:
         with uow:
-            transacao = bot.repo_transacao_leitura.buscar_por_wamid(wamid_transacao, usuario.id)
+            # lida pela sessão do primário: é ela que vai remover, e a transação pode ter acabado de ser criada
+            transacao = RepoTransacaoLeitura(session=uow.session).buscar_por_wamid(wamid_transacao, usuario.id)
 
             uow.repo_escrita.remover(transacao)
             uow.commit()
+        cache_graficos.invalidar(usuario.id)
         return "Lançamento removido com sucesso! ✅"
 
     except Exception as e:
@@ -148,30 +171,24 @@ def remover_transacao(*args: Tuple[str], **kwargs: Any) -> str:
         return "Não foi possível remover a transação."
 
 
-@bot.comando("exportar", "Exporta lançamento em formato excel")
-def exportar(*args: Tuple[str], **kwargs: Any) -> str:
-    import pandas as pd
-    from io import BytesIO
-    from datetime import datetime
-
+@bot.comando("exportar", "Exporta lançamentos em excel (ou csv/parquet: *exportar csv*)")
+async def exportar(*args: Tuple[str], **kwargs: Any) -> str:
     usuario: Usuario = kwargs.get("usuario")
 
     intervalo = kwargs.get("intervalo") or intervalo_mes_atual()
+    formato = next((str(arg).lower() for arg in args if str(arg).lower() in EXPORTADORES), "xlsx")
 
-    transacoes = bot.repo_transacao_leitura.buscar_por_intervalo_e_usuario(intervalo=intervalo, usuario_id=usuario.id)
-    dados = [transacao.dicionario() for transacao in transacoes]
-
-    df = pd.DataFrame(dados)
-    buffer = BytesIO()
-    df.to_excel(buffer, index=False, engine="openpyxl")
-    excel_bytes = buffer.getvalue()
-
-    nome_do_arquivo = f"lancamentos_{usuario.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xls"
+    nome_do_arquivo = f"lancamentos_{usuario.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
 
     uploader = Uploader()
-    url_arquivo: str = uploader.upload_file(nome_do_arquivo, excel_bytes)
+    linhas = bot.repo_transacao_leitura.iterar_por_intervalo_e_usuario(intervalo=intervalo, usuario_id=usuario.id)
+    try:
+        # as linhas são lidas do banco e gravadas no arquivo fora do event loop
+        await asyncio.to_thread(EXPORTADORES[formato], para_registros(linhas), uploader.caminho(nome_do_arquivo))
+    except ValueError as erro:
+        return str(erro)
 
-    return url_arquivo
+    return uploader.url(nome_do_arquivo)
 
 
 @bot.comando("adicionar bpo", "Atribui um usuário BPO ao cliente", aliases=["add bpo"])
@@ -0,0 +1,62 @@
+import os
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from src.infra.cache import obter_redis
+from src.infra.log import setup_logging
+from src.utils.cache import CacheLRU
+
+logger = setup_logging()
+
+
+class DeduplicadorWebhook:
+    """
+    Garante que cada mensagem do WhatsApp (pelo wamid) seja processada uma única vez.
+
+    A Meta reenvia a entrega quando não recebe 200 a tempo. O primeiro a chegar grava o wamid no Redis com
+    SET NX + TTL; os reenvios encontram a chave e são descartados antes de qualquer consulta ao banco ou ao
+    modelo. Um LRU em memória na frente responde os reenvios que caem no mesmo processo sem ir ao Redis.
+    Se o Redis estiver fora, a mensagem é processada: é melhor duplicar do que perder.
+    """
+
+    PREFIXO = "webhook:wamid"
+
+    def __init__(self, ttl: Optional[int] = None, cache_local: Optional[CacheLRU[bool]] = None) -> None:
+        self.ttl = ttl or int(os.getenv("WHATSAPP_DEDUP_TTL", 60 * 60 * 24))
+        self.cache_local = cache_local or CacheLRU(
+            tamanho_maximo=int(os.getenv("WHATSAPP_DEDUP_CACHE", 10_000)), ttl=self.ttl
+        )
+
+    def _chave(self, wamid: str) -> str:
+        return f"{self.PREFIXO}:{wamid}"
+
+    def primeira_entrega(self, wamid: Optional[str]) -> bool:
+        if not wamid:
+            return True
+        if self.cache_local.obter(wamid):
+            return False
+
+        try:
+            nova = bool(obter_redis().set(self._chave(wamid), 1, nx=True, ex=self.ttl))
+        except RedisError as erro:
+            logger.warning(f"Deduplicação de webhooks indisponível: {erro}")
+            nova = True
+
+        self.cache_local.salvar(wamid, True)
+        if not nova:
+            logger.info(f"Webhook duplicado descartado: {wamid}")
+        return nova
+
+    def liberar(self, wamid: Optional[str]) -> None:
+        """Desfaz a marcação quando o processamento falha, para que o reenvio da Meta seja aceito."""
+        if not wamid:
+            return
+        self.cache_local.remover(wamid)
+        try:
+            obter_redis().delete(self._chave(wamid))
+        except RedisError as erro:
+            logger.warning(f"Não foi possível liberar o wamid {wamid}: {erro}")
+
+
+deduplicador_webhook = DeduplicadorWebhook()
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 import json
 import logging
@@ -11,13 +12,16 @@ from collections import ChainMap
 from dataclasses import dataclass, field
 from datetime import datetime
 from email.generator import Generator
-from typing import Callable, Dict, List, Optional, Tuple, Iterator
+from typing import Any, Callable, Dict, List, Optional, Tuple, Iterator
 
 import httpx
 
 from src.dominio.bot.exceptions import ComandoDesconhecido, ErroAoEnviarMensagemWhatsApp
-from src.dominio.transacao.repo import RepoTransacaoLeitura
-from src.infra.database.connection import get_session
+from src.dominio.transacao.repo import RepoTransacaoLeitura, RepoTransacaoLeituraAsync
+from src.infra.database.connection_async import banco_async_disponivel
+from src.infra.database.replica import get_session_leitura, get_session_leitura_async
+from src.infra.database.uow import AsyncUnitOfWork
+from src.infra.http import obter_cliente_whatsapp
 from src.infra.log import setup_logging
 from src.utils.datas import intervalo_mes_atual, mes_e_ano_para_datetime
 from src.utils.formatos import is_valid_date_format
@@ -35,6 +39,12 @@ class BotBase(ABC):
     def enviar_mensagem_interativa(self, mensagem: dict) -> str | dict:
         pass
 
+    async def responder_async(self, mensagem: str, usuario: str) -> str | dict:
+        return self.responder(mensagem, usuario)
+
+    async def enviar_mensagem_interativa_async(self, mensagem: dict) -> str | dict:
+        return self.enviar_mensagem_interativa(mensagem)
+
 
 class CLIBot(BotBase):
     def responder(self, mensagem: str, usuario: str) -> str | dict:
@@ -50,82 +60,114 @@ class WhatsAppBot(BotBase):
         self.__token = os.getenv("META_TOKEN")
         self.__id_numero = os.getenv("ID_NUMERO")
 
+    @property
+    def _url_mensagens(self) -> str:
+        return f"{self.__url}/{self.__id_numero}/messages"
+
+    @property
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.__token}",
+            "Content-Type": "application/json",
+        }
+
     def responder(
         self, mensagem: str, telefone: str, wamid: Optional[str] = None, reacao: Optional[str] = None
     ) -> dict:
+        payload = self._montar_payload(mensagem, telefone, wamid, reacao)
+        return self.enviar_requisicao(self._url_mensagens, payload)
+
+    async def responder_async(
+        self, mensagem: str, telefone: str, wamid: Optional[str] = None, reacao: Optional[str] = None
+    ) -> dict:
+        payload = self._montar_payload(mensagem, telefone, wamid, reacao)
+        return await self.enviar_requisicao_async(self._url_mensagens, payload)
+
+    @staticmethod
+    def _montar_payload(mensagem: str, telefone: str, wamid: Optional[str], reacao: Optional[str]) -> dict:
         if reacao:
-            payload = {
+            return {
                 "messaging_product": "whatsapp",
                 "recipient_type": "individual",
                 "to": f"{telefone}",
                 "type": "reaction",
                 "reaction": {"message_id": f"{wamid}", "emoji": reacao},
             }
-        else:
+
+        payload = {
+            "messaging_product": "whatsapp",
+            "recipient_type": "individual",
+            "to": telefone,
+            "type": "text",
+            "text": {"body": f"{mensagem}"},
+        }
+        if wamid:
+            payload["context"] = {"message_id": wamid}
+        if mensagem.startswith("http"):
+            payload = {
+                "preview_url": True,
+                "messaging_product": "whatsapp",
+                "recipient_type": "individual",
+                "to": telefone,
+                "type": "image",
+                "image": {"link": mensagem},
+            }
+        if mensagem.startswith("http") and mensagem.endswith(".mp3"):
+            payload = {
+                "messaging_product": "whatsapp",
+                "recipient_type": "individual",
+                "to": telefone,
+                "type": "audio",
+                "audio": {"link": mensagem},
+            }
+        if mensagem.startswith("http") and mensagem.endswith((".xlsx", ".csv", ".parquet")):
+            extensao = mensagem.rsplit(".", 1)[-1]
             payload = {
                 "messaging_product": "whatsapp",
                 "recipient_type": "individual",
                 "to": telefone,
-                "type": "text",
-                "text": {"body": f"{mensagem}"},
+                "type": "document",
+                "document": {"filename": f"Exportação Lançamentos.{extensao}", "link": mensagem},
             }
-            if wamid:
-                payload["context"] = {"message_id": wamid}
-            if mensagem.startswith("http"):
-                payload = {
-                    "preview_url": True,
-                    "messaging_product": "whatsapp",
-                    "recipient_type": "individual",
-                    "to": telefone,
-                    "type": "image",
-                    "image": {"link": mensagem},
-                }
-            if mensagem.startswith("http") and mensagem.endswith(".mp3"):
-                payload = {
-                    "messaging_product": "whatsapp",
-                    "recipient_type": "individual",
-                    "to": telefone,
-                    "type": "audio",
-                    "audio": {"link": mensagem},
-                }
-            if mensagem.startswith("http") and mensagem.endswith(".xlsx"):
-                payload = {
-                    "messaging_product": "whatsapp",
-                    "recipient_type": "individual",
-                    "to": telefone,
-                    "type": "document",
-                    "document": {"filename": "Exportação Lançamentos.xlsx", "link": mensagem},
-                }
-            if mensagem.startswith("http") and "pdf" in mensagem:
-                payload = {
-                    "messaging_product": "whatsapp",
-                    "recipient_type": "individual",
-                    "to": telefone,
-                    "type": "document",
-                    "document": {"link": mensagem, "caption": "Aqui está a sua NF-e", "filename": "NF-e Caderneta.pdf"},
-                }
-        url: str = f"{self.__url}/{self.__id_numero}/messages"
-        return self.enviar_requisicao(url, payload)
+        if mensagem.startswith("http") and "pdf" in mensagem:
+            payload = {
+                "messaging_product": "whatsapp",
+                "recipient_type": "individual",
+                "to": telefone,
+                "type": "document",
+                "document": {"link": mensagem, "caption": "Aqui está a sua NF-e", "filename": "NF-e Caderneta.pdf"},
+            }
+        return payload
 
     def enviar_mensagem_interativa(self, mensagem: dict) -> dict:
-        url: str = f"{self.__url}/{self.__id_numero}/messages"
-        return self.enviar_requisicao(url, mensagem)
+        return self.enviar_requisicao(self._url_mensagens, mensagem)
+
+    async def enviar_mensagem_interativa_async(self, mensagem: dict) -> dict:
+        return await self.enviar_requisicao_async(self._url_mensagens, mensagem)
 
     def enviar_requisicao(self, url: str, payload: dict) -> dict:
         try:
-            headers = {
-                "Authorization": f"Bearer {self.__token}",
-                "Content-Type": "application/json",
-            }
-            resposta = httpx.post(url=str(url), data=payload, headers=headers)
-            erro = resposta.json().get("error")
-            if erro:
-                logger.error(json.dumps(erro, indent=2))
-                raise ErroAoEnviarMensagemWhatsApp("Houve um erro ao enviar mensagem para o usuário")
-            return {"status_code": resposta.status_code, "content": resposta.json()}
+            resposta = httpx.post(url=str(url), json=payload, headers=self._headers)
+            return self._tratar_resposta(resposta)
+        except Exception:
+            traceback.print_exc()
+
+    async def enviar_requisicao_async(self, url: str, payload: dict) -> dict:
+        try:
+            cliente = obter_cliente_whatsapp()
+            resposta = await cliente.post(url=str(url), json=payload, headers=self._headers)
+            return self._tratar_resposta(resposta)
         except Exception:
             traceback.print_exc()
 
+    @staticmethod
+    def _tratar_resposta(resposta: httpx.Response) -> dict:
+        erro = resposta.json().get("error")
+        if erro:
+            logger.error(json.dumps(erro, indent=2))
+            raise ErroAoEnviarMensagemWhatsApp("Houve um erro ao enviar mensagem para o usuário")
+        return {"status_code": resposta.status_code, "content": resposta.json()}
+
     def transcrever_audio(self, audio: str) -> str:
         import speech_recognition as sr
 
@@ -151,14 +193,30 @@ class WhatsAppBot(BotBase):
 
         return conteudo["url"]
 
+    async def obter_url_midia_async(self, midia_id: str) -> str:
+        headers = {"Authorization": f"Bearer {self.__token}"}
+        resposta = await obter_cliente_whatsapp().get(f"{self.__url}/{midia_id}", headers=headers)
+        conteudo = resposta.json()
+
+        return conteudo["url"]
+
     def download_imagem(self, url: str, telefone_usuario: str) -> str:
-        uploader = Uploader()
         headers = {"Authorization": f"Bearer {self.__token}"}
-        BUCKET = os.getenv("BUCKET", "/opt/caderneta/static")
         resposta = httpx.get(url=url, headers=headers)
+        return self._salvar_imagem(resposta.content, telefone_usuario)
+
+    async def download_imagem_async(self, url: str, telefone_usuario: str) -> str:
+        headers = {"Authorization": f"Bearer {self.__token}"}
+        resposta = await obter_cliente_whatsapp().get(url=url, headers=headers)
+        return self._salvar_imagem(resposta.content, telefone_usuario)
+
+    @staticmethod
+    def _salvar_imagem(conteudo: bytes, telefone_usuario: str) -> str:
+        uploader = Uploader()
+        BUCKET = os.getenv("BUCKET", "/opt/caderneta/static")
         filename = f"{telefone_usuario}-{uuid.uuid4()}.jpg"
 
-        uploader.upload_file(filename, resposta.content)
+        uploader.upload_file(filename, conteudo)
 
         caminho_imagem = os.path.join(BUCKET, filename)
 
@@ -166,24 +224,45 @@ class WhatsAppBot(BotBase):
 
     def download_audio(self, url) -> str:
         headers = {"Authorization": f"Bearer {self.__token}"}
-        BUCKET = os.getenv("BUCKET", "/opt/caderneta/static")
-        uploader = Uploader()
         resposta = httpx.get(url=url, headers=headers)
-        filename = f"{uuid.uuid4()}.wav"
-        filename_output = f"{uuid.uuid4()}.wav"
-        uploader.upload_file(filename, resposta.content)
+        caminho_audio, output = self._salvar_audio(resposta.content)
 
-        caminho_audio = os.path.join(BUCKET, filename)
-        output = os.path.join(BUCKET, filename_output)
+        subprocess.run(self._comando_ffmpeg(caminho_audio, output), check=True)
 
-        ffmpeg_command = ["ffmpeg", "-y", "-i", caminho_audio, "-ar", "16000", "-ac", "1", "-f", "wav", output]
+        os.remove(caminho_audio)
+
+        return output
+
+    async def download_audio_async(self, url: str) -> str:
+        headers = {"Authorization": f"Bearer {self.__token}"}
+        resposta = await obter_cliente_whatsapp().get(url=url, headers=headers)
+        caminho_audio, output = self._salvar_audio(resposta.content)
 
-        subprocess.run(ffmpeg_command, check=True)
+        processo = await asyncio.create_subprocess_exec(*self._comando_ffmpeg(caminho_audio, output))
+        codigo_saida = await processo.wait()
+        if codigo_saida != 0:
+            raise subprocess.CalledProcessError(codigo_saida, self._comando_ffmpeg(caminho_audio, output))
 
         os.remove(caminho_audio)
 
         return output
 
+    @staticmethod
+    def _salvar_audio(conteudo: bytes) -> Tuple[str, str]:
+        BUCKET = os.getenv("BUCKET", "/opt/caderneta/static")
+        uploader = Uploader()
+        filename = f"{uuid.uuid4()}.wav"
+        filename_output = f"{uuid.uuid4()}.wav"
+        uploader.upload_file(filename, conteudo)
+
+        caminho_audio = os.path.join(BUCKET, filename)
+        output = os.path.join(BUCKET, filename_output)
+        return caminho_audio, output
+
+    @staticmethod
+    def _comando_ffmpeg(caminho_audio: str, output: str) -> List[str]:
+        return ["ffmpeg", "-y", "-i", caminho_audio, "-ar", "16000", "-ac", "1", "-f", "wav", output]
+
 
 @dataclass
 class Comando:
@@ -198,11 +277,51 @@ class Comando:
         self.aliases = self.aliases
 
 
+class NoComando:
+    """Nó da trie de comandos: cada aresta é uma palavra do nome do comando."""
+
+    __slots__ = ("filhos", "comando")
+
+    def __init__(self) -> None:
+        self.filhos: Dict[str, "NoComando"] = {}
+        self.comando: Optional[Comando] = None
+
+
 class GerenciadorComandos:
+    """
+    Despacha mensagens para os comandos registrados.
+
+    Nomes e aliases ficam numa trie de palavras montada no registro, então achar o comando custa o número de
+    palavras do próprio comando, não importa quantos existam. Comandos registrados com `padrao=True` (ex.:
+    REGEX_WAMID) vão para uma tabela separada de regex já compiladas, consultada só quando a trie não encontra nada.
+    """
+
     def __init__(self) -> None:
         self.commands: Dict[str, Comando] = {}
         self.prefix = "!"
-        self.repo_transacao_leitura: RepoTransacaoLeitura = RepoTransacaoLeitura(session=get_session())
+        self._raiz = NoComando()
+        self._padroes: List[Tuple[re.Pattern, Comando]] = []
+        self._ajuda: Optional[str] = None
+
+    @property
+    def repo_transacao_leitura(self) -> RepoTransacaoLeitura:
+        """
+        Repositório de leitura do escopo atual (réplica, se configurada); o gerenciador é global e não pode
+        prender uma sessão.
+        """
+        return RepoTransacaoLeitura(session=get_session_leitura())
+
+    async def ler_transacoes(self, consulta: Callable[[Any], Any]) -> Any:
+        """
+        Executa `consulta` (que recebe o repositório de leitura de transações) sem bloquear o event loop.
+
+        Com o extra async instalado a consulta roda no RepoTransacaoLeituraAsync, sobre asyncpg, com a mesma
+        escolha entre réplica e primário; sem ele o repositório síncrono roda numa thread.
+        """
+        if banco_async_disponivel():
+            async with AsyncUnitOfWork(session_factory=get_session_leitura_async) as uow:
+                return await consulta(RepoTransacaoLeituraAsync(uow.session))
+        return await asyncio.to_thread(lambda: consulta(self.repo_transacao_leitura))
 
     def comando(
         self,
@@ -211,47 +330,46 @@ class GerenciadorComandos:
         icon: str = "",
         aliases: List[str] | None = None,
         oculto: bool = False,
+        padrao: bool = False,
     ) -> Callable[[Callable], Callable]:
         """Decorator to register commands"""
 
         def decorator(func: Callable):
             cmd = Comando(name, func, description, icon, aliases or [], oculto)
-            self.registrar_comando(cmd)
+            self.registrar_comando(cmd, padrao=padrao)
             return func
 
         return decorator
 
-    def registrar_comando(self, command: Comando):
+    def registrar_comando(self, command: Comando, padrao: bool = False):
         """Register a command and its aliases"""
         self.commands[command.name] = command
-        for alias in command.aliases or []:
-            self.commands[alias] = command
+        self._ajuda = None
 
-    async def processar_comando(self, message: str, **kwargs) -> str:
-        message = f"{self.prefix}{message}"
+        if padrao:
+            self._padroes.append((re.compile(command.name), command))
+            return
+
+        for nome in [command.name, *(command.aliases or [])]:
+            self.commands[nome] = command
+            no = self._raiz
+            for palavra in nome.lower().split():
+                no = no.filhos.setdefault(palavra, NoComando())
+            no.comando = command
 
-        message = message[len(self.prefix) :].strip()
+    async def processar_comando(self, message: str, **kwargs) -> str:
+        message = message.strip()
         parts = message.split()
         if not parts:
             return ""
 
-        command_name, args = self._extract_command_name_and_args(parts)
+        command, command_name, args = self._resolver(message, parts)
         mes_ano = list(filter(is_valid_date_format, args))
         if len(mes_ano) >= 1:
             mes_ano = mes_e_ano_para_datetime(mes_ano[0])
             intervalo = intervalo_mes_atual(mes_ano)
             kwargs = ChainMap(kwargs, {"intervalo": intervalo})
 
-        command = self.commands.get(command_name)
-        if not command:
-            for cmd_name, cmd in self.commands.items():
-                try:
-                    if re.match(cmd_name, command_name):
-                        command = cmd
-                        break
-                except Exception:
-                    continue
-
         if not command:
             if command_name:
                 logger.warning(f"Comando {command_name} não existe")
@@ -266,21 +384,35 @@ class GerenciadorComandos:
             traceback.print_exc()
             return f"Erro ao executar comando {command_name}. Tente novamente."
 
-    def _extract_command_name_and_args(self, parts: List[str]) -> Tuple[Optional[str], List[str]]:
-        """Extrai nome do comando (incluindo comandos com múltiplas palavras) e seus argumentos"""
-        for i in range(len(parts), 0, -1):
-            command_name = " ".join(parts[:i]).lower()
-            eh_remocao_de_transacao = command_name.startswith("wamid")
-
-            if eh_remocao_de_transacao:
-                return command_name, [command_name]
-
-            if command_name in self.commands:
-                return command_name, parts[i:]
-        return None, []
+    def _resolver(self, message: str, parts: List[str]) -> Tuple[Optional[Comando], Optional[str], List[str]]:
+        """Acha o comando de nome mais longo que prefixa a mensagem; sem nome, tenta os padrões compilados."""
+        command, tamanho = self._extract_command_name_and_args(parts)
+        if command:
+            return command, " ".join(parts[:tamanho]).lower(), parts[tamanho:]
+
+        texto = message.lower()
+        for padrao, cmd in self._padroes:
+            if padrao.match(texto):
+                return cmd, texto, [texto]
+        return None, None, []
+
+    def _extract_command_name_and_args(self, parts: List[str]) -> Tuple[Optional[Comando], int]:
+        """Percorre a trie com as palavras da mensagem e devolve o comando mais longo encontrado"""
+        no = self._raiz
+        encontrado: Tuple[Optional[Comando], int] = (None, 0)
+        for indice, palavra in enumerate(parts, start=1):
+            no = no.filhos.get(palavra.lower())
+            if no is None:
+                break
+            if no.comando is not None:
+                encontrado = (no.comando, indice)
+        return encontrado
 
     def ajuda(self) -> str:
-        """Gera ajuda listando todos os comandos"""
+        """Gera ajuda listando todos os comandos; o texto só é refeito quando um comando novo é registrado"""
+        if self._ajuda is not None:
+            return self._ajuda
+
         help_text = "Por aqui consigo te ajudar com os seguintes comandos:\n\n"
         unique_commands = {cmd.name: cmd for cmd in self.commands.values()}
         for cmd in unique_commands.values():
@@ -289,4 +421,5 @@ class GerenciadorComandos:
                 help_text += f"*{cmd.name}*: {cmd.description}{aliases}\n"
 
         help_text += "\n\nAlém disso, você pode registrar suas receitas e despesas de forma simples.\nEx: *paguei 1350 aluguel* ou *vendi 2300 de buffet*"
+        self._ajuda = help_text
         return help_text
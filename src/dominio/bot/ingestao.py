@@ -0,0 +1,194 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.dominio.assinatura.services import avisar_assinatura_cancelada
+from src.dominio.bot.deduplicacao import deduplicador_webhook
+from src.dominio.bot.entidade import WhatsAppBot
+from src.dominio.bot.services import atender_mensagem_whatsapp, responder_onboarding
+from src.dominio.usuario.cache import cache_usuarios
+from src.dominio.usuario.entidade import Usuario
+from src.dominio.usuario.repo import RepoUsuarioLeitura
+from src.infra.database.connection import escopo_sessao, get_session
+from src.infra.database.replica import escopo_usuario
+from src.infra.log import setup_logging
+from src.infra.metricas import MetricaTempo
+from src.utils.whatsapp_api import WhatsAppPayload, iterar_mensagens_whatsapp
+
+logger = setup_logging()
+
+Processador = Callable[[List[WhatsAppPayload]], Awaitable[None]]
+
+
+def mensagens_novas(dados: Dict[str, Any]) -> List[WhatsAppPayload]:
+    """Mensagens do webhook que ainda não foram vistas; reenvios e callbacks de status ficam de fora."""
+    return [
+        mensagem
+        for mensagem in iterar_mensagens_whatsapp(dados)
+        if deduplicador_webhook.primeira_entrega(mensagem.wamid)
+    ]
+
+
+async def _avisar_assinatura(bot: WhatsAppBot, usuario: Usuario) -> None:
+    try:
+        await avisar_assinatura_cancelada(bot, usuario)
+    except Exception as erro:
+        logger.error(f"Erro ao verificar a assinatura do usuário {usuario.id}: {erro}", exc_info=True)
+
+
+async def processar_mensagens(mensagens: List[WhatsAppPayload]) -> None:
+    """
+    Atende um lote de mensagens do WhatsApp, na ordem em que chegaram.
+
+    Os usuários do lote são resolvidos de uma vez pelo cache de usuários, que só consulta o banco (numa query
+    só) para os telefones que não conhece. A falha de uma mensagem não impede as demais: o usuário recebe o
+    aviso de erro, o wamid é liberado para um eventual reenvio e, ao final, as falhas sobem juntas num
+    ExceptionGroup. Se a própria busca dos usuários falhar, todos os wamids do lote são liberados.
+
+    Antes de atender um usuário cadastrado, quem tem a assinatura cancelada recebe o link do portal do Stripe
+    (no máximo uma vez por janela); uma falha nesse aviso não impede o atendimento.
+    """
+    if not mensagens:
+        return
+
+    try:
+        bot = WhatsAppBot()
+        repo = RepoUsuarioLeitura(session=get_session())
+        usuarios = cache_usuarios.buscar_por_telefones(repo, {mensagem.telefone for mensagem in mensagens})
+    except Exception:
+        # Nenhuma mensagem foi atendida: os wamids voltam a ficar livres para o reenvio da Meta
+        for mensagem in mensagens:
+            deduplicador_webhook.liberar(mensagem.wamid)
+        raise
+
+    em_onboarding = set()
+    erros: List[Exception] = []
+
+    for mensagem in mensagens:
+        telefone = mensagem.telefone
+        try:
+            usuario = usuarios.get(telefone)
+            if usuario is None and telefone in em_onboarding:
+                # a mensagem anterior pode ter concluído o cadastro
+                usuario = usuarios[telefone] = cache_usuarios.buscar_por_telefone(repo, telefone)
+
+            if usuario is None:
+                em_onboarding.add(telefone)
+                await responder_onboarding(bot, telefone, mensagem.mensagem)
+            else:
+                with escopo_usuario(usuario.id):
+                    await _avisar_assinatura(bot, usuario)
+                    await atender_mensagem_whatsapp(bot, usuario, mensagem)
+        except Exception as erro:
+            logger.error(f"Erro ao processar a mensagem {mensagem.wamid}: {erro}", exc_info=True)
+            deduplicador_webhook.liberar(mensagem.wamid)
+            await bot.responder_async(
+                "Ocorreu um erro desconhecido. Se o erro persistir, envie um email para cadernetapp@gmail.com",
+                telefone,
+            )
+            erros.append(erro)
+
+    if erros:
+        raise ExceptionGroup(f"{len(erros)} de {len(mensagens)} mensagens do webhook falharam", erros)
+
+
+class FilaWebhook:
+    """
+    Fila em memória entre o webhook e o processamento das mensagens.
+
+    Com WHATSAPP_INGESTAO=fila o webhook só separa as mensagens novas do payload, enfileira o lote e responde
+    200 para a Meta, que assim não reenvia a entrega por demora. WHATSAPP_WORKERS tarefas consomem a fila no
+    mesmo event loop. Se a fila estiver cheia (WHATSAPP_FILA_MAXIMA) o webhook responde 503 e a Meta tenta de
+    novo mais tarde.
+
+    A fila não sobrevive a um restart: o encerramento espera os itens pendentes por até `prazo_encerramento`.
+    """
+
+    def __init__(
+        self,
+        processador: Processador = processar_mensagens,
+        workers: Optional[int] = None,
+        tamanho_maximo: Optional[int] = None,
+    ) -> None:
+        self.processador = processador
+        self.workers = workers or int(os.getenv("WHATSAPP_WORKERS", 4))
+        self.tamanho_maximo = tamanho_maximo or int(os.getenv("WHATSAPP_FILA_MAXIMA", 1000))
+        self._fila: Optional[asyncio.Queue[Tuple[float, List[WhatsAppPayload]]]] = None
+        self._tarefas: List[asyncio.Task] = []
+        self.espera = MetricaTempo()
+        self.processamento = MetricaTempo()
+        self.enfileiradas = 0
+        self.rejeitadas = 0
+        self.falhas = 0
+
+    @staticmethod
+    def ativa() -> bool:
+        return os.getenv("WHATSAPP_INGESTAO", "sincrona").lower() == "fila"
+
+    @property
+    def iniciada(self) -> bool:
+        return self._fila is not None
+
+    def iniciar(self) -> None:
+        if self.iniciada:
+            return
+        self._fila = asyncio.Queue(maxsize=self.tamanho_maximo)
+        self._tarefas = [asyncio.create_task(self._consumir(indice)) for indice in range(self.workers)]
+        logger.info(f"Fila de webhooks iniciada com {self.workers} workers")
+
+    def enfileirar(self, dados: List[WhatsAppPayload]) -> bool:
+        if self._fila is None:
+            raise RuntimeError("Fila de webhooks não iniciada")
+        try:
+            self._fila.put_nowait((time.monotonic(), dados))
+        except asyncio.QueueFull:
+            self.rejeitadas += 1
+            logger.warning(f"Fila de webhooks cheia ({self.tamanho_maximo}); entrega recusada")
+            return False
+        self.enfileiradas += 1
+        return True
+
+    async def _consumir(self, indice: int) -> None:
+        assert self._fila is not None
+        while True:
+            enfileirado_em, dados = await self._fila.get()
+            inicio = time.monotonic()
+            self.espera.registrar(inicio - enfileirado_em)
+            try:
+                with escopo_sessao():
+                    await self.processador(dados)
+            except Exception as erro:
+                self.falhas += 1
+                logger.error(f"Worker {indice} falhou ao processar webhook: {erro}", exc_info=True)
+            finally:
+                self.processamento.registrar(time.monotonic() - inicio)
+                self._fila.task_done()
+
+    async def encerrar(self, prazo_encerramento: float = 10) -> None:
+        if self._fila is None:
+            return
+        try:
+            await asyncio.wait_for(self._fila.join(), timeout=prazo_encerramento)
+        except asyncio.TimeoutError:
+            logger.warning(f"Encerrando com {self._fila.qsize()} webhooks não processados")
+
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._fila, self._tarefas = None, []
+
+    def metricas(self) -> Dict[str, Any]:
+        return {
+            "ativa": self.iniciada,
+            "workers": self.workers,
+            "profundidade": self._fila.qsize() if self._fila is not None else 0,
+            "enfileiradas": self.enfileiradas,
+            "rejeitadas": self.rejeitadas,
+            "falhas": self.falhas,
+            "espera": self.espera.resumo(),
+            "processamento": self.processamento.resumo(),
+        }
+
+
+fila_webhook = FilaWebhook()
@@ -1,20 +1,15 @@
 import logging
 import os
-import traceback
-from typing import Any
+import secrets
+from typing import Optional
 
 from starlette.exceptions import HTTPException
 from starlette.responses import Response, JSONResponse
 
-from src.dominio.bot.entidade import WhatsAppBot
-from src.dominio.bot.services import responder_usuario
-from fastapi import APIRouter, status, Request
-
-from src.infra.aws import upload_to_s3
-from src.infra.database.connection import get_session
-from src.infra.database.uow import UnitOfWork
-from src.utils.validadores import limpar_texto
-from src.utils.whatsapp_api import WhatsAppPayload
+from src.dominio.bot.ingestao import fila_webhook, processar_mensagens
+from src.dominio.processamento.cascata import cascata_classificacao
+from src.infra.database.connection import SessionReplica, engine_replica, metricas_pool
+from fastapi import APIRouter, Header, status, Request
 
 BotRouter = APIRouter(prefix="/bot", tags=["twilio", "whatsapp"])
 
@@ -38,41 +33,29 @@ async def verificacao_whatsapp_webhook(request: Request, response: Response) ->
         raise HTTPException(status_code=500, detail="Erro ao verificar WhatsApp API")
 
 
-@BotRouter.post("/whatsapp", status_code=status.HTTP_200_OK)
-async def whatsapp_webhook(request: Request) -> Any:
-    uow = UnitOfWork(session_factory=get_session)
-    bot = WhatsAppBot()
-    usuario = request.state.usuario
-    dados_whatsapp: WhatsAppPayload = request.state.dados_whatsapp
-
-    mensagem = dados_whatsapp.mensagem
-    if dados_whatsapp.audio:
-        bot.responder(mensagem="Aguarde um momento. Estou processando seu áudio...", telefone=dados_whatsapp.telefone)
-        audio_url = bot.obter_url_midia(dados_whatsapp.audio)
-        audio = bot.download_audio(audio_url)
-        mensagem = limpar_texto(bot.transcrever_audio(audio))
-
-    if dados_whatsapp.imagem:
-        try:
-            bucket = os.getenv("INVOICE_BUCKET")
-            bot.responder(
-                mensagem="Aguarde um momento. Estou processando sua imagem...", telefone=dados_whatsapp.telefone
-            )
-            imagem_url = bot.obter_url_midia(dados_whatsapp.imagem)
-            imagem = bot.download_imagem(imagem_url, dados_whatsapp.telefone)
-            filename = imagem.split("/")[-1]
-            upload_to_s3(imagem, bucket, filename)
-            return
+def autorizar_metricas(authorization: Optional[str]) -> None:
+    """As métricas expõem o estado interno do serviço: só respondem com METRICAS_TOKEN no Bearer."""
+    token = os.getenv("METRICAS_TOKEN")
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if not authorization or not secrets.compare_digest(authorization, f"Bearer {token}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+
+@BotRouter.get("/metricas", status_code=status.HTTP_200_OK)
+async def metricas(authorization: Optional[str] = Header(default=None)) -> JSONResponse:
+    autorizar_metricas(authorization)
+    return JSONResponse(
+        content={
+            "classificacao": cascata_classificacao.estatisticas(),
+            "fila_webhook": fila_webhook.metricas(),
+            "pool_banco": metricas_pool(),
+            "pool_replica": metricas_pool(engine_replica, SessionReplica) if engine_replica is not None else None,
+        }
+    )
 
-        except Exception:
-            traceback.format_exc()
 
-    resposta = await responder_usuario(
-        mensagem=mensagem,
-        usuario=usuario,
-        uow=uow,
-        robo=bot,
-        telefone=dados_whatsapp.telefone,
-        dados_whatsapp=dados_whatsapp,
-    )
-    return resposta
+@BotRouter.post("/whatsapp", status_code=status.HTTP_200_OK)
+async def whatsapp_webhook(request: Request) -> JSONResponse:
+    await processar_mensagens(request.state.mensagens_whatsapp)
+    return JSONResponse(content={"status": "processed"})
@@ -1,15 +1,20 @@
 import logging
+import os
 import traceback
 from typing import Any, Optional
 
 from src.dominio.bot.comandos import bot
-from src.dominio.bot.entidade import BotBase
+from src.dominio.bot.entidade import BotBase, WhatsAppBot
 from src.dominio.bot.exceptions import ComandoDesconhecido
-from src.dominio.processamento.entidade import ClassificadorTexto
+from src.dominio.processamento.cascata import cascata_classificacao
 from src.dominio.processamento.exceptions import NaoEhTransacao
-from src.dominio.transacao.services import comando_criar_transacao
+from src.dominio.transacao.services import comando_criar_transacao_async
 from src.dominio.usuario.entidade import Usuario
+from src.dominio.usuario.onboard import Onboard
+from src.infra.aws import upload_to_s3
+from src.infra.database.connection import get_session
 from src.infra.database.uow import UnitOfWork
+from src.utils.validadores import limpar_texto
 from src.utils.whatsapp_api import WhatsAppPayload
 
 
@@ -23,12 +28,12 @@ async def responder_usuario(
 ) -> Any:
     try:
         resposta = await bot.processar_comando(mensagem, nome_usuario=usuario.nome, usuario=usuario, uow=uow)
-        return robo.responder(resposta, telefone)
+        return await robo.responder_async(resposta, telefone)
 
     except ComandoDesconhecido:
         comandos = mensagem.split(" ")
         if len(comandos) == 1:
-            return robo.responder(
+            return await robo.responder_async(
                 f"Comando {comandos[0]} não existe\n\nDigite *ajuda* e veja os comandos disponíveis.", telefone
             )
 
@@ -38,16 +43,63 @@ async def responder_usuario(
             if not tem_numero:
                 raise NaoEhTransacao()
 
-            classifier = ClassificadorTexto()
-            tipo, _ = classifier.classificar_mensagem(mensagem)
+            tipo, _ = await cascata_classificacao.classificar(mensagem)
             if tipo == "debito" or tipo == "credito":
-                resposta = comando_criar_transacao(usuario, tipo.upper(), mensagem, uow, telefone, dados_whatsapp)
+                resposta = await comando_criar_transacao_async(
+                    usuario, tipo.upper(), mensagem, uow, telefone, dados_whatsapp
+                )
 
-                return robo.enviar_mensagem_interativa(resposta)
+                return await robo.enviar_mensagem_interativa_async(resposta)
         except NaoEhTransacao:
-            robo.responder("Não entendi sua mensagem 🫤", telefone)
-            robo.responder(bot.ajuda(), telefone)
+            await robo.responder_async("Não entendi sua mensagem 🫤", telefone)
+            await robo.responder_async(bot.ajuda(), telefone)
 
     except Exception:
         traceback.print_exc()
-        return robo.responder("Ocorreu um erro desconhecido. Por favor, tente novamente.", telefone)
+        return await robo.responder_async("Ocorreu um erro desconhecido. Por favor, tente novamente.", telefone)
+
+
+async def atender_mensagem_whatsapp(robo: WhatsAppBot, usuario: Usuario, dados_whatsapp: WhatsAppPayload) -> Any:
+    """Trata uma mensagem de um usuário já cadastrado: áudio, imagem de nota fiscal, comando ou transação."""
+    uow = UnitOfWork(session_factory=get_session)
+
+    mensagem = dados_whatsapp.mensagem
+    if dados_whatsapp.audio:
+        await robo.responder_async(
+            mensagem="Aguarde um momento. Estou processando seu áudio...", telefone=dados_whatsapp.telefone
+        )
+        audio_url = await robo.obter_url_midia_async(dados_whatsapp.audio)
+        audio = await robo.download_audio_async(audio_url)
+        mensagem = limpar_texto(robo.transcrever_audio(audio))
+
+    if dados_whatsapp.imagem:
+        try:
+            bucket = os.getenv("INVOICE_BUCKET")
+            await robo.responder_async(
+                mensagem="Aguarde um momento. Estou processando sua imagem...", telefone=dados_whatsapp.telefone
+            )
+            imagem_url = await robo.obter_url_midia_async(dados_whatsapp.imagem)
+            imagem = await robo.download_imagem_async(imagem_url, dados_whatsapp.telefone)
+            filename = imagem.split("/")[-1]
+            upload_to_s3(imagem, bucket, filename)
+            return
+
+        except Exception:
+            traceback.format_exc()
+
+    return await responder_usuario(
+        mensagem=mensagem,
+        usuario=usuario,
+        uow=uow,
+        robo=robo,
+        telefone=dados_whatsapp.telefone,
+        dados_whatsapp=dados_whatsapp,
+    )
+
+
+async def responder_onboarding(robo: BotBase, telefone: str, mensagem: str) -> Any:
+    """Conduz o cadastro de quem ainda não é usuário, uma pergunta por mensagem."""
+    uow = UnitOfWork(session_factory=get_session)
+    onboard = Onboard(uow=uow)
+    pergunta_onboard = onboard.handle_message(telefone, mensagem)
+    return await robo.responder_async(pergunta_onboard, telefone)
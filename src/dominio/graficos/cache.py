@@ -0,0 +1,64 @@
+import os
+from typing import Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from src.infra.cache import obter_redis
+from src.infra.log import setup_logging
+from src.libs.tipos import Intervalo
+
+logger = setup_logging()
+
+
+class CacheGraficos:
+    """
+    Guarda a URL de gráficos já renderizados e enviados para o bucket.
+
+    A chave inclui uma versão por usuário, incrementada a cada lançamento criado ou removido. Assim, qualquer
+    alteração nos dados do usuário torna as chaves antigas inalcançáveis, que depois expiram pelo TTL.
+    Falhas no Redis nunca interrompem o comando: o gráfico apenas é gerado novamente.
+    """
+
+    PREFIXO = "graficos"
+
+    def __init__(self, ttl: int | None = None) -> None:
+        self.ttl = ttl or int(os.getenv("GRAFICOS_CACHE_TTL", 60 * 60 * 24))
+
+    def _chave_versao(self, usuario_id: UUID) -> str:
+        return f"{self.PREFIXO}:versao:{usuario_id}"
+
+    def chave(self, usuario_id: UUID, tipo: str, intervalo: Intervalo) -> Optional[str]:
+        try:
+            versao = int(obter_redis().get(self._chave_versao(usuario_id)) or 0)
+        except RedisError as erro:
+            logger.warning(f"Cache de gráficos indisponível: {erro}")
+            return None
+        return f"{self.PREFIXO}:{usuario_id}:{tipo}:{intervalo.inicio.isoformat()}:{intervalo.fim.isoformat()}:{versao}"
+
+    def obter(self, chave: Optional[str]) -> Optional[str]:
+        if chave is None:
+            return None
+        try:
+            url = obter_redis().get(chave)
+        except RedisError as erro:
+            logger.warning(f"Cache de gráficos indisponível: {erro}")
+            return None
+        return url.decode() if url else None
+
+    def salvar(self, chave: Optional[str], url: str) -> None:
+        if chave is None:
+            return
+        try:
+            obter_redis().set(chave, url, ex=self.ttl)
+        except RedisError as erro:
+            logger.warning(f"Não foi possível salvar gráfico no cache: {erro}")
+
+    def invalidar(self, usuario_id: UUID) -> None:
+        try:
+            obter_redis().incr(self._chave_versao(usuario_id))
+        except RedisError as erro:
+            logger.warning(f"Não foi possível invalidar o cache de gráficos do usuário {usuario_id}: {erro}")
+
+
+cache_graficos = CacheGraficos()
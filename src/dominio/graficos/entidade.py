@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import os
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 from io import BytesIO
@@ -8,21 +10,29 @@ from typing import List, TypedDict, Literal, Any, Dict
 from PIL import Image, ImageDraw, ImageFont
 from plotly import graph_objects as go
 
-from src.dominio.transacao.entidade import Real, Transacao
-from src.dominio.transacao.tipos import TipoTransacao
+from src.dominio.graficos.renderizador import renderizador_graficos
+from src.dominio.transacao.entidade import Real, ResumoPeriodo
 
 BUCKET = os.getenv("BUCKET")
 
 
 class GraficoConfig:
-    def __init__(self, titulo: str, formato: Literal["png", "svg", "html"] = "png"):
+    def __init__(
+        self,
+        titulo: str,
+        formato: Literal["png", "svg", "html", "jpeg"] = "png",
+        compressao: int = 6,
+        qualidade: int = 80,
+    ):
         self.titulo = titulo
         self.formato = formato
+        self.compressao = compressao
+        self.qualidade = qualidade
 
 
 class GraficoRetorno(TypedDict):
     nome_arquivo: str
-    formato: Literal["png", "svg", "html"]
+    formato: Literal["png", "svg", "html", "jpeg"]
     dados: bytes
     figura: go.Figure | None
 
@@ -32,6 +42,10 @@ class IGrafico(ABC):
     def criar(self) -> GraficoRetorno:
         pass
 
+    @abstractmethod
+    async def criar_async(self) -> GraficoRetorno:
+        pass
+
 
 class GraficoBase(IGrafico):
     def __init__(self, config: GraficoConfig):
@@ -66,19 +80,50 @@ class GraficoBase(IGrafico):
             if self.config.formato == "html":
                 buffer.write(self.figura.to_html().encode("utf-8"))
             else:
-                buffer.write(self.figura.to_image(format=self.config.formato))
+                buffer.write(renderizador_graficos.renderizar(self.figura.to_json(), self.config.formato))
             buffer.seek(0)
             return buffer.getvalue()
         except Exception as e:
             logging.error(f"Erro ao gerar gráfico em bytes", exc_info=True)
             raise
 
+    async def para_bytes_async(self) -> bytes:
+        if self.figura is None:
+            raise ValueError("Figura não foi criada. Chame criar_async() primeiro.")
+        try:
+            if self.config.formato == "html":
+                return self.figura.to_html().encode("utf-8")
+            return await renderizador_graficos.renderizar_async(self.figura.to_json(), self.config.formato)
+        except Exception as e:
+            logging.error(f"Erro ao gerar gráfico em bytes", exc_info=True)
+            raise
+
     @abstractmethod
     def criar(self) -> GraficoRetorno:
         pass
 
 
-class GraficoLinha(GraficoBase):
+class GraficoPlotly(GraficoBase):
+    """Gráficos montados como figura do plotly e exportados pelo pool de renderização."""
+
+    def criar(self) -> GraficoRetorno:
+        self._montar()
+        return self._retorno(self.para_bytes())
+
+    async def criar_async(self) -> GraficoRetorno:
+        self._montar()
+        return self._retorno(await self.para_bytes_async())
+
+    @abstractmethod
+    def _montar(self) -> None:
+        pass
+
+    @abstractmethod
+    def _retorno(self, dados: bytes) -> GraficoRetorno:
+        pass
+
+
+class GraficoLinha(GraficoPlotly):
     def __init__(
         self,
         config: GraficoConfig,
@@ -91,7 +136,7 @@ class GraficoLinha(GraficoBase):
         self.valores = valores
         self.hover_texts = hover_texts
 
-    def criar(self) -> GraficoRetorno:
+    def _montar(self) -> None:
         trace = go.Scatter(
             x=self.legendas,
             y=self.valores,
@@ -148,18 +193,16 @@ class GraficoLinha(GraficoBase):
         self.figura.update_xaxes(automargin=True)
         self.figura.update_yaxes(automargin=True)
 
-        return self._retorno()
-
-    def _retorno(self) -> GraficoRetorno:
+    def _retorno(self, dados: bytes) -> GraficoRetorno:
         return {
             "nome_arquivo": self._gerar_nome_arquivo("linha"),
             "formato": self.config.formato,
-            "dados": self.para_bytes(),
+            "dados": dados,
             "figura": self.figura,
         }
 
 
-class GraficoPizza(GraficoBase):
+class GraficoPizza(GraficoPlotly):
     def __init__(
         self,
         config: GraficoConfig,
@@ -172,7 +215,7 @@ class GraficoPizza(GraficoBase):
         self.valores = valores
         self.hover_texts = hover_texts
 
-    def criar(self) -> GraficoRetorno:
+    def _montar(self) -> None:
         trace = go.Pie(
             labels=self.legendas,
             values=self.valores,
@@ -185,18 +228,17 @@ class GraficoPizza(GraficoBase):
         layout = self._criar_layout_base()
         layout.update(font=dict(size=22))
         self.figura = go.Figure(data=[trace], layout=layout)
-        return self._retorno()
 
-    def _retorno(self) -> GraficoRetorno:
+    def _retorno(self, dados: bytes) -> GraficoRetorno:
         return {
             "nome_arquivo": self._gerar_nome_arquivo("pizza"),
             "formato": self.config.formato,
-            "dados": self.para_bytes(),
+            "dados": dados,
             "figura": self.figura,
         }
 
 
-class GraficoBarras(GraficoBase):
+class GraficoBarras(GraficoPlotly):
     def __init__(
         self,
         config: GraficoConfig,
@@ -209,7 +251,7 @@ class GraficoBarras(GraficoBase):
         self.valores = valores
         self.hover_texts = hover_texts
 
-    def criar(self) -> GraficoRetorno:
+    def _montar(self) -> None:
         trace = go.Bar(
             x=self.legendas,
             y=self.valores,
@@ -223,24 +265,23 @@ class GraficoBarras(GraficoBase):
         layout = self._criar_layout_base()
         layout.update(yaxis=dict(tickformat=",d"))
         self.figura = go.Figure(data=[trace], layout=layout)
-        return self._retorno()
 
-    def _retorno(self) -> GraficoRetorno:
+    def _retorno(self, dados: bytes) -> GraficoRetorno:
         return {
             "nome_arquivo": self._gerar_nome_arquivo("barras"),
             "formato": self.config.formato,
-            "dados": self.para_bytes(),
+            "dados": dados,
             "figura": self.figura,
         }
 
 
-class GraficoBarraEmpilhada(GraficoBase):
+class GraficoBarraEmpilhada(GraficoPlotly):
     def __init__(self, config: GraficoConfig, legendas: List, valores: Dict[str, Any]):
         super().__init__(config)
         self.dados = valores
         self.periodos = legendas
 
-    def criar(self) -> GraficoRetorno:
+    def _montar(self) -> None:
         receitas = [self.dados[periodo]["receitas"] for periodo in self.periodos]
         despesas = [self.dados[periodo]["despesas"] for periodo in self.periodos]
 
@@ -269,61 +310,125 @@ class GraficoBarraEmpilhada(GraficoBase):
         layout.update(font={"size": 16}, barmode="relative", margin=dict(l=20, r=20, t=45, b=20), yaxis_title="R$")
 
         self.figura = go.Figure(data=[trace_receitas, trace_despesas], layout=layout)
-        return self._retorno()
 
-    def _retorno(self) -> GraficoRetorno:
+    def _retorno(self, dados: bytes) -> GraficoRetorno:
         return {
             "nome_arquivo": self._gerar_nome_arquivo("barra_empilhada"),
             "formato": self.config.formato,
-            "dados": self.para_bytes(),
+            "dados": dados,
             "figura": self.figura,
         }
 
 
-class GraficoLucro(GraficoBase):
-    def __init__(self, config: GraficoConfig, transacoes: List[Transacao]):
-        super().__init__(config)
-        self.transacoes = transacoes
+class TemplateLucro:
+    """
+    Base estática do cartão de lucro: fundo, anel branco, caixas e rótulos.
 
-    def criar(self) -> GraficoRetorno:
-        vendas = sum(t.valor for t in self.transacoes if t.tipo == TipoTransacao.CREDITO)
-        custos = sum(t.valor for t in self.transacoes if t.tipo == TipoTransacao.DEBITO)
-        resultado = vendas - custos
+    As fontes e a base são carregadas e desenhadas uma única vez por processo; cada requisição só copia a base
+    e desenha por cima os arcos e valores.
+    """
 
-        width = 800
-        height = 700
+    LARGURA = 800
+    ALTURA = 700
+    CENTRO_X = LARGURA // 2
+    CENTRO_Y = ALTURA // 2 - 50
+    RAIO = 180
+    ESPESSURA = 40
+    CAIXA_LARGURA = 200
+    CAIXA_ALTURA = 80
+    CAIXA_Y = ALTURA - 150
 
-        # Set the background color to light gray
-        image = Image.new("RGBA", (width, height), (240, 240, 240, 255))
-        draw = ImageDraw.Draw(image)
+    _instancia: "TemplateLucro | None" = None
+    _lock = threading.Lock()
 
-        # Attempt to load the font
+    def __init__(self) -> None:
         try:
             font_path = f"{BUCKET}/fonts/InterTight-Bold.ttf"
-            font_title = ImageFont.truetype(font_path, 20)
-            font_venda_despesa = ImageFont.truetype(font_path, 25)
-            font_lucro = ImageFont.truetype(font_path, 40)
+            self.font_title = ImageFont.truetype(font_path, 20)
+            self.font_venda_despesa = ImageFont.truetype(font_path, 25)
+            self.font_lucro = ImageFont.truetype(font_path, 40)
         except Exception as erro:
             logging.error(erro, exc_info=True)
-            font_title = ImageFont.load_default()
-            font_lucro = font_title
-            font_venda_despesa = font_title
+            self.font_title = ImageFont.load_default()
+            self.font_lucro = self.font_title
+            self.font_venda_despesa = self.font_title
+
+        vendas_x = 120
+        custos_x = self.LARGURA - 120 - self.CAIXA_LARGURA
+        self.vendas_box = [(vendas_x, self.CAIXA_Y), (vendas_x + self.CAIXA_LARGURA, self.CAIXA_Y + self.CAIXA_ALTURA)]
+        self.custos_box = [(custos_x, self.CAIXA_Y), (custos_x + self.CAIXA_LARGURA, self.CAIXA_Y + self.CAIXA_ALTURA)]
+        self.base = self._desenhar_base()
+
+    @classmethod
+    def obter(cls) -> "TemplateLucro":
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    cls._instancia = cls()
+        return cls._instancia
 
-        # Center circle position
-        center_x = width // 2
-        center_y = height // 2 - 50
-        radius = 180
-        thickness = 40
+    @staticmethod
+    def centro(caixa: List[tuple]) -> tuple:
+        return (caixa[0][0] + caixa[1][0]) // 2, (caixa[0][1] + caixa[1][1]) // 2
+
+    @property
+    def limites_anel(self) -> List[tuple]:
+        return [
+            (self.CENTRO_X - self.RAIO, self.CENTRO_Y - self.RAIO),
+            (self.CENTRO_X + self.RAIO, self.CENTRO_Y + self.RAIO),
+        ]
+
+    def _desenhar_base(self) -> Image.Image:
+        # O fundo é opaco, então RGB gera o mesmo resultado visual com um PNG menor que RGBA
+        image = Image.new("RGB", (self.LARGURA, self.ALTURA), (240, 240, 240))
+        draw = ImageDraw.Draw(image)
 
-        # Draw outer white circle as the background for the ring
+        # Círculo branco que serve de fundo para o anel
+        raio_externo = self.RAIO + self.ESPESSURA
         draw.ellipse(
             [
-                (center_x - radius - thickness, center_y - radius - thickness),
-                (center_x + radius + thickness, center_y + radius + thickness),
+                (self.CENTRO_X - raio_externo, self.CENTRO_Y - raio_externo),
+                (self.CENTRO_X + raio_externo, self.CENTRO_Y + raio_externo),
             ],
             fill="white",
         )
 
+        title_text = "SEU LUCRO"
+        title_bbox = draw.textbbox((0, 0), title_text, font=self.font_title)
+        title_x = self.CENTRO_X - (title_bbox[2] - title_bbox[0]) // 2
+        draw.text((title_x, self.CENTRO_Y - 40), title_text, fill="#065f46", font=self.font_title)
+
+        draw.rounded_rectangle(self.vendas_box, fill="#25D364", outline="#d1fae5", radius=15)
+        vendas_center_x, vendas_center_y = self.centro(self.vendas_box)
+        draw.text(
+            (vendas_center_x, vendas_center_y - 45), "VENDAS", fill="#065f46", font=self.font_title, anchor="ms"
+        )
+
+        draw.rounded_rectangle(self.custos_box, fill="#e73760", outline="#fee2e2", radius=15)
+        custos_center_x, custos_center_y = self.centro(self.custos_box)
+        draw.text(
+            (custos_center_x, custos_center_y - 45), "CUSTOS", fill="#991b1b", font=self.font_title, anchor="ms"
+        )
+
+        return image
+
+
+class GraficoLucro(GraficoBase):
+    def __init__(self, config: GraficoConfig, resumo: ResumoPeriodo):
+        super().__init__(config)
+        self.resumo = resumo
+
+    def criar(self) -> GraficoRetorno:
+        vendas = self.resumo.receitas
+        custos = self.resumo.despesas
+        resultado = self.resumo.lucro
+
+        template = TemplateLucro.obter()
+        image = template.base.copy()
+        draw = ImageDraw.Draw(image)
+        anel = template.limites_anel
+        thickness = template.ESPESSURA
+
         if vendas > 0:
             # Calculate the proportion of the circle each part should occupy
             total = vendas + custos
@@ -334,121 +439,54 @@ class GraficoLucro(GraficoBase):
             custos_angle = 0
 
         if vendas == 0:
-            draw.arc(
-                [
-                    (center_x - radius, center_y - radius),
-                    (center_x + radius, center_y + radius),
-                ],
-                0,
-                360,
-                fill="#ff4d4d",
-                width=thickness,
-            )
+            draw.arc(anel, 0, 360, fill="#ff4d4d", width=thickness)
         if custos == 0:
-            draw.arc(
-                [
-                    (center_x - radius, center_y - radius),
-                    (center_x + radius, center_y + radius),
-                ],
-                0,
-                360,
-                fill="#4ade80",
-                width=thickness,
-            )
+            draw.arc(anel, 0, 360, fill="#4ade80", width=thickness)
         else:
             if vendas_angle > 0:
-                draw.arc(
-                    [
-                        (center_x - radius, center_y - radius),
-                        (center_x + radius, center_y + radius),
-                    ],
-                    270,
-                    270 + vendas_angle,  # Go clockwise
-                    fill="#4ade80",
-                    width=thickness,
-                )
+                # Go clockwise
+                draw.arc(anel, 270, 270 + vendas_angle, fill="#4ade80", width=thickness)
 
             # Draw custos portion (red) - starts where vendas ends and completes the circle back to bottom
             if custos_angle > 0:
-                draw.arc(
-                    [
-                        (center_x - radius, center_y - radius),
-                        (center_x + radius, center_y + radius),
-                    ],
-                    270 + vendas_angle,  # Start where vendas portion ends
-                    630,
-                    fill="#ff4d4d",
-                    width=thickness,
-                )
-
-        # Draw center text
-        title_text = "SEU LUCRO"
+                draw.arc(anel, 270 + vendas_angle, 630, fill="#ff4d4d", width=thickness)
+
         value_text = f"{Real(resultado)}"
-        title_bbox = draw.textbbox((0, 0), title_text, font=font_title)
-        value_bbox = draw.textbbox((0, 0), value_text, font=font_lucro)
-        title_x = center_x - (title_bbox[2] - title_bbox[0]) // 2
-        title_y = center_y - 40
-        value_x = center_x - (value_bbox[2] - value_bbox[0]) // 2
-        value_y = center_y - 10
-        draw.text((title_x, title_y), title_text, fill="#065f46", font=font_title)
-        draw.text((value_x, value_y), value_text, fill="black", font=font_lucro)
-
-        # Define box dimensions based on "VENDAS" box
-        box_width = 200
-        box_height = 80
-        box_y = height - 150
-        vendas_text_y = box_y - 40
-        custos_text_y = box_y - 40
-
-        # Vendas box (left)
-        vendas_box = [(120, box_y), (120 + box_width, box_y + box_height)]
-        draw.rounded_rectangle(vendas_box, fill="#25D364", outline="#d1fae5", radius=15)
-
-        # Center the "VENDAS" text and value in the box
-        vendas_center_x = (vendas_box[0][0] + vendas_box[1][0]) // 2
-        vendas_center_y = (vendas_box[0][1] + vendas_box[1][1]) // 2
-        draw.text(
-            (vendas_center_x, vendas_center_y - 45),
-            "VENDAS",
-            fill="#065f46",
-            font=font_title,
-            anchor="ms",
-        )
+        value_bbox = draw.textbbox((0, 0), value_text, font=template.font_lucro)
+        value_x = template.CENTRO_X - (value_bbox[2] - value_bbox[0]) // 2
+        draw.text((value_x, template.CENTRO_Y - 10), value_text, fill="black", font=template.font_lucro)
+
+        vendas_center_x, vendas_center_y = template.centro(template.vendas_box)
         draw.text(
             (vendas_center_x, vendas_center_y + 10),
             f"{Real(vendas)}",
             fill="#ecfdf5",
-            font=font_venda_despesa,
+            font=template.font_venda_despesa,
             anchor="ms",
         )
 
-        # Custos box (right)
-        custos_x = width - 120 - box_width
-        custos_box = [(custos_x, box_y), (custos_x + box_width, box_y + box_height)]
-        draw.rounded_rectangle(custos_box, fill="#e73760", outline="#fee2e2", radius=15)
-
-        # Center the "CUSTOS" text and value in the box
-        custos_center_x = (custos_box[0][0] + custos_box[1][0]) // 2
-        custos_center_y = (custos_box[0][1] + custos_box[1][1]) // 2
-        draw.text(
-            (custos_center_x, custos_center_y - 45),
-            "CUSTOS",
-            fill="#991b1b",
-            font=font_title,
-            anchor="ms",
-        )
+        custos_center_x, custos_center_y = template.centro(template.custos_box)
         draw.text(
             (custos_center_x, custos_center_y + 10),
             f"{Real(custos)}",
             fill="white",
-            font=font_venda_despesa,
+            font=template.font_venda_despesa,
             anchor="ms",
         )
 
+        return self._retorno(self._codificar(image))
+
+    async def criar_async(self) -> GraficoRetorno:
+        # O cartão é desenhado com o Pillow, fora do pool do plotly; basta tirar o trabalho do event loop
+        return await asyncio.to_thread(self.criar)
+
+    def _codificar(self, image: Image.Image) -> bytes:
         img_bytes_io: BytesIO = BytesIO()
-        image.save(img_bytes_io, format="PNG")
-        bytes_imagem: bytes = img_bytes_io.getvalue()
-        return self._retorno(bytes_imagem)
+        if self.config.formato == "jpeg":
+            image.save(img_bytes_io, format="JPEG", quality=self.config.qualidade, optimize=True)
+        else:
+            image.save(img_bytes_io, format="PNG", compress_level=self.config.compressao)
+        return img_bytes_io.getvalue()
 
     def _retorno(self, img_byte_arr: bytes) -> GraficoRetorno:
         return {
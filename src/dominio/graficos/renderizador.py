@@ -0,0 +1,111 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from src.infra.log import setup_logging
+
+logger = setup_logging()
+
+
+def _aquecer() -> None:
+    """Inicializa o kaleido (e o Chromium dele) assim que o processo do pool sobe."""
+    from plotly import graph_objects as go
+
+    go.Figure().to_image(format="png", width=10, height=10)
+
+
+def _renderizar(figura_json: str, formato: str) -> bytes:
+    import plotly.io as pio
+
+    figura = pio.from_json(figura_json)
+    imagem: bytes = figura.to_image(format=formato)
+    return imagem
+
+
+class RenderizadorGraficos:
+    """
+    Pool de processos com o kaleido já aquecido para exportar figuras do plotly.
+
+    As figuras chegam como JSON pela fila do ProcessPoolExecutor, então a renderização roda em paralelo em
+    vários núcleos e o Chromium do kaleido só é iniciado uma vez por processo.
+    """
+
+    def __init__(self, processos: Optional[int] = None) -> None:
+        self.processos = processos or int(os.getenv("GRAFICOS_PROCESSOS_RENDER", min(os.cpu_count() or 1, 4)))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _obter_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn evita herdar por fork as threads do scheduler e as conexões abertas do processo web
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processos,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_aquecer,
+                )
+                logger.info(f"Pool de renderização iniciado com {self.processos} processos")
+            return self._pool
+
+    def _reiniciar_pool(self, quebrado: ProcessPoolExecutor) -> None:
+        logger.warning("Pool de renderização quebrado; reiniciando")
+        with self._lock:
+            # Outra chamada concorrente pode já ter trocado o pool; só descarta o que de fato quebrou
+            if self._pool is quebrado:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    @staticmethod
+    def _enviar(pool: ProcessPoolExecutor, figuras_json: List[str], formato: str) -> List[Future]:
+        return [pool.submit(_renderizar, figura_json, formato) for figura_json in figuras_json]
+
+    def iniciar(self) -> None:
+        """Sobe os processos antecipadamente para que a primeira requisição não pague o aquecimento."""
+        pool = self._obter_pool()
+        for _ in range(self.processos):
+            pool.submit(_aquecer)
+
+    def renderizar(self, figura_json: str, formato: str = "png") -> bytes:
+        return self.renderizar_lote([figura_json], formato)[0]
+
+    def renderizar_lote(self, figuras_json: List[str], formato: str = "png") -> List[bytes]:
+        pool = self._obter_pool()
+        try:
+            return [futuro.result() for futuro in self._enviar(pool, figuras_json, formato)]
+        except BrokenProcessPool:
+            # Um processo morreu no meio do lote; o lote inteiro é reenviado para um pool novo
+            self._reiniciar_pool(pool)
+            return [futuro.result() for futuro in self._enviar(self._obter_pool(), figuras_json, formato)]
+
+    async def renderizar_async(self, figura_json: str, formato: str = "png") -> bytes:
+        return (await self.renderizar_lote_async([figura_json], formato))[0]
+
+    async def renderizar_lote_async(self, figuras_json: List[str], formato: str = "png") -> List[bytes]:
+        pool = self._obter_pool()
+        try:
+            return await self._aguardar(self._enviar(pool, figuras_json, formato))
+        except BrokenProcessPool:
+            self._reiniciar_pool(pool)
+            return await self._aguardar(self._enviar(self._obter_pool(), figuras_json, formato))
+
+    @staticmethod
+    async def _aguardar(futuros: List[Future]) -> List[bytes]:
+        # return_exceptions evita que as falhas dos futuros restantes fiquem sem ser recuperadas
+        resultados = await asyncio.gather(*(asyncio.wrap_future(futuro) for futuro in futuros), return_exceptions=True)
+        for resultado in resultados:
+            if isinstance(resultado, BaseException):
+                raise resultado
+        return resultados
+
+    def encerrar(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+renderizador_graficos = RenderizadorGraficos()
@@ -1,54 +1,76 @@
+import os
 from collections import defaultdict
 from typing import List, Literal, Dict
 
-from src.dominio.graficos.entidade import GraficoConfig, GraficoFactory, GraficoRetorno
-from src.dominio.transacao.entidade import Transacao, Real
+from src.dominio.graficos.entidade import GraficoConfig, GraficoFactory, GraficoRetorno, IGrafico
+from src.dominio.transacao.entidade import Transacao, Real, ResumoDiario, ResumoMensal, ResumoPeriodo
 from src.dominio.transacao.tipos import TipoTransacao
+from src.infra.log import setup_logging
 
+logger = setup_logging()
 
-def criar_grafico_fluxo_de_caixa(transacoes: List[Transacao], formato="png") -> GraficoRetorno:
+# Mensagens de imagem do WhatsApp só aceitam PNG e JPEG
+FORMATOS_LUCRO = ("png", "jpeg")
+
+
+def _grafico_fluxo_de_caixa(fluxo_diario: List[ResumoDiario], formato="png") -> IGrafico:
     config = GraficoConfig(titulo="Fluxo de Caixa", formato=formato)
-    transacoes.sort(key=lambda transacao: transacao.caixa)
 
-    fluxo_diario = defaultdict(float)
-    for transacao in transacoes:
-        data = transacao.caixa.date()
-        valor = transacao.valor if transacao.tipo == TipoTransacao.CREDITO else -transacao.valor
-        fluxo_diario[data] += valor
+    legendas = [resumo.dia for resumo in fluxo_diario]
+    valores = [resumo.saldo for resumo in fluxo_diario]
 
-    datas_ordenadas = sorted(fluxo_diario.keys())
-    legendas = datas_ordenadas
-    valores = [fluxo_diario[data] for data in datas_ordenadas]
+    return GraficoFactory.criar_grafico("linha", config, legendas=legendas, valores=valores)
 
-    grafico = GraficoFactory.criar_grafico("linha", config, legendas=legendas, valores=valores)
-    return grafico.criar()
 
+def criar_grafico_fluxo_de_caixa(fluxo_diario: List[ResumoDiario], formato="png") -> GraficoRetorno:
+    return _grafico_fluxo_de_caixa(fluxo_diario, formato).criar()
 
-def criar_grafico_receitas_e_despesas(transacoes: List[Transacao]) -> GraficoRetorno:
-    config = GraficoConfig(titulo="Receitas e Despesas")
-    transacoes.sort(key=lambda transacao: transacao.caixa)
-    receitas_despesas_por_mes: Dict[str, Dict[str, float]] = defaultdict(lambda: {"receitas": 0.0, "despesas": 0.0})
 
-    for transacao in transacoes:
-        mes = transacao.caixa.strftime("%Y-%m")
-        if transacao.tipo == TipoTransacao.CREDITO:
-            receitas_despesas_por_mes[mes]["receitas"] += transacao.valor
-        else:
-            receitas_despesas_por_mes[mes]["despesas"] -= transacao.valor
+async def criar_grafico_fluxo_de_caixa_async(fluxo_diario: List[ResumoDiario], formato="png") -> GraficoRetorno:
+    return await _grafico_fluxo_de_caixa(fluxo_diario, formato).criar_async()
+
+
+def _grafico_receitas_e_despesas(totais_mensais: List[ResumoMensal]) -> IGrafico:
+    config = GraficoConfig(titulo="Receitas e Despesas")
+    receitas_despesas_por_mes: Dict[str, Dict[str, float]] = {
+        resumo.mes.strftime("%Y-%m"): {"receitas": resumo.receitas, "despesas": -resumo.despesas}
+        for resumo in totais_mensais
+    }
 
     legendas = list(receitas_despesas_por_mes.keys())
-    grafico = GraficoFactory.criar_grafico(
-        "barra_empilhada", config, legendas=legendas, valores=receitas_despesas_por_mes
+    return GraficoFactory.criar_grafico("barra_empilhada", config, legendas=legendas, valores=receitas_despesas_por_mes)
+
+
+def criar_grafico_receitas_e_despesas(totais_mensais: List[ResumoMensal]) -> GraficoRetorno:
+    return _grafico_receitas_e_despesas(totais_mensais).criar()
+
+
+async def criar_grafico_receitas_e_despesas_async(totais_mensais: List[ResumoMensal]) -> GraficoRetorno:
+    return await _grafico_receitas_e_despesas(totais_mensais).criar_async()
+
+
+def _grafico_lucro(resumo: ResumoPeriodo) -> IGrafico:
+    formato = os.getenv("GRAFICO_LUCRO_FORMATO", "png").lower()
+    if formato not in FORMATOS_LUCRO:
+        logger.warning(f"GRAFICO_LUCRO_FORMATO={formato} não é aceito pelo WhatsApp; usando png")
+        formato = "png"
+
+    config = GraficoConfig(
+        titulo="Lucro",
+        formato=formato,
+        compressao=int(os.getenv("GRAFICO_LUCRO_COMPRESSAO", 6)),
+        qualidade=int(os.getenv("GRAFICO_LUCRO_QUALIDADE", 80)),
     )
-    return grafico.criar()
 
+    return GraficoFactory.criar_grafico("lucro", config, resumo=resumo)
 
-def criar_grafico_lucro(transacoes: List[Transacao]) -> GraficoRetorno:
-    config = GraficoConfig(titulo="Lucro")
-    transacoes.sort(key=lambda transacao: transacao.caixa)
 
-    grafico = GraficoFactory.criar_grafico("lucro", config, transacoes=transacoes)
-    return grafico.criar()
+def criar_grafico_lucro(resumo: ResumoPeriodo) -> GraficoRetorno:
+    return _grafico_lucro(resumo).criar()
+
+
+async def criar_grafico_lucro_async(resumo: ResumoPeriodo) -> GraficoRetorno:
+    return await _grafico_lucro(resumo).criar_async()
 
 
 def criar_grafico_pizza(transacoes: List[Transacao]) -> GraficoRetorno:
@@ -0,0 +1,116 @@
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from const import TRANSACAO_CREDITO, TRANSACAO_DEBITO
+from src.dominio.processamento.exceptions import NaoEhTransacao
+from src.dominio.processamento.lexer import PONTUACAO
+from src.dominio.processamento.lote import ClassificadorEmLote, classificador_em_lote
+
+# Abreviações curtas ("p", "pp", "v", "c"...) são ambíguas demais para dispensar o modelo
+PALAVRAS_CHAVE: Dict[str, str] = {
+    **{palavra: "debito" for palavra in TRANSACAO_DEBITO if len(palavra) > 2},
+    **{palavra: "credito" for palavra in TRANSACAO_CREDITO if len(palavra) > 2},
+}
+
+# Conjugações aceitas depois do radical. O radical sozinho não basta: "vendedor" e "pagamento" não são verbos
+# e ficam para o modelo
+TERMINACOES_AR = frozenset(
+    {"o", "a", "as", "amos", "am", "ei", "uei", "ou", "aram", "ava", "avam", "ar", "ado", "ada", "ados", "adas"}
+)
+TERMINACOES_ER = frozenset(
+    {"o", "e", "es", "emos", "em", "i", "eu", "eram", "ia", "iam", "er", "ido", "ida", "idos", "idas"}
+)
+
+# Radicais dos verbos de lançamento ("pagamos", "vendemos", "recebemos", "gastamos").
+# "compr" fica de fora porque também pega "comprovante"
+PREFIXOS: Dict[str, Tuple[str, FrozenSet[str]]] = {
+    "pag": ("debito", TERMINACOES_AR),
+    "gast": ("debito", TERMINACOES_AR),
+    "vend": ("credito", TERMINACOES_ER),
+    "receb": ("credito", TERMINACOES_ER),
+}
+TAMANHOS_PREFIXO = sorted({len(prefixo) for prefixo in PREFIXOS}, reverse=True)
+
+NIVEIS = ("palavra_chave", "prefixo", "modelo", "descartada")
+
+
+class CascataClassificacao:
+    """
+    Classifica a mensagem pelo nível mais barato que consiga decidir.
+
+    1. palavra_chave: a primeira palavra está em TRANSACAO_DEBITO/TRANSACAO_CREDITO;
+    2. prefixo: a primeira palavra é um radical conhecido mais uma conjugação ("pagamos", "vendemos"...);
+    3. modelo: só o texto ambíguo chega ao classificador em lote.
+
+    Se a segunda palavra apontar para o sentido oposto ("pagamento recebido"), a mensagem também vai ao modelo.
+
+    Os contadores por nível mostram quanto trabalho do modelo a cascata economiza.
+    """
+
+    def __init__(self, classificador: Optional[ClassificadorEmLote] = None) -> None:
+        self.classificador = classificador or classificador_em_lote
+        self._contadores: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _contar(self, nivel: str) -> None:
+        with self._lock:
+            self._contadores[nivel] += 1
+
+    @staticmethod
+    def _tipo_da_palavra(palavra: str) -> Tuple[Optional[str], Optional[str]]:
+        palavra = palavra.lower().strip(PONTUACAO)
+        if tipo := PALAVRAS_CHAVE.get(palavra):
+            return tipo, "palavra_chave"
+
+        for tamanho in TAMANHOS_PREFIXO:
+            if prefixo := PREFIXOS.get(palavra[:tamanho]):
+                tipo, terminacoes = prefixo
+                if palavra[tamanho:] in terminacoes:
+                    return tipo, "prefixo"
+        return None, None
+
+    @classmethod
+    def por_palavra_chave(cls, mensagem: str) -> Tuple[Optional[str], Optional[str]]:
+        partes = mensagem.split(maxsplit=2)
+        if not partes:
+            return None, None
+
+        tipo, nivel = cls._tipo_da_palavra(partes[0])
+        if tipo and len(partes) > 1:
+            seguinte, _ = cls._tipo_da_palavra(partes[1])
+            if seguinte and seguinte != tipo:
+                return None, None
+        return tipo, nivel
+
+    async def classificar(self, mensagem: str) -> Tuple[str, Dict[str, float]]:
+        tipo, nivel = self.por_palavra_chave(mensagem)
+        if tipo and nivel:
+            self._contar(nivel)
+            return tipo, {tipo: 1.0}
+
+        try:
+            resultado = await self.classificador.classificar(mensagem)
+        except NaoEhTransacao:
+            self._contar("descartada")
+            raise
+        self._contar("modelo")
+        return resultado
+
+    def estatisticas(self) -> Dict[str, Dict[str, float] | int]:
+        with self._lock:
+            contadores = dict(self._contadores)
+
+        total = sum(contadores.values())
+        estatisticas: Dict[str, Dict[str, float] | int] = {"total": total}
+        for nivel in NIVEIS:
+            acertos = contadores.get(nivel, 0)
+            estatisticas[nivel] = {"acertos": acertos, "taxa": round(acertos / total, 4) if total else 0.0}
+        return estatisticas
+
+    def zerar(self) -> None:
+        with self._lock:
+            self._contadores.clear()
+
+
+cascata_classificacao = CascataClassificacao()
@@ -0,0 +1,121 @@
+import os
+import threading
+from typing import Iterable, Optional, Tuple
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from src.dominio.processamento.categorizador import (
+    CATEGORIA_PADRAO,
+    Categorizador,
+    cliente_categorizador,
+    normalizar_destino,
+)
+from src.infra.log import setup_logging
+
+logger = setup_logging()
+
+
+def caminho_modelo_categorias() -> str:
+    return os.getenv("CATEGORIAS_MODEL_PATH", "/opt/caderneta/static/categorias.joblib")
+
+
+class ModeloCategorias:
+    """
+    Prevê a categoria do lançamento a partir do destino, sem sair do processo.
+
+    É treinado pelo mesmo job noturno do classificador com os pares (destino, categoria) já gravados em
+    transacoes. O pipeline fica em memória e é recarregado quando o joblib no disco muda. Abaixo da confiança
+    mínima a categoria é OUTROS, igual à queda do categorizer remoto.
+    """
+
+    def __init__(self, confianca_minima: Optional[float] = None) -> None:
+        self.confianca_minima = confianca_minima or float(os.getenv("CATEGORIAS_CONFIANCA_MINIMA", 0.5))
+        self._pipeline: Optional[Pipeline] = None
+        self._versao: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _versao_artefato() -> Optional[float]:
+        try:
+            return os.stat(caminho_modelo_categorias()).st_mtime
+        except OSError:
+            return None
+
+    def _obter_pipeline(self) -> Optional[Pipeline]:
+        versao = self._versao_artefato()
+        if versao is None:
+            return None
+        if self._pipeline is not None and versao == self._versao:
+            return self._pipeline
+
+        with self._lock:
+            if self._pipeline is None or versao != self._versao:
+                self._pipeline = joblib.load(caminho_modelo_categorias())
+                self._versao = versao
+                logger.info(f"Modelo de categorias carregado de {caminho_modelo_categorias()}")
+            return self._pipeline
+
+    def prever(self, destino: Optional[str]) -> str:
+        texto = normalizar_destino(destino)
+        pipeline = self._obter_pipeline() if texto else None
+        if pipeline is None:
+            return CATEGORIA_PADRAO
+
+        probabilidades = pipeline.predict_proba([texto])[0]
+        indice = probabilidades.argmax()
+        if probabilidades[indice] < self.confianca_minima:
+            return CATEGORIA_PADRAO
+        return str(pipeline.classes_[indice])
+
+    def categorizar(self, texto: str, destino: Optional[str] = None) -> str:
+        return self.prever(destino)
+
+    async def categorizar_async(self, texto: str, destino: Optional[str] = None) -> str:
+        return self.prever(destino)
+
+    def treinar(self, exemplos: Iterable[Tuple[str, str, int]]) -> Optional[str]:
+        """
+        Treina com (destino, categoria, quantidade) e grava o joblib de forma atômica.
+
+        Returns:
+            Optional[str]: Resumo do treinamento, ou None se não houver ao menos duas categorias.
+        """
+        destinos, categorias, pesos = [], [], []
+        for destino, categoria, quantidade in exemplos:
+            texto = normalizar_destino(destino)
+            if texto and categoria:
+                destinos.append(texto)
+                categorias.append(categoria.upper())
+                pesos.append(quantidade)
+
+        if len(set(categorias)) < 2:
+            logger.info("Modelo de categorias não treinado: menos de duas categorias no histórico")
+            return None
+
+        # n-gramas de caracteres toleram abreviações e erros de digitação em nomes curtos de fornecedores
+        pipeline = Pipeline(
+            [
+                ("vectorizer", TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), max_features=20_000)),
+                ("classifier", MultinomialNB(alpha=0.1)),
+            ]
+        )
+        pipeline.fit(destinos, categorias, classifier__sample_weight=pesos)
+
+        caminho = caminho_modelo_categorias()
+        temporario = f"{caminho}.tmp"
+        joblib.dump(pipeline, temporario)
+        os.replace(temporario, caminho)
+        return f"{len(destinos)} destinos, {len(set(categorias))} categorias"
+
+
+modelo_categorias = ModeloCategorias()
+
+
+def obter_categorizador() -> Categorizador:
+    """CATEGORIZACAO=local usa o modelo em memória; qualquer outro valor mantém o serviço CATEGORIZER."""
+    if os.getenv("CATEGORIZACAO", "remota").lower() == "local":
+        return modelo_categorias
+    return cliente_categorizador
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import unicodedata
+from typing import Optional, Protocol, Tuple
+
+import httpx
+
+from src.infra.disjuntor import Disjuntor
+from src.infra.log import setup_logging
+from src.utils.cache import CacheLRU
+
+logger = setup_logging()
+
+CATEGORIA_PADRAO = "OUTROS"
+
+
+def normalizar_destino(destino: Optional[str]) -> Optional[str]:
+    """Chave de cache do destino: minúsculo, sem acentos e com espaços simples ("Padaria  São João" -> "padaria sao joao")."""
+    if not destino:
+        return None
+    sem_acento = unicodedata.normalize("NFKD", destino).encode("ascii", "ignore").decode()
+    chave = " ".join(sem_acento.lower().split())
+    return chave if chave and chave != CATEGORIA_PADRAO.lower() else None
+
+
+class Categorizador(Protocol):
+    def categorizar(self, texto: str, destino: Optional[str] = None) -> str: ...
+
+    async def categorizar_async(self, texto: str, destino: Optional[str] = None) -> str: ...
+
+
+class ClienteCategorizador:
+    """
+    Cliente do serviço externo CATEGORIZER.
+
+    - conexões reaproveitadas (um cliente httpx síncrono e um assíncrono por processo);
+    - prazo máximo por chamada (CATEGORIZER_TIMEOUT), depois do qual a categoria é OUTROS;
+    - disjuntor: após falhas seguidas o serviço deixa de ser chamado por um tempo;
+    - cache LRU com TTL pela chave do destino, então fornecedores e clientes recorrentes não vão à rede.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[CacheLRU[str]] = None,
+        disjuntor: Optional[Disjuntor] = None,
+    ) -> None:
+        self._url = url
+        self.timeout = timeout or float(os.getenv("CATEGORIZER_TIMEOUT", 0.5))
+        self.cache = cache or CacheLRU(
+            tamanho_maximo=int(os.getenv("CATEGORIZER_CACHE_TAMANHO", 10_000)),
+            ttl=float(os.getenv("CATEGORIZER_CACHE_TTL", 60 * 60 * 24)),
+        )
+        self.disjuntor = disjuntor or Disjuntor(
+            "categorizer",
+            falhas_maximas=int(os.getenv("CATEGORIZER_FALHAS_MAXIMAS", 5)),
+            pausa=float(os.getenv("CATEGORIZER_PAUSA", 30)),
+        )
+        self._cliente: Optional[httpx.Client] = None
+        self._cliente_async: Optional[httpx.AsyncClient] = None
+        self._loop_cliente: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def url(self) -> Optional[str]:
+        return self._url or os.getenv("CATEGORIZER")
+
+    def _limites(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=int(os.getenv("CATEGORIZER_MAX_CONEXOES", 20)),
+            max_keepalive_connections=int(os.getenv("CATEGORIZER_MAX_KEEPALIVE", 10)),
+        )
+
+    def _obter_cliente(self) -> httpx.Client:
+        if self._cliente is None or self._cliente.is_closed:
+            self._cliente = httpx.Client(limits=self._limites(), timeout=self.timeout)
+        return self._cliente
+
+    def _obter_cliente_async(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._cliente_async is None or self._cliente_async.is_closed or self._loop_cliente is not loop:
+            self._cliente_async = httpx.AsyncClient(limits=self._limites(), timeout=self.timeout)
+            self._loop_cliente = loop
+        return self._cliente_async
+
+    def _consultar_cache(self, destino: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        chave = normalizar_destino(destino)
+        return chave, self.cache.obter(chave) if chave else None
+
+    def _tratar_resposta(self, resposta: httpx.Response, chave: Optional[str]) -> str:
+        if resposta.status_code >= 500:
+            self.disjuntor.registrar_falha()
+            return CATEGORIA_PADRAO
+
+        self.disjuntor.registrar_sucesso()
+        if resposta.status_code != 200:
+            return CATEGORIA_PADRAO
+
+        try:
+            categoria = str(resposta.json().get("category") or CATEGORIA_PADRAO).upper()
+        except ValueError:
+            logger.warning("Resposta inválida do categorizer")
+            return CATEGORIA_PADRAO
+
+        if chave:
+            self.cache.salvar(chave, categoria)
+        return categoria
+
+    def categorizar(self, texto: str, destino: Optional[str] = None) -> str:
+        url = self.url
+        if not url:
+            return CATEGORIA_PADRAO
+
+        chave, categoria = self._consultar_cache(destino)
+        if categoria:
+            return categoria
+        if not self.disjuntor.permitir():
+            return CATEGORIA_PADRAO
+
+        try:
+            resposta = self._obter_cliente().post(url, json={"message": texto})
+        except httpx.HTTPError as erro:
+            logger.warning(f"Categorizer indisponível: {erro!r}")
+            self.disjuntor.registrar_falha()
+            return CATEGORIA_PADRAO
+        except BaseException:
+            # Qualquer outro desfecho precisa encerrar a chamada, senão o teste do meio aberto fica preso
+            self.disjuntor.registrar_falha()
+            raise
+        return self._tratar_resposta(resposta, chave)
+
+    async def categorizar_async(self, texto: str, destino: Optional[str] = None) -> str:
+        url = self.url
+        if not url:
+            return CATEGORIA_PADRAO
+
+        chave, categoria = self._consultar_cache(destino)
+        if categoria:
+            return categoria
+        if not self.disjuntor.permitir():
+            return CATEGORIA_PADRAO
+
+        try:
+            # O timeout do httpx vale por fase (conexão, leitura...); o prazo aqui é para a chamada inteira
+            async with asyncio.timeout(self.timeout):
+                resposta = await self._obter_cliente_async().post(url, json={"message": texto})
+        except (httpx.HTTPError, TimeoutError) as erro:
+            logger.warning(f"Categorizer indisponível: {erro!r}")
+            self.disjuntor.registrar_falha()
+            return CATEGORIA_PADRAO
+        except BaseException:
+            # Inclui o CancelledError de um webhook cancelado no meio da chamada
+            self.disjuntor.registrar_falha()
+            raise
+        return self._tratar_resposta(resposta, chave)
+
+    async def fechar(self) -> None:
+        if self._cliente_async is not None and not self._cliente_async.is_closed:
+            await self._cliente_async.aclose()
+        if self._cliente is not None:
+            self._cliente.close()
+        self._cliente = self._cliente_async = self._loop_cliente = None
+
+
+cliente_categorizador = ClienteCategorizador()
@@ -0,0 +1,148 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from typing import FrozenSet, List, Optional
+
+from nltk.corpus import stopwords
+
+from const import TRANSACAO_CREDITO, TRANSACAO_DEBITO
+
+VERBOS_TRANSACAO: FrozenSet[str] = frozenset(TRANSACAO_DEBITO) | frozenset(TRANSACAO_CREDITO)
+
+METODOS_PAGAMENTO: FrozenSet[str] = frozenset(
+    {
+        "pix",
+        "credito",
+        "debito",
+        "dinheiro",
+        "boleto",
+        "transferencia",
+    }
+)
+
+PONTUACAO = ",.;:!?()[]\"'"
+
+_DATA_ISO = re.compile(r"\d{4}-\d{2}-\d{2}")
+_HORA = re.compile(r"\d{2}:\d{2}:\d{2}")
+_DATA = re.compile(r"(\d{1,2})/(\d{1,2})(?:/(\d{4}|\d{2}))?[,.;:!?)]*")
+_VALOR = re.compile(r"\d{1,3}(?:[.,]\d{3})*(?:[.,]\d{2})?|\d+")
+_VALOR_EMBUTIDO = re.compile(r"\b\d{1,3}(?:[.,]\d{3})*(?:[.,]\d{2})?\b|\b\d+\b")
+
+
+@dataclass(frozen=True)
+class TokensTransacao:
+    valor: float
+    data: datetime
+    metodo_pagamento: Optional[str]
+    destino: str
+    texto: str
+
+
+def normalizar_valor(valor: str) -> float:
+    """
+    Converte o valor monetário para float, aceitando os formatos:
+    - BRL: 150, 520,75, 10.500,15, 1.000.000,00
+    - USD: 150, 520.75, 10,500.15, 1,000,000.00
+    - Plain: 10500
+    """
+    if "," in valor and "." in valor:
+        # BRL com milhar e decimal: "1.000,50" -> "1000.50"
+        valor = valor.replace(".", "").replace(",", ".")
+    elif "," in valor:
+        # "520,75" → decimal; "10,500" → milhar (BR) → remove vírgula
+        valor = valor.replace(",", ".") if len(valor.rsplit(",", 1)[-1]) == 2 else valor.replace(",", "")
+    elif "." in valor and len(valor.rsplit(".", 1)[-1]) != 2:
+        valor = valor.replace(".", "")
+    return float(valor)
+
+
+class LexerTransacao:
+    """
+    Percorre a mensagem uma única vez e separa valor, data, método de pagamento e destino.
+
+    Não guarda estado entre chamadas: os padrões são compilados no import e as listas de palavras-chave são
+    frozensets, então uma instância pode ser compartilhada por todas as requisições.
+    """
+
+    @cached_property
+    def stop_words(self) -> FrozenSet[str]:
+        return frozenset(stopwords.words("portuguese"))
+
+    def analisar(self, mensagem: str) -> TokensTransacao:
+        tokens = mensagem.lower().split()
+        inicio = 1 if tokens and tokens[0] in VERBOS_TRANSACAO else 0
+
+        valor: Optional[str] = None
+        data: Optional[datetime] = None
+        data_hora: Optional[datetime] = None
+        metodo_pagamento: Optional[str] = None
+        palavras: List[str] = []
+
+        indice = inicio
+        while indice < len(tokens):
+            token = tokens[indice]
+            indice += 1
+
+            if data_hora is None and _DATA_ISO.fullmatch(token):
+                if indice < len(tokens) and _HORA.fullmatch(tokens[indice]):
+                    data_hora = datetime.strptime(f"{token} {tokens[indice]}", "%Y-%m-%d %H:%M:%S")
+                    indice += 1
+                    continue
+
+            if data is None and (data_match := _DATA.fullmatch(token)):
+                data = self._montar_data(*data_match.groups())
+                continue
+
+            if valor is None:
+                if _VALOR.fullmatch(token):
+                    valor = token
+                    continue
+                if valor_match := _VALOR_EMBUTIDO.search(token):
+                    valor = valor_match.group()
+                    restante = (token[: valor_match.start()] + token[valor_match.end() :]).strip(PONTUACAO)
+                    if restante:
+                        palavras.append(restante)
+                    continue
+
+            palavra = token.strip(PONTUACAO)
+            if palavra in METODOS_PAGAMENTO:
+                metodo_pagamento = metodo_pagamento or palavra
+                continue
+
+            palavras.append(token)
+
+        if valor is None:
+            raise ValueError("No monetary value found in message")
+
+        return TokensTransacao(
+            valor=normalizar_valor(valor),
+            data=data_hora or data or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+            metodo_pagamento=metodo_pagamento,
+            destino=self._montar_destino(palavras),
+            texto=" ".join(tokens[inicio:]),
+        )
+
+    @staticmethod
+    def _montar_data(dia: str, mes: str, ano: Optional[str]) -> datetime:
+        agora = datetime.now()
+        if ano is None:
+            ano_data = agora.year
+        else:
+            ano_data = int(ano) + 2000 if len(ano) == 2 else int(ano)
+        return agora.replace(year=ano_data, month=int(mes), day=int(dia), hour=0, minute=0, second=0, microsecond=0)
+
+    def _montar_destino(self, palavras: List[str]) -> str:
+        # Preposições só são descartadas nas pontas ("no mercado em" -> "mercado"), não no meio do nome
+        if palavras and palavras[0] in self.stop_words:
+            palavras = palavras[1:]
+        if palavras and palavras[-1] in self.stop_words:
+            palavras = palavras[:-1]
+
+        palavras = [palavra for palavra in palavras if palavra not in VERBOS_TRANSACAO]
+        if not palavras:
+            return "OUTROS"
+        return " ".join(palavras).replace(",", "|").upper()
+
+
+lexer_transacao = LexerTransacao()
@@ -0,0 +1,94 @@
+import asyncio
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from sklearn.exceptions import NotFittedError
+
+from src.dominio.processamento.entidade import ClassificadorTexto
+from src.infra.log import setup_logging
+
+logger = setup_logging()
+
+Pendente = Tuple[str, asyncio.Future]
+
+
+class ClassificadorEmLote:
+    """
+    Junta as classificações que chegam ao mesmo tempo e resolve todas com um único predict_proba.
+
+    Cada chamada espera no máximo `janela_ms` pelo resto do lote, que é enviado antes se atingir `tamanho_maximo`.
+    A inferência roda numa thread, então o event loop continua recebendo mensagens para o próximo lote.
+    """
+
+    def __init__(self, janela_ms: Optional[float] = None, tamanho_maximo: Optional[int] = None) -> None:
+        self.janela = (janela_ms or float(os.getenv("CLASSIFICADOR_JANELA_MS", 5))) / 1000
+        self.tamanho_maximo = tamanho_maximo or int(os.getenv("CLASSIFICADOR_LOTE_MAXIMO", 32))
+        self._pendentes: List[Pendente] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tarefas: Set[asyncio.Task] = set()
+
+    async def classificar(self, mensagem: str) -> Tuple[str, Dict[str, float]]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pendências de um loop anterior (ex.: outro teste) nunca seriam resolvidas aqui
+            self._loop, self._pendentes, self._timer, self._tarefas = loop, [], None, set()
+
+        futuro = loop.create_future()
+        self._pendentes.append((mensagem, futuro))
+
+        if len(self._pendentes) >= self.tamanho_maximo:
+            self._despachar()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.janela, self._despachar)
+
+        return await futuro
+
+    def _despachar(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        lote, self._pendentes = self._pendentes, []
+        if lote:
+            tarefa = asyncio.ensure_future(self._processar(lote))
+            self._tarefas.add(tarefa)
+            tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _processar(self, lote: List[Pendente]) -> None:
+        try:
+            resultados = await asyncio.to_thread(self._classificar_lote, [mensagem for mensagem, _ in lote])
+        except Exception as erro:
+            logger.error(f"Erro ao classificar lote de {len(lote)} mensagens: {erro}")
+            resultados = [erro] * len(lote)
+
+        for (_, futuro), resultado in zip(lote, resultados):
+            if futuro.done():
+                continue
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+
+    @staticmethod
+    def _classificar_lote(mensagens: List[str]) -> List[Tuple[str, Dict[str, float]] | Exception]:
+        classificador = ClassificadorTexto()
+        try:
+            probabilidades = classificador.probabilidades(mensagens)
+        except NotFittedError:
+            # Caminho raro: classificar_mensagem treina o modelo e recarrega o registro
+            probabilidades = None
+
+        resultados: List[Tuple[str, Dict[str, float]] | Exception] = []
+        for indice, mensagem in enumerate(mensagens):
+            try:
+                if probabilidades is None:
+                    resultados.append(classificador.classificar_mensagem(mensagem))
+                else:
+                    resultados.append(classificador.interpretar(mensagem, probabilidades[indice]))
+            except Exception as erro:
+                resultados.append(erro)
+        return resultados
+
+
+classificador_em_lote = ClassificadorEmLote()
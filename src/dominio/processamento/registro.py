@@ -0,0 +1,120 @@
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Optional, Tuple
+
+import joblib
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from src.infra.log import setup_logging
+
+logger = setup_logging()
+
+
+def caminho_vetorizador() -> str:
+    return os.getenv("VECTORIZER_PATH", "/opt/caderneta/static/vectorizer.joblib")
+
+
+def caminho_classificador() -> str:
+    return os.getenv("CLASSIFIER_PATH", "/opt/caderneta/static/classifier.joblib")
+
+
+@dataclass(frozen=True)
+class ModeloCarregado:
+    vectorizer: Any
+    classifier: Any
+    pipeline: Pipeline
+    stop_words: FrozenSet[str]
+    lemmatizer: WordNetLemmatizer
+    versao: Tuple[Optional[float], Optional[float]]
+
+
+def _versao_artefatos(vectorizer_path: str, classifier_path: str) -> Tuple[Optional[float], Optional[float]]:
+    def mtime(path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    return mtime(vectorizer_path), mtime(classifier_path)
+
+
+def _carregar_ou_criar_vetorizador(path: str) -> Any:
+    try:
+        return joblib.load(path)
+    except FileNotFoundError:
+        return TfidfVectorizer(max_features=1000)
+
+
+def _carregar_ou_criar_classificador(path: str) -> Any:
+    try:
+        return joblib.load(path)
+    except FileNotFoundError:
+        return MultinomialNB()
+
+
+def carregar_modelo(vectorizer_path: str, classifier_path: str) -> ModeloCarregado:
+    """
+    Carrega do disco um conjunto novo e independente de artefatos do classificador.
+
+    Args:
+        vectorizer_path: Caminho do joblib do vetorizador.
+        classifier_path: Caminho do joblib do classificador.
+
+    Returns:
+        ModeloCarregado: Vetorizador, classificador, pipeline e stopwords prontos para uso.
+    """
+    versao = _versao_artefatos(vectorizer_path, classifier_path)
+    vectorizer = _carregar_ou_criar_vetorizador(vectorizer_path)
+    classifier = _carregar_ou_criar_classificador(classifier_path)
+    return ModeloCarregado(
+        vectorizer=vectorizer,
+        classifier=classifier,
+        pipeline=Pipeline([("vectorizer", vectorizer), ("classifier", classifier)]),
+        stop_words=frozenset(stopwords.words("portuguese")),
+        lemmatizer=WordNetLemmatizer(),
+        versao=versao,
+    )
+
+
+class RegistroModelo:
+    """
+    Mantém um único conjunto de artefatos do classificador por processo.
+
+    O modelo é carregado na primeira chamada e compartilhado somente para leitura entre as requisições.
+    Quando o treinamento noturno grava novos artefatos, a troca é feita de forma atômica: quem já tem
+    uma referência continua usando o modelo antigo e as próximas chamadas recebem o novo.
+    """
+
+    def __init__(self) -> None:
+        self._modelo: Optional[ModeloCarregado] = None
+        self._lock = threading.Lock()
+
+    def obter(self) -> ModeloCarregado:
+        modelo = self._modelo
+        if modelo is None or modelo.versao != _versao_artefatos(caminho_vetorizador(), caminho_classificador()):
+            return self.recarregar()
+        return modelo
+
+    def recarregar(self) -> ModeloCarregado:
+        with self._lock:
+            vectorizer_path, classifier_path = caminho_vetorizador(), caminho_classificador()
+            modelo = self._modelo
+            if modelo is not None and modelo.versao == _versao_artefatos(vectorizer_path, classifier_path):
+                return modelo
+
+            modelo = carregar_modelo(vectorizer_path, classifier_path)
+            self._modelo = modelo
+            logger.info(f"Modelo carregado de {vectorizer_path} e {classifier_path}")
+            return modelo
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._modelo = None
+
+
+registro_modelo = RegistroModelo()
@@ -48,6 +48,30 @@ class Transacao:
         }
 
 
+@dataclass(frozen=True)
+class ResumoDiario:
+    dia: datetime
+    saldo: float
+
+
+@dataclass(frozen=True)
+class ResumoMensal:
+    mes: datetime
+    receitas: float
+    despesas: float
+
+
+@dataclass(frozen=True)
+class ResumoPeriodo:
+    receitas: float
+    despesas: float
+    quantidade: int
+
+    @property
+    def lucro(self) -> float:
+        return self.receitas - self.despesas
+
+
 @dataclass
 class Real:
     valor: float
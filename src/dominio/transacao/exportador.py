@@ -0,0 +1,66 @@
+import csv
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from src.dominio.transacao.tipos import TipoTransacao
+from src.utils.formatos import datetime_para_br
+
+COLUNAS = ["valor", "categoria", "descricao", "data"]
+
+Registro = Tuple[float, str | None, str | None, str]
+
+
+def para_registros(linhas: Iterable) -> Iterator[Registro]:
+    """
+    Converte as linhas (valor, tipo, categoria, descricao, caixa) vindas do banco no mesmo formato de
+    Transacao.dicionario(), sem instanciar entidades.
+    """
+    for valor, tipo, categoria, descricao, caixa in linhas:
+        yield (
+            -valor if tipo == TipoTransacao.DEBITO else valor,
+            categoria,
+            descricao,
+            datetime_para_br(caixa),
+        )
+
+
+def exportar_xlsx(registros: Iterable[Registro], caminho: str) -> None:
+    import xlsxwriter
+
+    # constant_memory grava cada linha no disco assim que a próxima começa, então a memória não cresce com o volume
+    with xlsxwriter.Workbook(caminho, {"constant_memory": True}) as workbook:
+        planilha = workbook.add_worksheet("Lançamentos")
+        planilha.write_row(0, 0, COLUNAS)
+        for indice, registro in enumerate(registros, start=1):
+            planilha.write_row(indice, 0, registro)
+
+
+def exportar_csv(registros: Iterable[Registro], caminho: str) -> None:
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(COLUNAS)
+        escritor.writerows(registros)
+
+
+def exportar_parquet(registros: Iterable[Registro], caminho: str, tamanho_lote: int = 10_000) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Exportação em parquet indisponível: instale o pacote pyarrow")
+
+    schema = pa.schema(
+        [("valor", pa.float64()), ("categoria", pa.string()), ("descricao", pa.string()), ("data", pa.string())]
+    )
+    registros = iter(registros)
+    with pq.ParquetWriter(caminho, schema) as escritor:
+        while lote := list(islice(registros, tamanho_lote)):
+            colunas: List[list] = [list(coluna) for coluna in zip(*lote)]
+            escritor.write_table(pa.Table.from_arrays(colunas, schema=schema))
+
+
+EXPORTADORES: Dict[str, Callable[[Iterable[Registro], str], None]] = {
+    "xlsx": exportar_xlsx,
+    "csv": exportar_csv,
+    "parquet": exportar_parquet,
+}
@@ -1,14 +1,81 @@
-from typing import List, Iterator
+from typing import AsyncIterator, List, Iterator, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import func
+from sqlalchemy import Select, case, func, select
 from sqlalchemy.orm import Session
 
-from src.dominio.transacao.entidade import Transacao
+from src.dominio.transacao.entidade import Transacao, ResumoDiario, ResumoMensal, ResumoPeriodo
 from src.dominio.transacao.tipos import TipoTransacao
-from src.infra.database.repo import RepoEscrita, RepoBase
+from src.infra.database.repo import RepoEscrita, RepoBase, RepoBaseAsync
 from src.libs.tipos import Intervalo
 
+# Consultas montadas aqui e executadas pelos repositórios síncrono e assíncrono, para que os dois devolvam o
+# mesmo resultado para o mesmo período
+
+
+def _filtro_periodo(intervalo: Intervalo, usuario_id: UUID) -> tuple:
+    return (
+        Transacao.usuario_id == usuario_id,
+        Transacao.caixa >= intervalo.inicio,
+        Transacao.caixa <= intervalo.fim,
+    )
+
+
+def _somas_por_tipo() -> tuple:
+    receitas = func.sum(case((Transacao.tipo == TipoTransacao.CREDITO, Transacao.valor), else_=0.0))
+    despesas = func.sum(case((Transacao.tipo == TipoTransacao.DEBITO, Transacao.valor), else_=0.0))
+    return receitas, despesas
+
+
+def _consulta_por_intervalo(intervalo: Intervalo, usuario_id: UUID) -> Select:
+    return select(Transacao).where(*_filtro_periodo(intervalo, usuario_id)).order_by(Transacao.caixa)
+
+
+def _consulta_fluxo_diario(intervalo: Intervalo, usuario_id: UUID) -> Select:
+    dia = func.date_trunc("day", Transacao.caixa).label("dia")
+    saldo = func.sum(case((Transacao.tipo == TipoTransacao.CREDITO, Transacao.valor), else_=-Transacao.valor))
+    return select(dia, saldo).where(*_filtro_periodo(intervalo, usuario_id)).group_by(dia).order_by(dia)
+
+
+def _consulta_totais_mensais(intervalo: Intervalo, usuario_id: UUID) -> Select:
+    mes = func.date_trunc("month", Transacao.caixa).label("mes")
+    return select(mes, *_somas_por_tipo()).where(*_filtro_periodo(intervalo, usuario_id)).group_by(mes).order_by(mes)
+
+
+def _consulta_totais_periodo(intervalo: Intervalo, usuario_id: UUID) -> Select:
+    return select(*_somas_por_tipo(), func.count(Transacao.id)).where(*_filtro_periodo(intervalo, usuario_id))
+
+
+def _consulta_exportacao(intervalo: Intervalo, usuario_id: UUID, tamanho_lote: int) -> Select:
+    return (
+        select(Transacao.valor, Transacao.tipo, Transacao.categoria, Transacao.descricao, Transacao.caixa)
+        .where(*_filtro_periodo(intervalo, usuario_id))
+        .order_by(Transacao.caixa)
+        .execution_options(yield_per=tamanho_lote)
+    )
+
+
+def _consulta_por_wamid(wamid: str, usuario_id: UUID) -> Select:
+    return (
+        select(Transacao)
+        .where(func.lower(Transacao.wamid) == func.lower(wamid), Transacao.usuario_id == usuario_id)
+        .limit(1)
+    )
+
+
+def _resumos_diarios(linhas: Sequence) -> List[ResumoDiario]:
+    return [ResumoDiario(dia=linha[0], saldo=float(linha[1] or 0.0)) for linha in linhas]
+
+
+def _resumos_mensais(linhas: Sequence) -> List[ResumoMensal]:
+    return [
+        ResumoMensal(mes=linha[0], receitas=float(linha[1] or 0.0), despesas=float(linha[2] or 0.0)) for linha in linhas
+    ]
+
+
+def _resumo_periodo(receitas: Optional[float], despesas: Optional[float], quantidade: int) -> ResumoPeriodo:
+    return ResumoPeriodo(receitas=float(receitas or 0.0), despesas=float(despesas or 0.0), quantidade=quantidade)
+
 
 class RepoTransacaoEscrita(RepoEscrita):
     def __init__(self, session: Session):
@@ -17,17 +84,7 @@ class RepoTransacaoEscrita(RepoEscrita):
 
 class RepoTransacaoLeitura(RepoBase[Transacao]):
     def buscar_por_intervalo_e_usuario(self, intervalo: Intervalo, usuario_id: UUID) -> List[Transacao]:
-        transacoes: List[Transacao] = (
-            self.session.query(Transacao)
-            .filter(
-                Transacao.usuario_id == usuario_id,
-                Transacao.caixa >= intervalo.inicio,
-                Transacao.caixa <= intervalo.fim,
-            )
-            .order_by(Transacao.caixa)
-            .all()
-        )
-        return transacoes
+        return list(self.session.scalars(_consulta_por_intervalo(intervalo, usuario_id)).all())
 
     def buscar_por_intervalo_usuario_e_tipo(
         self, intervalo: Intervalo, usuario_id: UUID, tipo: str | TipoTransacao
@@ -60,12 +117,75 @@ class RepoTransacaoLeitura(RepoBase[Transacao]):
         )
         return transacoes
 
+    def fluxo_diario(self, intervalo: Intervalo, usuario_id: UUID) -> List[ResumoDiario]:
+        """Saldo (receitas - despesas) de cada dia do intervalo, agregado no banco."""
+        return _resumos_diarios(self.session.execute(_consulta_fluxo_diario(intervalo, usuario_id)).all())
+
+    def totais_mensais(self, intervalo: Intervalo, usuario_id: UUID) -> List[ResumoMensal]:
+        """Total de receitas e despesas de cada mês do intervalo, agregado no banco."""
+        return _resumos_mensais(self.session.execute(_consulta_totais_mensais(intervalo, usuario_id)).all())
+
+    def totais_periodo(self, intervalo: Intervalo, usuario_id: UUID) -> ResumoPeriodo:
+        """Total de receitas, despesas e quantidade de lançamentos do intervalo em uma única linha."""
+        return _resumo_periodo(*self.session.execute(_consulta_totais_periodo(intervalo, usuario_id)).one())
+
+    def iterar_por_intervalo_e_usuario(
+        self, intervalo: Intervalo, usuario_id: UUID, tamanho_lote: int = 1000
+    ) -> Iterator[tuple]:
+        """
+        Percorre (valor, tipo, categoria, descricao, caixa) do intervalo com um cursor no servidor,
+        trazendo tamanho_lote linhas por vez em vez de materializar o período inteiro.
+        """
+        for linha in self.session.execute(_consulta_exportacao(intervalo, usuario_id, tamanho_lote)):
+            yield tuple(linha)
+
+    def destinos_categorizados(self) -> List[Tuple[str, str, int]]:
+        """Pares (destino, categoria) já lançados, com a quantidade de cada um, para treinar o modelo de categorias."""
+        linhas = (
+            self.session.query(Transacao.destino, Transacao.categoria, func.count(Transacao.id))
+            .filter(
+                Transacao.destino.isnot(None),
+                Transacao.categoria.isnot(None),
+                func.upper(Transacao.categoria) != "OUTROS",
+            )
+            .group_by(Transacao.destino, Transacao.categoria)
+            .all()
+        )
+        return [(destino, categoria, quantidade) for destino, categoria, quantidade in linhas]
+
     def buscar_por_id(self, entidade: Transacao) -> Transacao:
         return self.session.query(Transacao).filter(Transacao.id == entidade.id).first()
 
     def buscar_por_wamid(self, wamid: str, usuario_id: UUID) -> Transacao:
-        return (
-            self.session.query(Transacao)
-            .filter(func.lower(Transacao.wamid) == func.lower(wamid), Transacao.usuario_id == usuario_id)
-            .first()
-        )
+        return self.session.scalar(_consulta_por_wamid(wamid, usuario_id))
+
+
+class RepoTransacaoLeituraAsync(RepoBaseAsync[Transacao]):
+    """
+    Consultas de transações usadas pelos comandos do bot, sobre AsyncSession.
+
+    As consultas são montadas pelas mesmas funções do RepoTransacaoLeitura, então os dois repositórios devolvem
+    o mesmo resultado para o mesmo período.
+    """
+
+    async def buscar_por_intervalo_e_usuario(self, intervalo: Intervalo, usuario_id: UUID) -> List[Transacao]:
+        return list((await self.session.scalars(_consulta_por_intervalo(intervalo, usuario_id))).all())
+
+    async def fluxo_diario(self, intervalo: Intervalo, usuario_id: UUID) -> List[ResumoDiario]:
+        return _resumos_diarios((await self.session.execute(_consulta_fluxo_diario(intervalo, usuario_id))).all())
+
+    async def totais_mensais(self, intervalo: Intervalo, usuario_id: UUID) -> List[ResumoMensal]:
+        return _resumos_mensais((await self.session.execute(_consulta_totais_mensais(intervalo, usuario_id))).all())
+
+    async def totais_periodo(self, intervalo: Intervalo, usuario_id: UUID) -> ResumoPeriodo:
+        return _resumo_periodo(*(await self.session.execute(_consulta_totais_periodo(intervalo, usuario_id))).one())
+
+    async def iterar_por_intervalo_e_usuario(
+        self, intervalo: Intervalo, usuario_id: UUID, tamanho_lote: int = 1000
+    ) -> AsyncIterator[tuple]:
+        """Mesmo cursor no servidor do RepoTransacaoLeitura, consumido com `async for`."""
+        async for linha in await self.session.stream(_consulta_exportacao(intervalo, usuario_id, tamanho_lote)):
+            yield tuple(linha)
+
+    async def buscar_por_wamid(self, wamid: str, usuario_id: UUID) -> Optional[Transacao]:
+        return await self.session.scalar(_consulta_por_wamid(wamid, usuario_id))
@@ -63,6 +63,6 @@ async def criar_transacao_via_lambda(transacao: TransacaoRequest) -> dict:
         dados_whatsapp=dados_whatsapp,
     )
 
-    bot.enviar_mensagem_interativa(resposta)
+    await bot.enviar_mensagem_interativa_async(resposta)
 
     return resposta
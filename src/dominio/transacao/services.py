@@ -1,7 +1,8 @@
 import logging
 from typing import List
 
-from src.dominio.processamento.entidade import ConstrutorTransacao
+from src.dominio.graficos.cache import cache_graficos
+from src.dominio.processamento.entidade import ConstrutorTransacao, DadosTransacao
 from src.dominio.transacao.exceptions import ErroAoCriarTransacao
 from src.dominio.transacao.tipos import TipoTransacao
 from src.dominio.usuario.entidade import Usuario
@@ -38,6 +39,7 @@ def salvar_transacao(transacao: Transacao, uow: UnitOfWork):
         with uow:
             uow.repo_escrita.adicionar(transacao)
             uow.commit()
+        cache_graficos.invalidar(transacao.usuario.id)
     except Exception as e:
         logging.error(f"Erro ao criar transação para o usuario {transacao.usuario.email}: {e}")
         raise ErroAoCriarTransacao(f"Erro ao criar transação. Usuario: {transacao.usuario.email}")
@@ -47,8 +49,27 @@ def comando_criar_transacao(
     usuario: Usuario, tipo: str, mensagem: str, uow: UnitOfWork, telefone: str, dados_whatsapp: WhatsAppPayload
 ) -> dict:
     parser = ConstrutorTransacao(acao=TipoTransacao[tipo])
-    acao = "pagamento" if tipo == "DEBITO" else "recebimento"
     transacao_comando = parser.parse_message(mensagem)
+    return _registrar_transacao(usuario, tipo, transacao_comando, uow, telefone, dados_whatsapp)
+
+
+async def comando_criar_transacao_async(
+    usuario: Usuario, tipo: str, mensagem: str, uow: UnitOfWork, telefone: str, dados_whatsapp: WhatsAppPayload
+) -> dict:
+    parser = ConstrutorTransacao(acao=TipoTransacao[tipo])
+    transacao_comando = await parser.parse_message_async(mensagem)
+    return _registrar_transacao(usuario, tipo, transacao_comando, uow, telefone, dados_whatsapp)
+
+
+def _registrar_transacao(
+    usuario: Usuario,
+    tipo: str,
+    transacao_comando: DadosTransacao,
+    uow: UnitOfWork,
+    telefone: str,
+    dados_whatsapp: WhatsAppPayload,
+) -> dict:
+    acao = "pagamento" if tipo == "DEBITO" else "recebimento"
     transacao = Transacao(
         usuario=usuario,
         valor=transacao_comando.valor,
@@ -0,0 +1,157 @@
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from src.dominio.usuario.entidade import Usuario
+from src.dominio.usuario.repo import RepoUsuarioLeitura
+from src.infra.cache import obter_redis
+from src.infra.log import setup_logging
+from src.utils.cache import CacheLRU
+
+logger = setup_logging()
+
+AUSENTE = "ausente"
+
+
+class CacheUsuarios:
+    """
+    Resolve usuários pelo telefone sem ir ao Postgres a cada mensagem do WhatsApp.
+
+    Duas camadas de leitura: um LRU em memória com TTL curto e o Redis, compartilhado entre processos. No acerto
+    o Usuario é reanexado à sessão com merge(load=False), sem SELECT, e traz apenas id, nome, sobrenome, telefone
+    e email. A senha fica None e a relação `assinatura` não é carregada: o status da assinatura vem de
+    CacheStatusAssinatura, que não dispara o lazy load; quem precisar de outros campos deve ir ao repositório.
+
+    Telefones sem cadastro também ficam no Redis, para que quem está no onboarding não consulte o banco a cada
+    resposta. A ausência é gravada com SET NX e o cadastro grava o usuário por cima (`registrar`), então uma
+    busca que consultou o banco antes do cadastro não esconde o usuário recém-criado. Falhas no Redis caem no
+    banco.
+    """
+
+    PREFIXO = "usuarios:telefone"
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        ttl_ausente: Optional[int] = None,
+        cache_local: Optional[CacheLRU[Dict[str, Any]]] = None,
+    ) -> None:
+        self.ttl = ttl or int(os.getenv("USUARIOS_CACHE_TTL", 60 * 60))
+        self.ttl_ausente = ttl_ausente or int(os.getenv("USUARIOS_CACHE_TTL_AUSENTE", 60 * 5))
+        # Só guarda usuários encontrados: a ausência muda no cadastro e precisa ser invalidada em todos os processos
+        self.cache_local = cache_local or CacheLRU(
+            tamanho_maximo=int(os.getenv("USUARIOS_CACHE_LOCAL_TAMANHO", 10_000)),
+            ttl=float(os.getenv("USUARIOS_CACHE_LOCAL_TTL", 60)),
+        )
+
+    def _chave(self, telefone: str) -> str:
+        return f"{self.PREFIXO}:{telefone}"
+
+    @staticmethod
+    def _serializar(usuario: Usuario) -> Dict[str, Any]:
+        return {
+            "id": str(usuario.id),
+            "nome": usuario.nome,
+            "sobrenome": usuario.sobrenome,
+            "telefone": usuario.telefone,
+            "email": usuario.email,
+        }
+
+    @staticmethod
+    def _restaurar(session: Session, dados: Dict[str, Any]) -> Usuario:
+        usuario = Usuario(
+            nome=dados["nome"],
+            sobrenome=dados["sobrenome"],
+            telefone=dados["telefone"],
+            email=dados["email"],
+            id=UUID(dados["id"]),
+        )
+        make_transient_to_detached(usuario)
+        return session.merge(usuario, load=False)
+
+    def _ler(self, telefones: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Telefones conhecidos pelo cache; None indica telefone sem cadastro."""
+        conhecidos: Dict[str, Optional[Dict[str, Any]]] = {}
+        restantes = []
+        for telefone in telefones:
+            dados = self.cache_local.obter(telefone)
+            if dados is not None:
+                conhecidos[telefone] = dados
+            else:
+                restantes.append(telefone)
+
+        if not restantes:
+            return conhecidos
+
+        try:
+            valores = obter_redis().mget([self._chave(telefone) for telefone in restantes])
+        except RedisError as erro:
+            logger.warning(f"Cache de usuários indisponível: {erro}")
+            return conhecidos
+
+        for telefone, valor in zip(restantes, valores):
+            if valor is None:
+                continue
+            if valor.decode() == AUSENTE:
+                conhecidos[telefone] = None
+                continue
+            dados = json.loads(valor)
+            self.cache_local.salvar(telefone, dados)
+            conhecidos[telefone] = dados
+        return conhecidos
+
+    def _gravar(self, telefones: Iterable[str], encontrados: Dict[str, Usuario]) -> None:
+        try:
+            pipeline = obter_redis().pipeline(transaction=False)
+            for telefone in telefones:
+                usuario = encontrados.get(telefone)
+                if usuario is None:
+                    # nunca sobrescreve o usuário gravado por um cadastro concluído nesse meio-tempo
+                    pipeline.set(self._chave(telefone), AUSENTE, ex=self.ttl_ausente, nx=True)
+                    continue
+                dados = self._serializar(usuario)
+                self.cache_local.salvar(telefone, dados)
+                pipeline.set(self._chave(telefone), json.dumps(dados), ex=self.ttl)
+            pipeline.execute()
+        except RedisError as erro:
+            logger.warning(f"Não foi possível salvar usuários no cache: {erro}")
+
+    def buscar_por_telefones(self, repo: RepoUsuarioLeitura, telefones: Iterable[str]) -> Dict[str, Usuario]:
+        telefones = set(telefones)
+        conhecidos = self._ler(telefones)
+
+        faltantes = telefones - conhecidos.keys()
+        encontrados = repo.buscar_por_telefones(faltantes)
+        if faltantes:
+            self._gravar(faltantes, encontrados)
+
+        for telefone, dados in conhecidos.items():
+            if dados is not None:
+                encontrados[telefone] = self._restaurar(repo.session, dados)
+        return encontrados
+
+    def buscar_por_telefone(self, repo: RepoUsuarioLeitura, telefone: str) -> Optional[Usuario]:
+        return self.buscar_por_telefones(repo, [telefone]).get(telefone)
+
+    def registrar(self, usuario: Usuario) -> None:
+        """Grava o usuário recém-cadastrado, substituindo a ausência que estiver em cache."""
+        dados = self._serializar(usuario)
+        self.cache_local.salvar(usuario.telefone, dados)
+        try:
+            obter_redis().set(self._chave(usuario.telefone), json.dumps(dados), ex=self.ttl)
+        except RedisError as erro:
+            logger.warning(f"Não foi possível salvar o usuário {usuario.telefone} no cache: {erro}")
+
+    def invalidar(self, telefone: str) -> None:
+        self.cache_local.remover(telefone)
+        try:
+            obter_redis().delete(self._chave(telefone))
+        except RedisError as erro:
+            logger.warning(f"Não foi possível invalidar o usuário {telefone} no cache: {erro}")
+
+
+cache_usuarios = CacheUsuarios()
@@ -1,4 +1,3 @@
-import os
 import uuid
 
 import redis
@@ -9,15 +8,11 @@ from typing import Optional, Generator
 
 from src.dominio.usuario.entidade import UsuarioModel
 from src.dominio.usuario.services import criar_usuario, PasswordHasher
+from src.infra.cache import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT
 from src.infra.database.uow import UnitOfWork
 from src.infra.emails import enviar_email_boas_vindas
 from src.utils.validadores import validar_email
 
-ENV = os.getenv("ENV", "dev")
-REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
-REDIS_PORT = os.getenv("REDIS_PORT", 6379)
-REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "1234") if ENV == "dev" else None
-
 
 class OnboardingState(Enum):
     INITIAL = auto()
@@ -1,5 +1,10 @@
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
 from src.dominio.usuario.entidade import Usuario
-from src.infra.database.repo import RepoLeitura, RepoEscrita
+from src.infra.database.repo import RepoLeitura, RepoLeituraAsync, RepoEscrita
 
 
 class RepoUsuarioLeitura(RepoLeitura):
@@ -7,10 +12,51 @@ class RepoUsuarioLeitura(RepoLeitura):
         return self.session.query(Usuario).filter(Usuario.email == email).first()
 
     def buscar_por_telefone(self, telefone: str):
-        return self.session.query(Usuario).filter(Usuario.telefone == telefone).first()
+        return (
+            self.session.query(Usuario)
+            .options(joinedload(Usuario.assinatura))
+            .filter(Usuario.telefone == telefone)
+            .first()
+        )
+
+    def buscar_por_telefones(self, telefones: Iterable[str]) -> Dict[str, Usuario]:
+        telefones = set(telefones)
+        if not telefones:
+            return {}
+        usuarios = (
+            self.session.query(Usuario)
+            .options(joinedload(Usuario.assinatura))
+            .filter(Usuario.telefone.in_(telefones))
+            .all()
+        )
+        return {usuario.telefone: usuario for usuario in usuarios}
 
     def buscar_por_id(self, id: int):
         return self.session.query(Usuario).filter(Usuario.id == id).first()
 
     def buscar_por_email_e_senha(self, email: str, senha: str):
         return self.session.query(Usuario).filter(Usuario.email == email, Usuario.senha == senha).first()
+
+
+class RepoUsuarioLeituraAsync(RepoLeituraAsync):
+    """Buscas de usuário sobre AsyncSession; a assinatura vem junto porque lazy load não funciona no modo async."""
+
+    async def buscar_por_email(self, email: str) -> Optional[Usuario]:
+        return await self.session.scalar(select(Usuario).where(Usuario.email == email).limit(1))
+
+    async def buscar_por_telefone(self, telefone: str) -> Optional[Usuario]:
+        consulta = (
+            select(Usuario).options(joinedload(Usuario.assinatura)).where(Usuario.telefone == telefone).limit(1)
+        )
+        return await self.session.scalar(consulta)
+
+    async def buscar_por_telefones(self, telefones: Iterable[str]) -> Dict[str, Usuario]:
+        telefones = set(telefones)
+        if not telefones:
+            return {}
+        consulta = select(Usuario).options(joinedload(Usuario.assinatura)).where(Usuario.telefone.in_(telefones))
+        usuarios = (await self.session.scalars(consulta)).unique().all()
+        return {usuario.telefone: usuario for usuario in usuarios}
+
+    async def buscar_por_id(self, id: int) -> Optional[Usuario]:
+        return await self.session.scalar(select(Usuario).where(Usuario.id == id).limit(1))
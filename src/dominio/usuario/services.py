@@ -6,6 +6,7 @@ from pydantic import SecretStr
 from stripe import Subscription
 
 from src.dominio.assinatura.services import criar_cliente_stripe, criar_assinatura
+from src.dominio.usuario.cache import cache_usuarios
 from src.dominio.usuario.entidade import Usuario, UsuarioModel
 from src.dominio.usuario.exceptions import ErroAoCriarUsuario, UsuarioJaExiste
 from src.dominio.usuario.repo import RepoUsuarioLeitura
@@ -57,6 +58,7 @@ def criar_usuario(usuario: UsuarioModel, uow: UnitOfWork) -> Usuario | None:
         with uow:
             uow.repo_escrita.adicionar(entidade)
             uow.commit()
+            cache_usuarios.registrar(entidade)
 
             cliente_stripe = criar_cliente_stripe(entidade)
             _, assinatura = criar_assinatura(cliente_stripe)
@@ -0,0 +1,27 @@
+import os
+from typing import Optional
+
+import redis
+
+ENV = os.getenv("ENV", "dev")
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = os.getenv("REDIS_PORT", 6379)
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "1234") if ENV == "dev" else None
+
+_cliente: Optional[redis.StrictRedis] = None
+
+
+def obter_redis() -> redis.StrictRedis:
+    """Cliente Redis compartilhado pelo processo; o pool de conexões interno é reaproveitado entre requisições."""
+    global _cliente
+
+    if _cliente is None:
+        _cliente = redis.StrictRedis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=0,
+            password=REDIS_PASSWORD,
+            socket_timeout=float(os.getenv("REDIS_TIMEOUT", 0.5)),
+            socket_connect_timeout=float(os.getenv("REDIS_TIMEOUT", 0.5)),
+        )
+    return _cliente
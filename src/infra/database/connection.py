@@ -1,16 +1,102 @@
+import time
+import uuid
 from contextlib import contextmanager
+from contextvars import ContextVar
 from os import getenv
+from threading import get_ident
+from typing import Any, Dict, Iterator, Optional
+
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
+
+from src.infra.metricas import MetricaTempo
 
 DATABASE_URL = getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL, echo=False)
+DATABASE_REPLICA_URL = getenv("DATABASE_REPLICA_URL")
+
+
+class PoolInstrumentado(QueuePool):
+    """QueuePool que mede quanto cada checkout esperou por uma conexão livre (ou pela abertura de uma nova)."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.espera = MetricaTempo()
+        self.esgotamentos = 0
+
+    def _do_get(self) -> Any:
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.esgotamentos += 1
+            raise
+        finally:
+            self.espera.registrar(time.perf_counter() - inicio)
+
+    def recreate(self) -> "PoolInstrumentado":
+        novo = super().recreate()
+        novo.espera, novo.esgotamentos = self.espera, self.esgotamentos
+        return novo
+
+
+def _criar_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        echo=False,
+        poolclass=PoolInstrumentado,
+        pool_size=int(getenv("DATABASE_POOL_SIZE", 5)),
+        max_overflow=int(getenv("DATABASE_MAX_OVERFLOW", 10)),
+        pool_timeout=float(getenv("DATABASE_POOL_TIMEOUT", 30)),
+        pool_recycle=int(getenv("DATABASE_POOL_RECYCLE", 1800)),
+        pool_pre_ping=getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true",
+    )
+
+
+engine = _criar_engine(DATABASE_URL)
+# Réplica de leitura opcional; sem DATABASE_REPLICA_URL tudo continua no primário
+engine_replica: Optional[Engine] = _criar_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
 
-Session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False))
+# Dentro de `escopo_sessao` (uma requisição HTTP, um item da fila de webhooks) cada escopo tem a sua sessão;
+# fora dele (scheduler, CLI) vale a sessão da thread, como antes
+_escopo_sessao: ContextVar[Optional[str]] = ContextVar("escopo_sessao", default=None)
+
+
+def _chave_escopo() -> Any:
+    return _escopo_sessao.get() or get_ident()
+
+
+Session = scoped_session(
+    sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False),
+    scopefunc=_chave_escopo,
+)
+SessionReplica: Optional[scoped_session] = (
+    scoped_session(
+        sessionmaker(autocommit=False, autoflush=False, bind=engine_replica, expire_on_commit=False),
+        scopefunc=_chave_escopo,
+    )
+    if engine_replica is not None
+    else None
+)
 
 metadata = MetaData()
 
 
+@contextmanager
+def escopo_sessao() -> Iterator[None]:
+    """Abre um escopo com sessão própria; ao sair a sessão é fechada e a conexão volta ao pool."""
+    token = _escopo_sessao.set(uuid.uuid4().hex)
+    try:
+        yield
+    finally:
+        Session.remove()
+        if SessionReplica is not None:
+            SessionReplica.remove()
+        _escopo_sessao.reset(token)
+
+
 @contextmanager
 def GET_DEFAULT_SESSION_CONTEXT():
     session = Session()
@@ -24,3 +110,19 @@ def GET_DEFAULT_SESSION_CONTEXT():
 
 def get_session():
     return Session()
+
+
+def metricas_pool(alvo: Engine = engine, registro: scoped_session = Session) -> Dict[str, Any]:
+    pool = alvo.pool
+    metricas: Dict[str, Any] = {
+        "tamanho": pool.size(),
+        "em_uso": pool.checkedout(),
+        "ociosas": pool.checkedin(),
+        # QueuePool começa o overflow em -pool_size; negativo quer dizer conexões do pool ainda não abertas
+        "overflow": max(pool.overflow(), 0),
+        "sessoes_abertas": len(registro.registry.registry),
+    }
+    if isinstance(pool, PoolInstrumentado):
+        metricas["esgotamentos"] = pool.esgotamentos
+        metricas["espera_checkout"] = pool.espera.resumo()
+    return metricas
@@ -0,0 +1,63 @@
+import importlib.util
+from os import getenv
+from typing import Dict, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.infra.database.connection import DATABASE_URL
+
+_engines: Dict[str, AsyncEngine] = {}
+_fabricas: Dict[str, async_sessionmaker[AsyncSession]] = {}
+
+
+def banco_async_disponivel() -> bool:
+    """Verdadeiro quando o extra async (asyncpg) está instalado; sem ele tudo continua no psycopg2."""
+    return importlib.util.find_spec("asyncpg") is not None
+
+
+def url_async(url: str) -> str:
+    """Mesma DATABASE_URL, trocando o driver para asyncpg (postgresql://... -> postgresql+asyncpg://...)."""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def obter_engine_async(url: Optional[str] = None) -> AsyncEngine:
+    """
+    AsyncEngine sobre asyncpg para `url` (o primário, por padrão), criado no primeiro uso com as mesmas variáveis
+    de pool do engine síncrono.
+
+    asyncpg é opcional: sem ele o restante da aplicação continua no psycopg2.
+    """
+    url = url or DATABASE_URL
+    if url not in _engines:
+        try:
+            import asyncpg  # noqa: F401
+        except ImportError as erro:
+            raise ImportError("Banco assíncrono indisponível: instale o extra async (poetry install -E async)") from erro
+
+        _engines[url] = create_async_engine(
+            url_async(url),
+            echo=False,
+            pool_size=int(getenv("DATABASE_POOL_SIZE", 5)),
+            max_overflow=int(getenv("DATABASE_MAX_OVERFLOW", 10)),
+            pool_timeout=float(getenv("DATABASE_POOL_TIMEOUT", 30)),
+            pool_recycle=int(getenv("DATABASE_POOL_RECYCLE", 1800)),
+            pool_pre_ping=getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true",
+        )
+    return _engines[url]
+
+
+def get_session_async(url: Optional[str] = None) -> AsyncSession:
+    url = url or DATABASE_URL
+    if url not in _fabricas:
+        _fabricas[url] = async_sessionmaker(
+            bind=obter_engine_async(url), autoflush=False, expire_on_commit=False, class_=AsyncSession
+        )
+    return _fabricas[url]()
+
+
+async def fechar_engine_async() -> None:
+    for engine in _engines.values():
+        await engine.dispose()
+    _engines.clear()
+    _fabricas.clear()
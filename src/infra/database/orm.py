@@ -8,6 +8,8 @@ from sqlalchemy import (
     ForeignKey,
     Boolean,
     Enum,
+    Index,
+    func,
 )
 from sqlalchemy.orm import registry, relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -29,6 +31,8 @@ usuarios = Table(
     Column("telefone", String),
     Column("email", String),
     Column("senha", String, default=None),
+    Index("ix_usuarios_telefone", "telefone", unique=True),
+    Index("ix_usuarios_email", "email", unique=True),
 )
 
 transacoes = Table(
@@ -44,8 +48,12 @@ transacoes = Table(
     Column("caixa", DateTime),
     Column("competencia", DateTime),
     Column("wamid", String, nullable=False),
+    Index("ix_transacoes_usuario_id_caixa", "usuario_id", "caixa"),
+    Index("ix_transacoes_usuario_id_tipo_caixa", "usuario_id", "tipo", "caixa"),
 )
 
+Index("ix_transacoes_lower_wamid", func.lower(transacoes.c.wamid))
+
 assinaturas = Table(
     "assinaturas",
     metadata,
@@ -0,0 +1,89 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as SessaoORM
+
+from src.infra.cache import obter_redis
+from src.infra.database.connection import DATABASE_REPLICA_URL, SessionReplica, get_session
+from src.infra.database.connection_async import get_session_async
+from src.infra.log import setup_logging
+from src.utils.cache import CacheLRU
+
+logger = setup_logging()
+
+JANELA_PRIMARIO = int(os.getenv("DATABASE_REPLICA_JANELA", 10))
+
+_usuario_escopo: ContextVar[Optional[UUID]] = ContextVar("usuario_escopo", default=None)
+_fixados: CacheLRU[bool] = CacheLRU(tamanho_maximo=10_000, ttl=JANELA_PRIMARIO)
+
+
+def _chave(usuario_id: UUID) -> str:
+    return f"database:primario:{usuario_id}"
+
+
+@contextmanager
+def escopo_usuario(usuario_id: Optional[UUID]) -> Iterator[None]:
+    """Marca de quem é o trabalho em andamento, para a escolha entre réplica e primário."""
+    token = _usuario_escopo.set(usuario_id)
+    try:
+        yield
+    finally:
+        _usuario_escopo.reset(token)
+
+
+def registrar_escrita() -> None:
+    """
+    Depois de um commit, o usuário do escopo lê do primário por DATABASE_REPLICA_JANELA segundos.
+
+    Assim quem acabou de lançar algo não pede um relatório à réplica antes de a escrita chegar nela. O Redis
+    leva a marca para os outros processos; o LRU local cobre o mesmo processo mesmo sem Redis.
+    """
+    usuario_id = _usuario_escopo.get()
+    if SessionReplica is None or usuario_id is None:
+        return
+
+    _fixados.salvar(usuario_id, True)
+    try:
+        obter_redis().set(_chave(usuario_id), 1, ex=JANELA_PRIMARIO)
+    except RedisError as erro:
+        logger.warning(f"Não foi possível fixar o usuário {usuario_id} no primário: {erro}")
+
+
+def fixado_no_primario(usuario_id: UUID) -> bool:
+    if _fixados.obter(usuario_id):
+        return True
+    try:
+        return bool(obter_redis().exists(_chave(usuario_id)))
+    except RedisError as erro:
+        # Sem saber se houve escrita recente, o primário é a escolha segura
+        logger.warning(f"Janela de leitura no primário indisponível: {erro}")
+        return True
+
+
+def _ler_da_replica() -> bool:
+    if SessionReplica is None:
+        return False
+    usuario_id = _usuario_escopo.get()
+    return usuario_id is None or not fixado_no_primario(usuario_id)
+
+
+def get_session_leitura() -> SessaoORM:
+    """
+    Sessão para consultas só de leitura (relatórios, exportação): a réplica, se houver DATABASE_REPLICA_URL.
+
+    Volta para o primário quando o usuário do escopo escreveu há pouco. Objetos lidos aqui não devem ser
+    alterados por um UnitOfWork, que usa a sessão do primário.
+    """
+    if _ler_da_replica():
+        return SessionReplica()
+    return get_session()
+
+
+def get_session_leitura_async() -> AsyncSession:
+    """Mesma escolha entre réplica e primário do get_session_leitura, numa AsyncSession nova (asyncpg)."""
+    return get_session_async(DATABASE_REPLICA_URL if _ler_da_replica() else None)
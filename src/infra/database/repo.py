@@ -1,6 +1,8 @@
 from abc import ABC
-from typing import Iterator, Generic, TypeVar
+from typing import Iterator, Generic, List, TypeVar
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 T = TypeVar("T")
@@ -20,8 +22,23 @@ class RepoEscrita(RepoBase[T]):
 
 
 class RepoLeitura(RepoBase[T]):
-    def __del__(self):
-        self.session.close()
-
     def buscar_todos(self, entidade: T) -> Iterator:
         yield from self.session.query(entidade).all()
+
+
+class RepoBaseAsync(ABC, Generic[T]):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+class RepoEscritaAsync(RepoBaseAsync[T]):
+    def adicionar(self, entidade: T):
+        self.session.add(entidade)
+
+    async def remover(self, entidade: T):
+        await self.session.delete(entidade)
+
+
+class RepoLeituraAsync(RepoBaseAsync[T]):
+    async def buscar_todos(self, entidade: T) -> List[T]:
+        return list((await self.session.scalars(select(entidade))).all())
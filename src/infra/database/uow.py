@@ -1,10 +1,13 @@
 from __future__ import annotations
 from sqlalchemy.orm import Session
-from contextlib import AbstractContextManager
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
 from typing import Callable, TypeVar, Type
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.infra.database.connection import Session
-from src.infra.database.repo import RepoEscrita, RepoLeitura, RepoBase
+from src.infra.database.replica import registrar_escrita
+from src.infra.database.repo import RepoEscrita, RepoEscritaAsync, RepoLeitura, RepoBase
 
 T = TypeVar("T")
 
@@ -25,6 +28,34 @@ class UnitOfWork(AbstractContextManager):
 
     def commit(self):
         self.session.commit()
+        registrar_escrita()
 
     def rollback(self):
         self.session.rollback()
+
+
+class AsyncUnitOfWork(AbstractAsyncContextManager):
+    """Mesma ideia do UnitOfWork sobre uma AsyncSession; ao sair desfaz o que não foi commitado e fecha a sessão."""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self._session_factory = session_factory
+        self.session: AsyncSession | None = None
+        self.repo_escrita: RepoEscritaAsync | None = None
+
+    async def __aenter__(self) -> AsyncUnitOfWork:
+        self.session = self._session_factory()
+        self.repo_escrita = RepoEscritaAsync[T](self.session)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            await self.rollback()
+        finally:
+            await self.session.close()
+
+    async def commit(self):
+        await self.session.commit()
+        registrar_escrita()
+
+    async def rollback(self):
+        await self.session.rollback()
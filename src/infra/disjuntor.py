@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Optional
+
+from src.infra.log import setup_logging
+
+logger = setup_logging()
+
+
+class Disjuntor:
+    """
+    Circuit breaker para dependências externas.
+
+    Depois de `falhas_maximas` falhas seguidas o circuito abre e as chamadas são recusadas na hora, sem tocar a
+    rede, por `pausa` segundos. Passada a pausa, uma única chamada de teste é liberada (meio aberto): se der certo
+    o circuito fecha, se falhar volta a abrir.
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, nome: str, falhas_maximas: int = 5, pausa: float = 30) -> None:
+        self.nome = nome
+        self.falhas_maximas = falhas_maximas
+        self.pausa = pausa
+        self._falhas = 0
+        self._aberto_em: Optional[float] = None
+        self._teste_em_andamento = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            return self._estado()
+
+    def _estado(self) -> str:
+        if self._aberto_em is None:
+            return self.FECHADO
+        if time.monotonic() - self._aberto_em >= self.pausa:
+            return self.MEIO_ABERTO
+        return self.ABERTO
+
+    def permitir(self) -> bool:
+        with self._lock:
+            estado = self._estado()
+            if estado == self.FECHADO:
+                return True
+            if estado == self.MEIO_ABERTO and not self._teste_em_andamento:
+                self._teste_em_andamento = True
+                return True
+            return False
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            if self._aberto_em is not None:
+                logger.info(f"Circuito {self.nome} fechado")
+            self._falhas = 0
+            self._aberto_em = None
+            self._teste_em_andamento = False
+
+    def registrar_falha(self) -> None:
+        with self._lock:
+            self._falhas += 1
+            self._teste_em_andamento = False
+            if self._aberto_em is not None or self._falhas >= self.falhas_maximas:
+                if self._aberto_em is None:
+                    logger.warning(f"Circuito {self.nome} aberto após {self._falhas} falhas seguidas")
+                self._aberto_em = time.monotonic()
@@ -0,0 +1,61 @@
+import asyncio
+import importlib.util
+import os
+from typing import Optional
+
+import httpx
+
+from src.infra.log import setup_logging
+
+logger = setup_logging()
+
+_cliente: Optional[httpx.AsyncClient] = None
+_loop_cliente: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http2_habilitado() -> bool:
+    """HTTP/2 depende do pacote h2 (extra http2 do httpx); sem ele o cliente usa HTTP/1.1 com keep-alive."""
+    if os.getenv("WHATSAPP_HTTP2", "true").lower() not in ("1", "true", "sim"):
+        return False
+    return importlib.util.find_spec("h2") is not None
+
+
+def _criar_cliente() -> httpx.AsyncClient:
+    limites = httpx.Limits(
+        max_connections=int(os.getenv("WHATSAPP_HTTP_MAX_CONEXOES", 100)),
+        max_keepalive_connections=int(os.getenv("WHATSAPP_HTTP_MAX_KEEPALIVE", 20)),
+        keepalive_expiry=float(os.getenv("WHATSAPP_HTTP_KEEPALIVE_EXPIRY", 30)),
+    )
+    timeout = httpx.Timeout(
+        float(os.getenv("WHATSAPP_HTTP_TIMEOUT", 10)),
+        connect=float(os.getenv("WHATSAPP_HTTP_CONNECT_TIMEOUT", 5)),
+        pool=float(os.getenv("WHATSAPP_HTTP_POOL_TIMEOUT", 5)),
+    )
+    http2 = _http2_habilitado()
+    logger.info(f"Cliente HTTP do WhatsApp criado (http2={http2})")
+    return httpx.AsyncClient(http2=http2, limits=limites, timeout=timeout)
+
+
+def obter_cliente_whatsapp() -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP assíncrono compartilhado pelo processo para o WhatsApp Cloud API.
+
+    As conexões ficam vinculadas ao event loop em que foram abertas, então um novo cliente é criado
+    se o loop mudar (por exemplo, entre testes ou em um asyncio.run da CLI).
+    """
+    global _cliente, _loop_cliente
+
+    loop = asyncio.get_running_loop()
+    if _cliente is None or _cliente.is_closed or _loop_cliente is not loop:
+        _cliente = _criar_cliente()
+        _loop_cliente = loop
+    return _cliente
+
+
+async def fechar_cliente_whatsapp() -> None:
+    global _cliente, _loop_cliente
+
+    if _cliente is not None and not _cliente.is_closed:
+        await _cliente.aclose()
+    _cliente = None
+    _loop_cliente = None
@@ -0,0 +1,46 @@
+import statistics
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class MetricaTempo:
+    """
+    Acumula durações (em segundos) e resume contagem, média e percentis.
+
+    Os percentis usam só as últimas `janela` amostras, então refletem o comportamento recente sem crescer a
+    memória com o tempo de vida do processo.
+    """
+
+    def __init__(self, janela: int = 1024) -> None:
+        self._amostras: Deque[float] = deque(maxlen=janela)
+        self._quantidade = 0
+        self._total = 0.0
+        self._maximo = 0.0
+        self._lock = threading.Lock()
+
+    def registrar(self, segundos: float) -> None:
+        with self._lock:
+            self._amostras.append(segundos)
+            self._quantidade += 1
+            self._total += segundos
+            self._maximo = max(self._maximo, segundos)
+
+    def resumo(self) -> Dict[str, float]:
+        with self._lock:
+            amostras = sorted(self._amostras)
+            quantidade, total, maximo = self._quantidade, self._total, self._maximo
+
+        if len(amostras) > 1:
+            percentis = statistics.quantiles(amostras, n=100, method="inclusive")
+            p50, p95 = percentis[49], percentis[94]
+        else:
+            p50 = p95 = amostras[0] if amostras else 0.0
+
+        return {
+            "quantidade": quantidade,
+            "media_ms": round(total / quantidade * 1000, 3) if quantidade else 0.0,
+            "p50_ms": round(p50 * 1000, 3),
+            "p95_ms": round(p95 * 1000, 3),
+            "max_ms": round(maximo * 1000, 3),
+        }
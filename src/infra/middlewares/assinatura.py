@@ -1,80 +1,49 @@
 import traceback
-from typing import Callable, Any
+from typing import Sequence
 
-from starlette import status
-from starlette.exceptions import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from src.dominio.assinatura.entidade import StatusAssinatura
-from src.dominio.assinatura.repo import RepoAssinaturaLeitura
-from src.dominio.assinatura.services import criar_customer_portal_link
+from src.dominio.assinatura.services import avisar_assinatura_cancelada
 from src.dominio.bot.entidade import WhatsAppBot
 from src.dominio.usuario.entidade import Usuario
-from src.infra.database.connection import get_session
 from src.infra.log import setup_logging
 
 logger = setup_logging()
 
 
-class AssinaturaMiddleware(BaseHTTPMiddleware):
+class AssinaturaMiddleware:
     """
-    Middleware to check user subscription status and handle canceled subscriptions
+    Middleware ASGI to check user subscription status and handle canceled subscriptions.
+
+    Only acts on non-GET HTTP requests outside `prefixos_ignorados` that already carry an authenticated user
+    in request.state.usuario; everything else goes straight to the app. WhatsApp messages are checked in
+    processar_mensagens, where the user is actually resolved.
     """
 
-    def __init__(self, app: Any) -> None:
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, prefixos_ignorados: Sequence[str] = ("/bot/", "/static")) -> None:
+        self.app = app
+        self.prefixos_ignorados = tuple(prefixos_ignorados)
         self.bot = WhatsAppBot()
 
     async def _check_subscription_status(self, usuario: Usuario) -> None:
         """
         Check the subscription status for a given user
-        If subscription is canceled, send a WhatsApp notification
+        If subscription is canceled, send a WhatsApp notification (at most once per window)
         """
         try:
-            repo_assinatura = RepoAssinaturaLeitura(session=get_session())
-            assinatura = repo_assinatura.buscar_por_id_usuario(usuario.id)
-
-            if not assinatura or assinatura.status != StatusAssinatura.CANCELADA:
-                return
-
-            link = criar_customer_portal_link(subscription_id=assinatura.stripe_id)
-
-            mensagem = (
-                f"Olá, {usuario.nome}! 👋\n\n"
-                "Notamos que sua assinatura foi cancelada. 📅\n\n"
-                "Sentimos sua falta e gostaríamos de entender o motivo. "
-                "Há algo que possamos fazer para melhorar sua experiência?\n\n"
-                "Acesse o link abaixo e renove sua assinatura:\n"
-                f"{link.url}"
-                "Se quiser tirar dúvidas, entre em contato conosco: cadernetapp@gmail.com\n\n"
-            )
-
-            # Send message via WhatsApp
-            self.bot.responder(mensagem, usuario.telefone)
-
+            await avisar_assinatura_cancelada(self.bot, usuario)
         except Exception as e:
             logger.error(f"Error checking subscription status for user {usuario.id}: {str(e)}")
             traceback.print_exc()
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Main dispatch method for the middleware
-        Checks subscription status for authenticated routes
-        """
-        # Skip subscription check for certain routes or methods
-        if request.method == "GET" or "/bot/" in request.url.path:
-            return await call_next(request)
+    def _usuario(self, scope: Scope) -> Usuario | None:
+        if scope["type"] != "http" or scope["method"] == "GET" or scope["path"].startswith(self.prefixos_ignorados):
+            return None
+        return scope.get("state", {}).get("usuario")
 
-        # Check if user is authenticated (you might need to adjust this based on your auth mechanism)
-        usuario = request.state.usuario
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        usuario = self._usuario(scope)
         if usuario:
             await self._check_subscription_status(usuario)
 
-        try:
-            return await call_next(request)
-        except Exception as e:
-            logger.error(f"Error in subscription status middleware: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+        await self.app(scope, receive, send)
@@ -0,0 +1,23 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.infra.database.connection import escopo_sessao
+
+
+class SessaoMiddleware:
+    """
+    Middleware ASGI que dá a cada requisição HTTP a sua própria sessão do banco.
+
+    Tudo o que chama get_session() durante a requisição recebe a mesma sessão, que é fechada (devolvendo a
+    conexão ao pool) quando a resposta termina, com ou sem erro.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with escopo_sessao():
+            await self.app(scope, receive, send)
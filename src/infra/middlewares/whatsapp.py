@@ -1,86 +1,103 @@
 import json
 import traceback
-from typing import Callable, Any, Optional
+from typing import List
 
 from starlette import status
-from starlette.exceptions import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
-
-from src.dominio.assinatura.entidade import StatusAssinatura
-from src.dominio.bot.entidade import WhatsAppBot
-from src.dominio.usuario.onboard import Onboard
-from src.dominio.usuario.repo import RepoUsuarioLeitura
-from src.infra.database.connection import get_session
-from src.infra.database.uow import UnitOfWork
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.dominio.bot.deduplicacao import deduplicador_webhook
+from src.dominio.bot.ingestao import fila_webhook, mensagens_novas
 from src.infra.log import setup_logging
-from src.utils.whatsapp_api import parse_whatsapp_payload
+from src.utils.whatsapp_api import WhatsAppPayload
 
 logger = setup_logging()
 
 
-class WhatsAppOnboardMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware para processar requisições de onboarding de usuários com deduplicação de webhooks.
-    """
+async def ler_corpo(receive: Receive) -> bytes:
+    """Lê o corpo inteiro da requisição ASGI, juntando os pedaços enviados pelo servidor."""
+    partes = []
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] != "http.request":
+            break
+        partes.append(mensagem.get("body", b""))
+        if not mensagem.get("more_body", False):
+            break
+    return b"".join(partes)
 
-    def __init__(self, app: Any) -> None:
-        super().__init__(app)
-        self.bot = WhatsAppBot()
-
-    async def _process_webhook(self, request: Request) -> None | JSONResponse:
-        """Process the webhook data and return appropriate response"""
-        try:
-            raw_data = await request.body()
-            dados = json.loads(raw_data)
-            parsed_data = parse_whatsapp_payload(dados)
 
-            logger.info("Dados WhatsApp: %s", json.dumps(dados, indent=2))
+def repetir_corpo(corpo: bytes, receive: Receive) -> Receive:
+    """Devolve o corpo já lido para a aplicação; depois disso repassa as mensagens do servidor (ex.: disconnect)."""
+    entregue = False
 
-            if not parsed_data:
-                return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "skipped"})
+    async def receber() -> Message:
+        nonlocal entregue
+        if entregue:
+            return await receive()
+        entregue = True
+        return {"type": "http.request", "body": corpo, "more_body": False}
 
-            repo = RepoUsuarioLeitura(session=get_session())
-            usuario = repo.buscar_por_telefone(parsed_data.telefone)
+    return receber
 
-            if not usuario:
-                uow = UnitOfWork(session_factory=get_session)
-                onboard = Onboard(uow=uow)
-                pergunta_onboard = onboard.handle_message(parsed_data.telefone, parsed_data.mensagem)
-                resposta = self.bot.responder(pergunta_onboard, parsed_data.telefone)
-                return JSONResponse(content=resposta.get("content"), status_code=resposta.get("status_code"))
 
-            request.state.dados_whatsapp = parsed_data
-            request.state.usuario = usuario
+class WhatsAppOnboardMiddleware:
+    """
+    Middleware ASGI de entrada do webhook do WhatsApp: só atua no POST de `caminho`, lê e interpreta o corpo uma
+    vez e separa as mensagens novas (sem reenvios nem callbacks de status). O lote segue para a rota em
+    request.state.mensagens_whatsapp ou para a fila; as demais requisições passam direto.
+    """
 
+    def __init__(self, app: ASGIApp, caminho: str = "/bot/whatsapp") -> None:
+        self.app = app
+        self.caminho = caminho
+
+    def _ativo(self, scope: Scope) -> bool:
+        return scope["type"] == "http" and scope["method"] == "POST" and scope["path"].rstrip("/") == self.caminho
+
+    @staticmethod
+    def _ler_mensagens(corpo: bytes) -> List[WhatsAppPayload]:
+        return mensagens_novas(json.loads(corpo))
+
+    @staticmethod
+    def _enfileirar(mensagens: List[WhatsAppPayload]) -> JSONResponse:
+        """Modo fila: enfileira o lote e responde na hora; o processamento fica com os workers"""
+        if not fila_webhook.enfileirar(mensagens):
+            # A Meta vai reenviar; os wamids precisam estar livres para a nova entrega ser aceita
+            for mensagem in mensagens:
+                deduplicador_webhook.liberar(mensagem.wamid)
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "busy"})
+        return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "queued"})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self._ativo(scope):
+            await self.app(scope, receive, send)
+            return
+
+        corpo = await ler_corpo(receive)
+        try:
+            mensagens = self._ler_mensagens(corpo)
         except json.JSONDecodeError:
             logger.error("Invalid JSON payload")
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload")
-        except Exception as e:
-            raw_data = await request.body()
-            dados = json.loads(raw_data)
-            parsed_data = parse_whatsapp_payload(dados)
-            logger.error(f"Error processing webhook: {str(e)}")
-            traceback.print_exc()
-            self.bot.responder(
-                f"Ocorreu um erro desconhecido. Se o erro persistir, envie um email para cadernetapp@gmail.com",
-                parsed_data.telefone,
-            )
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error processing message")
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Main dispatch method for the middleware"""
-        if "/bot/whatsapp" not in request.url.path or request.method == "GET":
-            return await call_next(request)
-
-        response = await self._process_webhook(request)
-        if response is not None:
-            return response
-
+            resposta = JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": "Invalid JSON payload"})
+            await resposta(scope, receive, send)
+            return
+
+        if not mensagens:
+            resposta = JSONResponse(status_code=status.HTTP_200_OK, content={"status": "skipped"})
+        elif fila_webhook.iniciada:
+            resposta = self._enfileirar(mensagens)
+        else:
+            resposta = None
+
+        if resposta is not None:
+            await resposta(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["mensagens_whatsapp"] = mensagens
         try:
-            return await call_next(request)
+            await self.app(scope, repetir_corpo(corpo, receive), send)
         except Exception as e:
             logger.error(f"Error in middleware chain: {str(e)}")
             logger.error(traceback.format_exc())
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+            raise
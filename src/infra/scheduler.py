@@ -6,7 +6,17 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from fastapi import FastAPI
 
+from src.dominio.bot.ingestao import fila_webhook
+from src.dominio.graficos.renderizador import renderizador_graficos
+from src.dominio.processamento.categorias import modelo_categorias
+from src.dominio.processamento.categorizador import cliente_categorizador
 from src.dominio.processamento.entidade import ClassificadorTexto
+from src.dominio.processamento.registro import registro_modelo
+from src.dominio.transacao.repo import RepoTransacaoLeitura
+from src.infra.database.connection import escopo_sessao
+from src.infra.database.connection_async import fechar_engine_async
+from src.infra.database.replica import get_session_leitura
+from src.infra.http import fechar_cliente_whatsapp
 from src.infra.log import setup_logging
 
 logger = setup_logging()
@@ -15,12 +25,28 @@ scheduler = BackgroundScheduler(timezone=pytz.UTC)
 
 
 def treinar_modelo() -> None:
-    classificador = ClassificadorTexto()
+    classificador = ClassificadorTexto(treinamento=True)
     classificador.treinar_modelo()
     classificador.salvar_modelo()
+    registro_modelo.recarregar()
 
     logger.info("Modelo treinado com sucesso!")
 
+    try:
+        treinar_modelo_categorias()
+    except Exception as erro:
+        logger.error(f"Erro ao treinar modelo de categorias: {erro}", exc_info=True)
+
+
+def treinar_modelo_categorias() -> None:
+    # agregação sobre todas as transações: vai para a réplica, se houver
+    with escopo_sessao():
+        exemplos = RepoTransacaoLeitura(session=get_session_leitura()).destinos_categorizados()
+
+    resumo = modelo_categorias.treinar(exemplos)
+    if resumo:
+        logger.info(f"Modelo de categorias treinado: {resumo}")
+
 
 async def iniciar_scheduler() -> None:
     scheduler.add_job(
@@ -38,4 +64,12 @@ async def iniciar_scheduler() -> None:
 @asynccontextmanager
 async def iniciar_servicos(app: FastAPI) -> AsyncGenerator:
     await iniciar_scheduler()
+    renderizador_graficos.iniciar()
+    if fila_webhook.ativa():
+        fila_webhook.iniciar()
     yield
+    await fila_webhook.encerrar()
+    await fechar_cliente_whatsapp()
+    await cliente_categorizador.fechar()
+    await fechar_engine_async()
+    renderizador_graficos.encerrar()
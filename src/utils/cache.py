@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class CacheLRU(Generic[V]):
+    """
+    Cache em memória com limite de itens (LRU) e expiração por item (TTL).
+
+    Seguro para uso entre threads; cada processo tem o seu, então serve como primeira camada antes de um cache
+    compartilhado como o Redis.
+    """
+
+    def __init__(self, tamanho_maximo: int = 1024, ttl: float = 300) -> None:
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self._itens: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Optional[V]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return padrao
+
+            expira_em, valor = item
+            if expira_em < time.monotonic():
+                del self._itens[chave]
+                return padrao
+
+            self._itens.move_to_end(chave)
+            return valor
+
+    def salvar(self, chave: Hashable, valor: V, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + (self.ttl if ttl is None else ttl), valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+
+    def remover(self, chave: Hashable) -> None:
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return self.obter(chave) is not None
+
+    def __len__(self) -> int:
+        return len(self._itens)
@@ -19,4 +19,11 @@ class Uploader:
         with open(caminho_completo, "wb") as f:
             f.write(arquivo)
 
+        return self.url(object_key)
+
+    def caminho(self, object_key: str) -> str:
+        """Caminho de destino no bucket, para quem precisa gravar o arquivo diretamente sem montá-lo em memória."""
+        return os.path.join(BUCKET, object_key)
+
+    def url(self, object_key: str) -> str:
         return f"{STATIC_URL}/{object_key}"
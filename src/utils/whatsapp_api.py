@@ -1,41 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional, List, Dict
-from datetime import datetime
+from typing import Optional, Dict, Iterator
 
+from src.infra.log import setup_logging
 from src.utils.formatos import formatar_telefone
 from src.utils.validadores import limpar_texto
 
-
-@dataclass
-class Contato:
-    wa_id: str
-    profile: Optional[Dict[str, str]] = None
-
-
-@dataclass
-class Mensagem:
-    from_: str
-    id: str
-    timestamp: datetime
-    type: str
-    text: Optional[Dict[str, str]] = None
-    image: Optional[Dict[str, str]] = None
-    video: Optional[Dict[str, str]] = None
-    audio: Optional[Dict[str, str]] = None
-    document: Optional[Dict[str, str]] = None
-    location: Optional[Dict[str, Dict[str, float]]] = None
-    interactive: Optional[Dict] = None
-    context: Optional[Dict] = None
-
-
-@dataclass
-class Status:
-    id: str
-    recipient_id: str
-    status: str
-    timestamp: datetime
-    conversation: Optional[Dict] = None
-    pricing: Optional[Dict] = None
+logger = setup_logging()
 
 
 @dataclass
@@ -47,23 +17,72 @@ class WhatsAppPayload:
     wamid: str
     audio: Optional[str] = None
     imagem: Optional[str] = None
-    contacts: Optional[List[Contato]] = None
-    messages: Optional[List[Mensagem]] = None
-    statuses: Optional[List[Status]] = None
 
-    def __post_init__(self):
-        if self.messages:
-            for msg in self.messages:
-                if isinstance(msg.timestamp, str):
-                    msg.timestamp = datetime.fromtimestamp(int(msg.timestamp))
 
-        if self.statuses:
-            for status in self.statuses:
-                if isinstance(status.timestamp, str):
-                    status.timestamp = datetime.fromtimestamp(int(status.timestamp))
+def _montar_mensagem(objeto: str, contatos: Dict[str, str], message_data: Dict) -> WhatsAppPayload:
+    wa_id = message_data.get("from") or next(iter(contatos), "")
+    mensagem = ""
+    audio = None
+    imagem = None
+
+    message_type = str(message_data["type"]).lower()
+
+    if message_type == "text":
+        mensagem = str(message_data["text"]["body"]).lower()
+    if message_type == "audio":
+        audio = str(message_data["audio"]["id"])
+    elif message_type == "interactive":
+        if message_data["interactive"]["type"] == "button_reply":
+            mensagem = message_data["interactive"]["button_reply"]["id"]
 
+    elif message_type == "image":
+        imagem = message_data["image"]["id"]
 
-def parse_whatsapp_payload(payload: Dict) -> WhatsAppPayload:
+    return WhatsAppPayload(
+        object=objeto,
+        nome=contatos.get(wa_id, ""),
+        mensagem=limpar_texto(mensagem),
+        telefone=formatar_telefone(wa_id),
+        wamid=message_data["id"],
+        audio=audio,
+        imagem=imagem,
+    )
+
+
+def iterar_mensagens_whatsapp(payload: Dict) -> Iterator[WhatsAppPayload]:
+    """
+    Percorre todas as mensagens de um webhook do WhatsApp Business API, de todas as entries e changes.
+
+    A Meta agrupa várias entregas num mesmo webhook quando o tráfego aperta. Callbacks só de status (entregue,
+    lido...) não têm `messages` e são pulados sem montar nada. Uma mensagem malformada é descartada sem
+    interromper as demais.
+
+    Args:
+        payload (Dict): Payload cru do webhook vindo do WhatsApp Business API
+
+    Yields:
+        WhatsAppPayload: Uma mensagem por vez, na ordem em que aparecem no payload.
+    """
+    objeto = payload.get("object", "")
+    for entry in payload.get("entry") or []:
+        for change in entry.get("changes") or []:
+            value = change.get("value") or {}
+            mensagens = value.get("messages")
+            if not mensagens:
+                continue
+
+            contatos = {
+                contato.get("wa_id"): (contato.get("profile") or {}).get("name", "")
+                for contato in value.get("contacts") or []
+            }
+            for message_data in mensagens:
+                try:
+                    yield _montar_mensagem(objeto, contatos, message_data)
+                except (KeyError, TypeError):
+                    logger.warning(f"Mensagem do WhatsApp ignorada: {message_data.get('id')}")
+
+
+def parse_whatsapp_payload(payload: Dict) -> Optional[WhatsAppPayload]:
     """
     Formata payload do WhatsApp Business API e transforma em um dataclass estruturado.
     Lida tanto com mensagens de texto, como respostas de botões interativos.
@@ -72,44 +91,6 @@ def parse_whatsapp_payload(payload: Dict) -> WhatsAppPayload:
         payload (Dict): Payload cru do webhook vindo do WhatsApp Business API
 
     Returns:
-        WhatsAppPayload: Representação estruturada como classe do payload.
+        Optional[WhatsAppPayload]: A primeira mensagem do payload, ou None se ele não tiver mensagens.
     """
-    try:
-        contacts = [Contato(**contact) for contact in payload.get("contacts", [])]
-        messages = [Mensagem(**message) for message in payload.get("messages", [])]
-        statuses = [Status(**status) for status in payload.get("statuses", [])]
-        base = payload["entry"][0]["changes"][0]["value"]
-        nome_usuario = base["contacts"][0]["profile"]["name"]
-        telefone = base["contacts"][0]["wa_id"]
-        telefone = formatar_telefone(telefone)
-        mensagem = ""
-        audio = None
-        imagem = None
-
-        message_data = base["messages"][0]
-        message_type = str(message_data["type"]).lower()
-
-        if message_type == "text":
-            mensagem = str(message_data["text"]["body"]).lower()
-        if message_type == "audio":
-            audio = str(message_data["audio"]["id"])
-        elif message_type == "interactive":
-            if message_data["interactive"]["type"] == "button_reply":
-                mensagem = message_data["interactive"]["button_reply"]["id"]
-
-        elif message_type == "image":
-            imagem = message_data["image"]["id"]
-
-        wamid = message_data["id"]
-
-        return WhatsAppPayload(
-            object=payload["object"],
-            nome=nome_usuario,
-            mensagem=limpar_texto(mensagem),
-            telefone=telefone,
-            wamid=wamid,
-            audio=audio,
-            imagem=imagem,
-        )
-    except KeyError:
-        pass
+    return next(iterar_mensagens_whatsapp(payload), None)
@@ -0,0 +1,97 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.dominio.assinatura.cache import CacheStatusAssinatura, JanelaAviso
+from src.dominio.assinatura.entidade import Assinatura, StatusAssinatura
+from src.dominio.assinatura.services import avisar_assinatura_cancelada
+from src.dominio.usuario.repo import RepoUsuarioLeitura
+
+
+@pytest.fixture
+def assinatura(session, mock_usuario):
+    assinatura = Assinatura(
+        usuario_id=mock_usuario.id,
+        stripe_id="sub_teste",
+        plano="Caderneta Básico",
+        valor_mensal=14.99,
+        data_inicio=datetime(2024, 10, 1),
+    )
+    session.add(assinatura)
+    session.commit()
+    return assinatura
+
+
+def test_status_vem_da_busca_do_usuario_e_fica_em_cache(redis_em_memoria, session, assinatura, mock_usuario):
+    usuario = RepoUsuarioLeitura(session=session).buscar_por_telefone(mock_usuario.telefone)
+    cache = CacheStatusAssinatura()
+
+    with patch("src.dominio.assinatura.cache.RepoAssinaturaLeitura") as repo:
+        assert cache.obter(usuario).status == StatusAssinatura.TESTE
+        assert cache.obter(usuario).stripe_id == "sub_teste"
+        repo.assert_not_called()
+
+
+def test_invalidar_reflete_mudanca_do_stripe(redis_em_memoria, session, assinatura, mock_usuario):
+    usuario = RepoUsuarioLeitura(session=session).buscar_por_telefone(mock_usuario.telefone)
+    cache = CacheStatusAssinatura()
+    assert cache.obter(usuario).status == StatusAssinatura.TESTE
+
+    assinatura.cancelar()
+    session.commit()
+    assert cache.obter(usuario).status == StatusAssinatura.TESTE
+
+    cache.invalidar(usuario.id)
+    assert cache.obter(usuario).status == StatusAssinatura.CANCELADA
+
+
+def test_janela_aviso_libera_uma_vez_por_usuario(redis_em_memoria, mock_usuario):
+    janela = JanelaAviso("teste", janela=60)
+
+    assert janela.liberar(mock_usuario.id) is True
+    assert janela.liberar(mock_usuario.id) is False
+    # outro processo, mesmo Redis
+    assert JanelaAviso("teste", janela=60).liberar(mock_usuario.id) is False
+
+
+@pytest.mark.asyncio
+async def test_aviso_de_cancelamento_enviado_uma_vez(redis_em_memoria, session, assinatura, mock_usuario):
+    assinatura.cancelar()
+    session.commit()
+    usuario = RepoUsuarioLeitura(session=session).buscar_por_telefone(mock_usuario.telefone)
+    bot = MagicMock(responder_async=AsyncMock())
+
+    with (
+        patch("src.dominio.assinatura.services.cache_status_assinatura", CacheStatusAssinatura()),
+        patch("src.dominio.assinatura.services.aviso_assinatura_cancelada", JanelaAviso("teste", janela=60)),
+        patch(
+            "src.dominio.assinatura.services.criar_customer_portal_link", return_value=MagicMock(url="https://portal")
+        ) as portal,
+    ):
+        await avisar_assinatura_cancelada(bot, usuario)
+        await avisar_assinatura_cancelada(bot, usuario)
+
+    portal.assert_called_once_with(subscription_id="sub_teste")
+    bot.responder_async.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_falha_no_envio_devolve_a_janela(redis_em_memoria, session, assinatura, mock_usuario):
+    assinatura.cancelar()
+    session.commit()
+    usuario = RepoUsuarioLeitura(session=session).buscar_por_telefone(mock_usuario.telefone)
+    bot = MagicMock(responder_async=AsyncMock(side_effect=[ConnectionError("whatsapp fora"), None]))
+
+    with (
+        patch("src.dominio.assinatura.services.cache_status_assinatura", CacheStatusAssinatura()),
+        patch("src.dominio.assinatura.services.aviso_assinatura_cancelada", JanelaAviso("teste", janela=60)),
+        patch(
+            "src.dominio.assinatura.services.criar_customer_portal_link", return_value=MagicMock(url="https://portal")
+        ),
+    ):
+        with pytest.raises(ConnectionError):
+            await avisar_assinatura_cancelada(bot, usuario)
+        await avisar_assinatura_cancelada(bot, usuario)
+
+    assert bot.responder_async.await_count == 2
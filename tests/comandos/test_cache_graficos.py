@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+from redis.exceptions import ConnectionError
+
+from src.dominio.graficos.cache import CacheGraficos
+from src.libs.tipos import Intervalo
+
+
+def test_cache_graficos_invalida_ao_mudar_lancamentos(redis_em_memoria):
+    cache = CacheGraficos()
+    usuario_id = uuid.uuid4()
+    intervalo = Intervalo(datetime(2024, 10, 1), datetime(2024, 10, 31))
+
+    chave = cache.chave(usuario_id, "lucro", intervalo)
+    assert cache.obter(chave) is None
+
+    cache.salvar(chave, "https://caderneta.chat/static/lucro.png")
+    assert cache.obter(cache.chave(usuario_id, "lucro", intervalo)) == "https://caderneta.chat/static/lucro.png"
+    assert cache.obter(cache.chave(usuario_id, "fluxo", intervalo)) is None
+
+    cache.invalidar(usuario_id)
+    assert cache.obter(cache.chave(usuario_id, "lucro", intervalo)) is None
+
+
+def test_cache_graficos_ignora_redis_indisponivel():
+    cache = CacheGraficos()
+    intervalo = Intervalo(datetime(2024, 10, 1), datetime(2024, 10, 31))
+
+    with patch("src.dominio.graficos.cache.obter_redis", side_effect=ConnectionError("fora do ar")):
+        chave = cache.chave(uuid.uuid4(), "lucro", intervalo)
+
+    assert chave is None
+    assert cache.obter(chave) is None
@@ -0,0 +1,80 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from const import REGEX_WAMID
+from src.dominio.bot.entidade import GerenciadorComandos
+from src.dominio.bot.exceptions import ComandoDesconhecido
+
+
+@pytest.fixture
+def gerenciador():
+    gerenciador = GerenciadorComandos()
+
+    @gerenciador.comando("fluxo", "Lista fluxo")
+    def fluxo(*args, **kwargs):
+        return f"fluxo {list(args)}"
+
+    @gerenciador.comando("grafico fluxo", "Gráfico de fluxo", aliases=["gf"])
+    def grafico_fluxo(*args, **kwargs):
+        return f"grafico {list(args)}"
+
+    @gerenciador.comando(REGEX_WAMID, "Remove transação", oculto=True, padrao=True)
+    def remover(*args, **kwargs):
+        return f"remover {args[0]}"
+
+    return gerenciador
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mensagem, esperado",
+    [
+        ("fluxo", "fluxo []"),
+        ("Grafico Fluxo extra", "grafico ['extra']"),
+        ("gf", "grafico []"),
+        ("grafico fluxo", "grafico []"),
+        ("wamid.HBgMNTU5NDk4MTM2MjYwFQIAEhgg==", "remover wamid.hbgmntu5ndk4mtm2mjywfqiaehgg=="),
+    ],
+)
+async def test_despacho_pelo_nome_mais_longo(gerenciador, mensagem, esperado):
+    assert await gerenciador.processar_comando(mensagem) == esperado
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mensagem", ["grafico", "paguei 50 luz", "wamid.abc outra coisa"])
+async def test_comando_desconhecido(gerenciador, mensagem):
+    with pytest.raises(ComandoDesconhecido):
+        await gerenciador.processar_comando(mensagem)
+
+
+def test_ajuda_fica_em_cache_ate_novo_registro(gerenciador):
+    ajuda = gerenciador.ajuda()
+
+    assert gerenciador.ajuda() is ajuda
+    assert "Remove transação" not in ajuda
+
+    @gerenciador.comando("lucro", "Gráfico de lucro")
+    def lucro(*args, **kwargs):
+        return "lucro"
+
+    assert "*lucro*: Gráfico de lucro" in gerenciador.ajuda()
+
+
+@pytest.mark.asyncio
+async def test_leitura_sem_extra_async_roda_fora_do_event_loop(gerenciador):
+    threads = []
+
+    def consulta(repo):
+        threads.append(threading.current_thread())
+        return repo
+
+    with (
+        patch("src.dominio.bot.entidade.banco_async_disponivel", return_value=False),
+        patch("src.dominio.bot.entidade.get_session_leitura") as sessao,
+    ):
+        repo = await gerenciador.ler_transacoes(consulta)
+
+    assert repo.session is sessao.return_value
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,43 @@
+import csv
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from src.dominio.transacao.exportador import COLUNAS, exportar_csv, exportar_xlsx, para_registros
+from src.dominio.transacao.tipos import TipoTransacao
+
+LINHAS = [
+    (100.0, TipoTransacao.CREDITO, "VENDAS", "vestido", datetime(2024, 10, 1, 10)),
+    (35.5, TipoTransacao.DEBITO, "OUTROS", None, datetime(2024, 10, 2, 18, 30)),
+]
+
+
+def test_para_registros_segue_formato_do_dicionario():
+    assert list(para_registros(LINHAS)) == [
+        (100.0, "VENDAS", "vestido", "01/10/2024 10:00:00"),
+        (-35.5, "OUTROS", None, "02/10/2024 18:30:00"),
+    ]
+
+
+def test_exportar_xlsx(tmp_path):
+    caminho = tmp_path / "lancamentos.xlsx"
+
+    exportar_xlsx(para_registros(iter(LINHAS)), str(caminho))
+
+    linhas = list(load_workbook(caminho).active.iter_rows(values_only=True))
+    assert linhas == [
+        tuple(COLUNAS),
+        (100, "VENDAS", "vestido", "01/10/2024 10:00:00"),
+        (-35.5, "OUTROS", None, "02/10/2024 18:30:00"),
+    ]
+
+
+def test_exportar_csv(tmp_path):
+    caminho = tmp_path / "lancamentos.csv"
+
+    exportar_csv(para_registros(iter(LINHAS)), str(caminho))
+
+    with open(caminho, encoding="utf-8") as arquivo:
+        linhas = list(csv.reader(arquivo))
+    assert linhas[0] == COLUNAS
+    assert linhas[2] == ["-35.5", "OUTROS", "", "02/10/2024 18:30:00"]
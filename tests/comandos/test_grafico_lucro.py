@@ -0,0 +1,37 @@
+from io import BytesIO
+
+from PIL import Image
+
+from src.dominio.graficos.entidade import GraficoConfig, GraficoLucro, TemplateLucro
+from src.dominio.graficos.services import criar_grafico_lucro
+from src.dominio.transacao.entidade import ResumoPeriodo
+
+
+def test_grafico_lucro_reaproveita_template():
+    resumo = ResumoPeriodo(receitas=300.0, despesas=100.0, quantidade=4)
+
+    primeiro = GraficoLucro(GraficoConfig(titulo="Lucro"), resumo).criar()
+    segundo = GraficoLucro(GraficoConfig(titulo="Lucro"), resumo).criar()
+
+    assert TemplateLucro.obter() is TemplateLucro.obter()
+    assert primeiro["dados"] == segundo["dados"]
+    assert Image.open(BytesIO(primeiro["dados"])).size == (TemplateLucro.LARGURA, TemplateLucro.ALTURA)
+
+
+def test_grafico_lucro_jpeg():
+    resumo = ResumoPeriodo(receitas=0.0, despesas=100.0, quantidade=1)
+
+    grafico = GraficoLucro(GraficoConfig(titulo="Lucro", formato="jpeg"), resumo).criar()
+
+    assert grafico["formato"] == "jpeg"
+    assert Image.open(BytesIO(grafico["dados"])).format == "JPEG"
+
+
+def test_formato_nao_aceito_pelo_whatsapp_volta_para_png(monkeypatch):
+    monkeypatch.setenv("GRAFICO_LUCRO_FORMATO", "webp")
+    resumo = ResumoPeriodo(receitas=300.0, despesas=100.0, quantidade=4)
+
+    grafico = criar_grafico_lucro(resumo)
+
+    assert grafico["formato"] == "png"
+    assert Image.open(BytesIO(grafico["dados"])).format == "PNG"
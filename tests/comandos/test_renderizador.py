@@ -0,0 +1,75 @@
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock
+
+import pytest
+from plotly import graph_objects as go
+
+from src.dominio.graficos.renderizador import RenderizadorGraficos
+
+ASSINATURA_PNG = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def renderizador():
+    renderizador = RenderizadorGraficos(processos=1)
+    yield renderizador
+    renderizador.encerrar()
+
+
+def test_renderizar(renderizador):
+    figura = go.Figure(data=[go.Bar(x=["a", "b"], y=[1, 2])]).to_json()
+
+    assert renderizador.renderizar(figura).startswith(ASSINATURA_PNG)
+
+
+def test_pool_quebrado_eh_reiniciado(renderizador):
+    figura = go.Figure(data=[go.Scatter(x=[1, 2, 3], y=[3, 1, 2])]).to_json()
+    quebrado = MagicMock()
+    quebrado.submit.side_effect = BrokenProcessPool()
+    renderizador._pool = quebrado
+
+    assert renderizador.renderizar(figura).startswith(ASSINATURA_PNG)
+    quebrado.shutdown.assert_called_once()
+
+
+def test_renderizar_lote(renderizador):
+    figuras = [go.Figure(data=[go.Bar(x=["a", "b"], y=[1, valor])]).to_json() for valor in range(3)]
+
+    imagens = renderizador.renderizar_lote(figuras)
+
+    assert len(imagens) == 3
+    assert all(imagem.startswith(ASSINATURA_PNG) for imagem in imagens)
+
+
+@pytest.mark.asyncio
+async def test_renderizar_async(renderizador):
+    figura = go.Figure(data=[go.Scatter(x=[1, 2, 3], y=[3, 1, 2])]).to_json()
+
+    imagem = await renderizador.renderizar_async(figura)
+
+    assert imagem.startswith(ASSINATURA_PNG)
+
+
+@pytest.mark.asyncio
+async def test_lote_async_reenvia_para_pool_novo_quando_quebra(renderizador):
+    figuras = [go.Figure(data=[go.Bar(x=["a", "b"], y=[1, valor])]).to_json() for valor in range(2)]
+    quebrado = MagicMock()
+    quebrado.submit.side_effect = BrokenProcessPool()
+    renderizador._pool = quebrado
+
+    imagens = await renderizador.renderizar_lote_async(figuras)
+
+    assert len(imagens) == 2
+    assert all(imagem.startswith(ASSINATURA_PNG) for imagem in imagens)
+    quebrado.shutdown.assert_called_once()
+    assert renderizador._pool is not quebrado
+
+
+def test_reinicio_nao_descarta_pool_ja_trocado(renderizador):
+    atual = MagicMock()
+    renderizador._pool = atual
+
+    renderizador._reiniciar_pool(MagicMock())
+
+    assert renderizador._pool is atual
+    atual.shutdown.assert_not_called()
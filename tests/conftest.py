@@ -7,6 +7,7 @@ from datetime import datetime
 import pytest
 
 from const import REGEX_WAMID
+from src.infra import cache
 from src.dominio.bot.entidade import CLIBot
 from src.dominio.transacao.entidade import Transacao
 from src.dominio.usuario.entidade import Usuario
@@ -97,6 +98,73 @@ def clean_tables(session):
     session.commit()
 
 
+class RedisEmMemoria:
+    """Redis falso com os comandos usados pelos caches; guarda bytes, como o redis-py, e conta os comandos."""
+
+    def __init__(self):
+        self.dados = {}
+        self.chamadas = 0
+
+    def get(self, chave):
+        self.chamadas += 1
+        return self.dados.get(chave)
+
+    def mget(self, chaves):
+        self.chamadas += 1
+        return [self.dados.get(chave) for chave in chaves]
+
+    def set(self, chave, valor, ex=None, nx=False):
+        self.chamadas += 1
+        if nx and chave in self.dados:
+            return None
+        self.dados[chave] = valor if isinstance(valor, bytes) else str(valor).encode()
+        return True
+
+    def incr(self, chave):
+        self.chamadas += 1
+        valor = int(self.dados.get(chave, 0)) + 1
+        self.dados[chave] = str(valor).encode()
+        return valor
+
+    def delete(self, *chaves):
+        self.chamadas += 1
+        return sum(self.dados.pop(chave, None) is not None for chave in chaves)
+
+    def exists(self, *chaves):
+        self.chamadas += 1
+        return sum(chave in self.dados for chave in chaves)
+
+    def pipeline(self, transaction=True):
+        return PipelineEmMemoria(self)
+
+
+class PipelineEmMemoria:
+    def __init__(self, redis):
+        self.redis = redis
+        self.comandos = []
+
+    def __getattr__(self, nome):
+        comando = getattr(self.redis, nome)
+
+        def enfileirar(*args, **kwargs):
+            self.comandos.append((comando, args, kwargs))
+            return self
+
+        return enfileirar
+
+    def execute(self):
+        comandos, self.comandos = self.comandos, []
+        return [comando(*args, **kwargs) for comando, args, kwargs in comandos]
+
+
+@pytest.fixture(scope="function")
+def redis_em_memoria(monkeypatch):
+    """Substitui o cliente devolvido por obter_redis() em todos os módulos."""
+    redis = RedisEmMemoria()
+    monkeypatch.setattr(cache, "_cliente", redis)
+    return redis
+
+
 @pytest.fixture(scope="session")
 def cli_bot():
     return CLIBot()
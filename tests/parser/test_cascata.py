@@ -0,0 +1,67 @@
+import pytest
+
+from src.dominio.processamento.cascata import CascataClassificacao
+from src.dominio.processamento.exceptions import NaoEhTransacao
+
+
+class ClassificadorFalso:
+    def __init__(self):
+        self.mensagens = []
+
+    async def classificar(self, mensagem):
+        self.mensagens.append(mensagem)
+        if "bom dia" in mensagem:
+            raise NaoEhTransacao()
+        return "debito", {"debito": 0.9, "credito": 0.1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mensagem, tipo, nivel",
+    [
+        ("paguei 250 receita federal", "debito", "palavra_chave"),
+        ("Vendi, 150 calça", "credito", "palavra_chave"),
+        ("pagamos 80 de luz", "debito", "prefixo"),
+        ("recebemos 1.000,50 do cliente", "credito", "prefixo"),
+        ("gastamos 45 mercado", "debito", "prefixo"),
+        ("vendemos 3 bolos", "credito", "prefixo"),
+    ],
+)
+async def test_palavras_obvias_nao_chegam_ao_modelo(mensagem, tipo, nivel):
+    modelo = ClassificadorFalso()
+    cascata = CascataClassificacao(classificador=modelo)
+
+    assert (await cascata.classificar(mensagem))[0] == tipo
+    assert modelo.mensagens == []
+    assert cascata.estatisticas()[nivel]["acertos"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mensagem", ["vendedor 200", "pagamento recebido 500", "gastronomia 120"])
+async def test_radical_sem_conjugacao_ou_sentidos_opostos_vao_para_o_modelo(mensagem):
+    modelo = ClassificadorFalso()
+    cascata = CascataClassificacao(classificador=modelo)
+
+    await cascata.classificar(mensagem)
+
+    assert modelo.mensagens == [mensagem]
+    assert cascata.estatisticas()["modelo"]["acertos"] == 1
+
+
+@pytest.mark.asyncio
+async def test_texto_ambiguo_vai_para_o_modelo_e_conta_por_nivel():
+    modelo = ClassificadorFalso()
+    cascata = CascataClassificacao(classificador=modelo)
+
+    await cascata.classificar("paguei 10 pão")
+    await cascata.classificar("p 10 pão")
+    await cascata.classificar("insumos 300 ifood")
+    with pytest.raises(NaoEhTransacao):
+        await cascata.classificar("bom dia 123")
+
+    assert modelo.mensagens == ["p 10 pão", "insumos 300 ifood", "bom dia 123"]
+    estatisticas = cascata.estatisticas()
+    assert estatisticas["total"] == 4
+    assert estatisticas["palavra_chave"] == {"acertos": 1, "taxa": 0.25}
+    assert estatisticas["modelo"] == {"acertos": 2, "taxa": 0.5}
+    assert estatisticas["descartada"] == {"acertos": 1, "taxa": 0.25}
@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.dominio.processamento.categorizador import ClienteCategorizador, normalizar_destino
+from src.infra.disjuntor import Disjuntor
+from src.utils.cache import CacheLRU
+
+URL = "http://categorizer.local/categorizar"
+
+
+def criar_cliente(handler, **kwargs) -> ClienteCategorizador:
+    cliente = ClienteCategorizador(url=URL, **kwargs)
+    cliente._cliente = httpx.Client(transport=httpx.MockTransport(handler))
+    return cliente
+
+
+def test_normalizar_destino():
+    assert normalizar_destino("Padaria  São João") == "padaria sao joao"
+    assert normalizar_destino("OUTROS") is None
+    assert normalizar_destino(None) is None
+
+
+def test_destino_repetido_nao_vai_a_rede():
+    chamadas = []
+
+    def handler(request):
+        chamadas.append(request)
+        return httpx.Response(200, json={"category": "alimentação"})
+
+    cliente = criar_cliente(handler)
+
+    assert cliente.categorizar("150 padaria são joão pix", "PADARIA SÃO JOÃO") == "ALIMENTAÇÃO"
+    assert cliente.categorizar("32,50 padaria sao joao", "PADARIA SAO JOAO") == "ALIMENTAÇÃO"
+    assert len(chamadas) == 1
+
+
+def test_disjuntor_abre_apos_falhas_e_usa_outros():
+    chamadas = []
+
+    def handler(request):
+        chamadas.append(request)
+        return httpx.Response(503)
+
+    cliente = criar_cliente(handler, disjuntor=Disjuntor("teste", falhas_maximas=2, pausa=60))
+
+    assert [cliente.categorizar(f"10 loja {i}", f"LOJA {i}") for i in range(4)] == ["OUTROS"] * 4
+    assert len(chamadas) == 2
+    assert cliente.disjuntor.estado == Disjuntor.ABERTO
+
+
+def test_disjuntor_libera_uma_chamada_de_teste_apos_a_pausa():
+    disjuntor = Disjuntor("teste", falhas_maximas=1, pausa=0)
+    disjuntor.registrar_falha()
+
+    assert disjuntor.permitir() is True
+    assert disjuntor.permitir() is False
+    disjuntor.registrar_sucesso()
+    assert disjuntor.estado == Disjuntor.FECHADO
+
+
+@pytest.mark.asyncio
+async def test_prazo_estourado_devolve_outros():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={"category": "lento"})
+
+    cliente = ClienteCategorizador(url=URL, timeout=0.05)
+    cliente._cliente_async = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cliente._loop_cliente = asyncio.get_running_loop()
+
+    assert await cliente.categorizar_async("10 mercado", "MERCADO") == "OUTROS"
+    assert "mercado" not in cliente.cache
+
+
+def test_sem_categorizer_configurado(monkeypatch):
+    monkeypatch.delenv("CATEGORIZER", raising=False)
+
+    assert ClienteCategorizador().categorizar("10 mercado", "MERCADO") == "OUTROS"
+
+
+def test_cache_lru_descarta_o_menos_usado_e_expira():
+    cache = CacheLRU(tamanho_maximo=2, ttl=60)
+    cache.salvar("a", 1)
+    cache.salvar("b", 2)
+    cache.obter("a")
+    cache.salvar("c", 3)
+
+    assert cache.obter("b") is None
+    assert cache.obter("a") == 1
+
+    cache.salvar("d", 4, ttl=-1)
+    assert cache.obter("d") is None
+
+
+@pytest.mark.asyncio
+async def test_chamada_de_teste_cancelada_nao_prende_o_disjuntor():
+    iniciada = asyncio.Event()
+
+    async def handler(request):
+        iniciada.set()
+        await asyncio.sleep(10)
+        return httpx.Response(200, json={"category": "lento"})
+
+    disjuntor = Disjuntor("teste", falhas_maximas=1, pausa=0)
+    disjuntor.registrar_falha()
+    cliente = ClienteCategorizador(url=URL, timeout=30, disjuntor=disjuntor)
+    cliente._cliente_async = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cliente._loop_cliente = asyncio.get_running_loop()
+
+    tarefa = asyncio.create_task(cliente.categorizar_async("10 mercado", "MERCADO"))
+    await iniciada.wait()
+    tarefa.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await tarefa
+
+    # a chamada cancelada conta como falha e, passada a pausa, outra chamada de teste é liberada
+    assert disjuntor.permitir() is True
+
+
+def test_erro_inesperado_na_chamada_de_teste_nao_prende_o_disjuntor():
+    def handler(request):
+        raise RuntimeError("bug no transporte")
+
+    disjuntor = Disjuntor("teste", falhas_maximas=1, pausa=0)
+    disjuntor.registrar_falha()
+    cliente = criar_cliente(handler, disjuntor=disjuntor)
+
+    with pytest.raises(RuntimeError):
+        cliente.categorizar("10 mercado", "MERCADO")
+    assert disjuntor.permitir() is True
@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+import pytest
+
+from src.dominio.processamento.entidade import ClassificadorTexto
+from src.dominio.processamento.exceptions import NaoEhTransacao
+from src.dominio.processamento.lote import ClassificadorEmLote
+from tests.parser.dados_teste import DADOS_TESTE_PARSER
+
+PASTA_TESTE = os.path.dirname(__file__)
+
+
+@pytest.fixture(autouse=True)
+def artefatos(monkeypatch):
+    monkeypatch.setenv("VECTORIZER_PATH", os.path.join(PASTA_TESTE, "vectorizer.joblib"))
+    monkeypatch.setenv("CLASSIFIER_PATH", os.path.join(PASTA_TESTE, "classifier.joblib"))
+
+
+@pytest.fixture
+def chamadas_predict_proba(monkeypatch):
+    chamadas = []
+    original = ClassificadorTexto.probabilidades
+
+    def contar(self, mensagens):
+        chamadas.append(len(mensagens))
+        return original(self, mensagens)
+
+    monkeypatch.setattr(ClassificadorTexto, "probabilidades", contar)
+    return chamadas
+
+
+@pytest.mark.asyncio
+async def test_mensagens_simultaneas_usam_um_unico_predict_proba(chamadas_predict_proba):
+    classificador = ClassificadorEmLote(janela_ms=50, tamanho_maximo=100)
+    mensagens = [mensagem for mensagem, _ in DADOS_TESTE_PARSER]
+
+    resultados = await asyncio.gather(*(classificador.classificar(mensagem) for mensagem in mensagens))
+
+    assert chamadas_predict_proba == [len(mensagens)]
+    for (mensagem, esperado), resultado in zip(DADOS_TESTE_PARSER, resultados):
+        assert resultado[0] == esperado.tipo.value
+        assert resultado == ClassificadorTexto().classificar_mensagem(mensagem)
+
+
+@pytest.mark.asyncio
+async def test_lote_cheio_e_despachado_sem_esperar_a_janela(chamadas_predict_proba):
+    classificador = ClassificadorEmLote(janela_ms=10_000, tamanho_maximo=2)
+    mensagens = [mensagem for mensagem, _ in DADOS_TESTE_PARSER[:4]]
+
+    await asyncio.wait_for(asyncio.gather(*(classificador.classificar(m) for m in mensagens)), timeout=5)
+
+    assert chamadas_predict_proba == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_erro_de_uma_mensagem_nao_afeta_o_lote(monkeypatch):
+    original = ClassificadorTexto.interpretar
+
+    def interpretar(self, mensagem, probabilidades):
+        if mensagem == "bom dia 123":
+            raise NaoEhTransacao()
+        return original(self, mensagem, probabilidades)
+
+    monkeypatch.setattr(ClassificadorTexto, "interpretar", interpretar)
+    classificador = ClassificadorEmLote(janela_ms=20)
+
+    resultados = await asyncio.gather(
+        classificador.classificar("bom dia 123"),
+        classificador.classificar(DADOS_TESTE_PARSER[0][0]),
+        return_exceptions=True,
+    )
+
+    assert isinstance(resultados[0], NaoEhTransacao)
+    assert resultados[1][0] == DADOS_TESTE_PARSER[0][1].tipo.value
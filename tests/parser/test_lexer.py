@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from src.dominio.processamento.entidade import ConstrutorTransacao
+from src.dominio.processamento.lexer import lexer_transacao, normalizar_valor
+from src.dominio.transacao.tipos import TipoTransacao
+from tests.parser.dados_teste import DADOS_TESTE_PARSER
+
+
+@pytest.mark.parametrize(
+    "valor, esperado",
+    [("150", 150), ("520,75", 520.75), ("10.500,15", 10500.15), ("10,500", 10500), ("1,000,000.00", 1000000)],
+)
+def test_normalizar_valor(valor, esperado):
+    assert normalizar_valor(valor) == esperado
+
+
+def test_data_com_ano_nao_vaza_para_o_destino():
+    tokens = lexer_transacao.analisar("vendi 118,74 pix 23/12/2023")
+
+    assert tokens.valor == 118.74
+    assert tokens.data == datetime(2023, 12, 23)
+    assert tokens.metodo_pagamento == "pix"
+    assert tokens.destino == "OUTROS"
+
+
+def test_pontuacao_colada_ao_valor_e_ao_metodo():
+    tokens = lexer_transacao.analisar("paguei 150, conta de luz pix.")
+
+    assert tokens.valor == 150
+    assert tokens.metodo_pagamento == "pix"
+    assert tokens.destino == "CONTA DE LUZ"
+
+
+def test_texto_para_categorizador_sem_verbo_inicial():
+    assert lexer_transacao.analisar("paguei 250 receita federal").texto == "250 receita federal"
+
+
+def test_mensagem_sem_valor():
+    with pytest.raises(ValueError):
+        lexer_transacao.analisar("paguei receita federal")
+
+
+def test_construtor_compartilhado_entre_threads():
+    parser = ConstrutorTransacao(acao=TipoTransacao.DEBITO)
+    mensagens = [mensagem for mensagem, _ in DADOS_TESTE_PARSER] * 50
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        resultados = list(executor.map(parser.parse_message, mensagens))
+
+    esperados = {mensagem: esperado for mensagem, esperado in DADOS_TESTE_PARSER}
+    for resultado in resultados:
+        esperado = esperados[resultado.mensagem_original]
+        assert resultado.valor == esperado.valor
+        assert resultado.destino == esperado.destino
+        assert resultado.metodo_pagamento == esperado.metodo_pagamento
@@ -0,0 +1,57 @@
+import pytest
+
+from src.dominio.processamento.categorias import ModeloCategorias, modelo_categorias, obter_categorizador
+from src.dominio.processamento.categorizador import cliente_categorizador
+from src.dominio.processamento.entidade import ConstrutorTransacao
+from src.dominio.transacao.tipos import TipoTransacao
+
+EXEMPLOS = [
+    ("PADARIA SÃO JOÃO", "alimentação", 12),
+    ("MERCADO BOM PREÇO", "alimentação", 8),
+    ("POSTO SHELL", "combustível", 10),
+    ("POSTO IPIRANGA", "combustível", 6),
+    ("EQUATORIAL ENERGIA", "contas", 4),
+    ("CONTA DE LUZ", "contas", 3),
+]
+
+
+@pytest.fixture
+def caminho_modelo(tmp_path, monkeypatch):
+    caminho = tmp_path / "categorias.joblib"
+    monkeypatch.setenv("CATEGORIAS_MODEL_PATH", str(caminho))
+    return caminho
+
+
+def test_treina_e_preve_pelo_destino(caminho_modelo):
+    modelo = ModeloCategorias(confianca_minima=0.4)
+
+    assert modelo.treinar(EXEMPLOS) is not None
+    assert caminho_modelo.exists()
+    assert modelo.prever("Posto Shell BR 316") == "COMBUSTÍVEL"
+    assert modelo.prever("padaria sao joao") == "ALIMENTAÇÃO"
+
+
+def test_sem_modelo_treinado_usa_outros(caminho_modelo):
+    assert ModeloCategorias().prever("POSTO SHELL") == "OUTROS"
+
+
+def test_historico_com_uma_categoria_nao_treina(caminho_modelo):
+    assert ModeloCategorias().treinar([("POSTO SHELL", "combustível", 3)]) is None
+    assert not caminho_modelo.exists()
+
+
+def test_chave_de_configuracao(monkeypatch, caminho_modelo):
+    monkeypatch.setenv("CATEGORIZACAO", "local")
+    assert obter_categorizador() is modelo_categorias
+
+    monkeypatch.setenv("CATEGORIZACAO", "remota")
+    assert obter_categorizador() is cliente_categorizador
+
+
+def test_parser_com_categorizacao_local(monkeypatch, caminho_modelo):
+    monkeypatch.setenv("CATEGORIZACAO", "local")
+    ModeloCategorias().treinar(EXEMPLOS)
+
+    transacao = ConstrutorTransacao(acao=TipoTransacao.DEBITO).parse_message("paguei 200 posto shell pix")
+
+    assert transacao.categoria == "COMBUSTÍVEL"
@@ -27,3 +27,12 @@ def test_parser_mensagens(mensagem, esperado):
     assert transacao.data.replace(minute=0, second=0, microsecond=0) == esperado.data.replace(
         minute=0, second=0, microsecond=0
     )
+
+
+def test_classificador_nao_le_csv_para_inferencia(monkeypatch, tmp_path):
+    monkeypatch.setenv("CSV_TREINAMENTO", str(tmp_path / "nao_existe.csv"))
+    classifier = ClassificadorTexto()
+
+    assert classifier._df is None
+    with pytest.raises(FileNotFoundError):
+        classifier.df
@@ -0,0 +1,38 @@
+import os
+import shutil
+
+import pytest
+
+from src.dominio.processamento.registro import RegistroModelo
+
+PASTA_TESTE = os.path.dirname(__file__)
+
+
+@pytest.fixture
+def artefatos(tmp_path, monkeypatch):
+    vectorizer = tmp_path / "vectorizer.joblib"
+    classifier = tmp_path / "classifier.joblib"
+    shutil.copy(os.path.join(PASTA_TESTE, "vectorizer.joblib"), vectorizer)
+    shutil.copy(os.path.join(PASTA_TESTE, "classifier.joblib"), classifier)
+    monkeypatch.setenv("VECTORIZER_PATH", str(vectorizer))
+    monkeypatch.setenv("CLASSIFIER_PATH", str(classifier))
+    return vectorizer, classifier
+
+
+def test_registro_carrega_modelo_uma_vez(artefatos):
+    registro = RegistroModelo()
+
+    assert registro.obter() is registro.obter()
+
+
+def test_registro_troca_modelo_quando_artefato_muda(artefatos):
+    vectorizer, _ = artefatos
+    registro = RegistroModelo()
+    modelo_antigo = registro.obter()
+
+    mtime = os.stat(vectorizer).st_mtime + 60
+    os.utime(vectorizer, (mtime, mtime))
+    modelo_novo = registro.obter()
+
+    assert modelo_novo is not modelo_antigo
+    assert modelo_novo is registro.obter()
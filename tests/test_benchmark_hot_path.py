@@ -0,0 +1,29 @@
+from benchmarks.hot_path import carregar_mensagens, comparar, resumir
+
+
+def test_resumir_calcula_percentis_e_vazao():
+    duracoes_ns = [ms * 1_000_000 for ms in range(1, 101)]
+
+    resultado = resumir("etapa", duracoes_ns, erros=2, total_ns=sum(duracoes_ns))
+
+    assert resultado.amostras == 100
+    assert resultado.erros == 2
+    assert resultado.p50_ms == 50.5
+    assert resultado.p95_ms == 95.05
+    assert resultado.p99_ms == 99.01
+    assert resultado.mensagens_por_segundo == round(100 / 5.05, 2)
+    assert resultado.pico_rss_mb > 0
+
+
+def test_comparar_aponta_regressao_no_p95():
+    anterior = [{"etapa": "parse_message", "p95_ms": 1.0}, {"etapa": "grafico_lucro", "p95_ms": 10.0}]
+    atual = [{"etapa": "parse_message", "p95_ms": 1.5}, {"etapa": "grafico_lucro", "p95_ms": 10.5}]
+
+    assert comparar(atual, anterior, limite=0.1) == ["parse_message"]
+
+
+def test_carregar_mensagens_usa_fixture_do_parser():
+    mensagens = carregar_mensagens()
+
+    assert mensagens
+    assert {"mensagem", "classificacao"} <= set(mensagens[0])
@@ -0,0 +1,27 @@
+import pytest
+from starlette.exceptions import HTTPException
+
+from src.dominio.bot.resources import autorizar_metricas
+
+
+def test_metricas_desligadas_sem_token(monkeypatch):
+    monkeypatch.delenv("METRICAS_TOKEN", raising=False)
+
+    with pytest.raises(HTTPException) as erro:
+        autorizar_metricas("Bearer qualquer")
+    assert erro.value.status_code == 404
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer errado", "segredo"])
+def test_metricas_exigem_o_token(monkeypatch, authorization):
+    monkeypatch.setenv("METRICAS_TOKEN", "segredo")
+
+    with pytest.raises(HTTPException) as erro:
+        autorizar_metricas(authorization)
+    assert erro.value.status_code == 401
+
+
+def test_metricas_com_token_valido(monkeypatch):
+    monkeypatch.setenv("METRICAS_TOKEN", "segredo")
+
+    autorizar_metricas("Bearer segredo")
@@ -0,0 +1,81 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.infra.database import replica
+from src.infra.database.replica import (
+    escopo_usuario,
+    get_session_leitura,
+    get_session_leitura_async,
+    registrar_escrita,
+)
+from src.utils.cache import CacheLRU
+
+
+@pytest.fixture
+def com_replica(redis_em_memoria):
+    sessao_replica = MagicMock(name="sessao_replica")
+    sessao_primario = MagicMock(name="sessao_primario")
+    with (
+        patch.object(replica, "SessionReplica", return_value=sessao_replica),
+        patch.object(replica, "get_session", return_value=sessao_primario),
+        patch.object(replica, "_fixados", CacheLRU(ttl=60)),
+    ):
+        yield sessao_replica, sessao_primario
+
+
+def test_leitura_vai_para_a_replica(com_replica):
+    sessao_replica, _ = com_replica
+
+    assert get_session_leitura() is sessao_replica
+    with escopo_usuario(uuid.uuid4()):
+        assert get_session_leitura() is sessao_replica
+
+
+def test_usuario_que_escreveu_le_do_primario(com_replica):
+    sessao_replica, sessao_primario = com_replica
+    usuario_id, outro_usuario_id = uuid.uuid4(), uuid.uuid4()
+
+    with escopo_usuario(usuario_id):
+        registrar_escrita()
+        assert get_session_leitura() is sessao_primario
+
+    with escopo_usuario(outro_usuario_id):
+        assert get_session_leitura() is sessao_replica
+
+
+def test_marca_de_escrita_vale_para_outros_processos(com_replica):
+    _, sessao_primario = com_replica
+    usuario_id = uuid.uuid4()
+
+    with escopo_usuario(usuario_id):
+        registrar_escrita()
+
+    with patch.object(replica, "_fixados", CacheLRU(ttl=60)), escopo_usuario(usuario_id):
+        assert get_session_leitura() is sessao_primario
+
+
+def test_sem_replica_tudo_no_primario():
+    sessao_primario = MagicMock()
+    with (
+        patch.object(replica, "SessionReplica", None),
+        patch.object(replica, "get_session", return_value=sessao_primario),
+    ):
+        assert get_session_leitura() is sessao_primario
+
+
+def test_leitura_async_segue_a_mesma_escolha(com_replica):
+    usuario_id = uuid.uuid4()
+
+    with (
+        patch.object(replica, "DATABASE_REPLICA_URL", "postgresql://replica/db"),
+        patch.object(replica, "get_session_async") as get_session_async,
+    ):
+        get_session_leitura_async()
+        get_session_async.assert_called_with("postgresql://replica/db")
+
+        with escopo_usuario(usuario_id):
+            registrar_escrita()
+            get_session_leitura_async()
+        get_session_async.assert_called_with(None)
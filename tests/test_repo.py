@@ -112,3 +112,38 @@ def test_roll_back_exception_uow(session, mock_transacao):
 
     nova_sessao = session
     assert nova_sessao.query(Transacao).filter_by(id=transacao.id).first() is None
+
+
+def test_totais_agregados_no_banco(session, mock_usuario, transacao_gen):
+    repo_transacao_leitura = RepoTransacaoLeitura(session=session)
+    uow = UnitOfWork(session_factory=lambda: session)
+    usuario = mock_usuario
+    with uow:
+        for dia in range(1, 4):
+            uow.repo_escrita.adicionar(
+                transacao_gen(usuario, 100.0, "Loja A", TipoTransacao.CREDITO, caixa=datetime(2024, 10, dia, 10))
+            )
+        for mes in (10, 11):
+            uow.repo_escrita.adicionar(
+                transacao_gen(usuario, 50.0, "Loja B", TipoTransacao.DEBITO, caixa=datetime(2024, mes, 1, 18))
+            )
+        uow.commit()
+
+    intervalo = Intervalo(inicio=datetime(2024, 10, 1), fim=datetime(2024, 11, 30))
+
+    fluxo = repo_transacao_leitura.fluxo_diario(intervalo, usuario.id)
+    assert [(resumo.dia, resumo.saldo) for resumo in fluxo] == [
+        (datetime(2024, 10, 1), 50.0),
+        (datetime(2024, 10, 2), 100.0),
+        (datetime(2024, 10, 3), 100.0),
+        (datetime(2024, 11, 1), -50.0),
+    ]
+
+    mensais = repo_transacao_leitura.totais_mensais(intervalo, usuario.id)
+    assert [(resumo.mes, resumo.receitas, resumo.despesas) for resumo in mensais] == [
+        (datetime(2024, 10, 1), 300.0, 50.0),
+        (datetime(2024, 11, 1), 0.0, 50.0),
+    ]
+
+    resumo = repo_transacao_leitura.totais_periodo(intervalo, usuario.id)
+    assert (resumo.receitas, resumo.despesas, resumo.quantidade, resumo.lucro) == (300.0, 100.0, 5, 200.0)
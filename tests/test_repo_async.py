@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+
+from src.infra.database.connection_async import fechar_engine_async, get_session_async, url_async
+
+asyncpg = pytest.importorskip("asyncpg")
+
+from src.dominio.bot.comandos import bot  # noqa: E402
+from src.dominio.transacao.repo import RepoTransacaoLeitura, RepoTransacaoLeituraAsync  # noqa: E402
+from src.dominio.usuario.entidade import Usuario  # noqa: E402
+from src.dominio.usuario.repo import RepoUsuarioLeituraAsync  # noqa: E402
+from src.infra.database.uow import AsyncUnitOfWork  # noqa: E402
+from src.libs.tipos import Intervalo  # noqa: E402
+
+
+def test_url_async_troca_o_driver():
+    assert url_async("postgresql://u:p@localhost:5432/db") == "postgresql+asyncpg://u:p@localhost:5432/db"
+
+
+@pytest_asyncio.fixture
+async def sessao_async():
+    sessao = get_session_async()
+    yield sessao
+    await sessao.close()
+    await fechar_engine_async()
+
+
+@pytest.mark.asyncio
+async def test_busca_usuario_com_assinatura_carregada(sessao_async, mock_usuario):
+    usuario = await RepoUsuarioLeituraAsync(sessao_async).buscar_por_telefone(mock_usuario.telefone)
+
+    assert usuario.id == mock_usuario.id
+    # acessar a relação não pode disparar lazy load numa AsyncSession
+    assert usuario.assinatura is None
+
+    usuarios = await RepoUsuarioLeituraAsync(sessao_async).buscar_por_telefones([mock_usuario.telefone, "0"])
+    assert list(usuarios) == [mock_usuario.telefone]
+
+
+@pytest.mark.asyncio
+async def test_agregacoes_iguais_ao_repositorio_sincrono(session, sessao_async, mock_usuario, transacao_gen):
+    session.add(transacao_gen(mock_usuario, 100.0, "Loja A", "debito", caixa=datetime(2024, 10, 2)))
+    session.add(transacao_gen(mock_usuario, 250.0, "Cliente B", "credito", caixa=datetime(2024, 10, 3)))
+    session.commit()
+    intervalo = Intervalo(datetime(2024, 10, 1), datetime(2024, 10, 31))
+
+    repo_async = RepoTransacaoLeituraAsync(sessao_async)
+    repo = RepoTransacaoLeitura(session)
+
+    assert await repo_async.totais_periodo(intervalo, mock_usuario.id) == repo.totais_periodo(
+        intervalo, mock_usuario.id
+    )
+    assert await repo_async.fluxo_diario(intervalo, mock_usuario.id) == repo.fluxo_diario(intervalo, mock_usuario.id)
+    linhas = [linha async for linha in repo_async.iterar_por_intervalo_e_usuario(intervalo, mock_usuario.id)]
+    assert linhas == [tuple(linha) for linha in repo.iterar_por_intervalo_e_usuario(intervalo, mock_usuario.id)]
+
+
+@pytest.mark.asyncio
+async def test_async_unit_of_work_commit_e_rollback(sessao_async):
+    async with AsyncUnitOfWork(session_factory=get_session_async) as uow:
+        uow.repo_escrita.adicionar(
+            Usuario(nome="Async", sobrenome="Teste", telefone="5594981360001", email="async@teste.com")
+        )
+        await uow.commit()
+
+    async with AsyncUnitOfWork(session_factory=get_session_async) as uow:
+        uow.repo_escrita.adicionar(
+            Usuario(nome="Descartado", sobrenome="Teste", telefone="5594981360002", email="descartado@teste.com")
+        )
+
+    repo = RepoUsuarioLeituraAsync(sessao_async)
+    assert await repo.buscar_por_telefone("5594981360001") is not None
+    assert await repo.buscar_por_telefone("5594981360002") is None
+
+
+@pytest.mark.asyncio
+async def test_comandos_leem_pelo_repositorio_async(session, mock_usuario, transacao_gen):
+    session.add(transacao_gen(mock_usuario, 80.0, "Loja A", "debito", caixa=datetime(2024, 10, 2)))
+    session.commit()
+    intervalo = Intervalo(datetime(2024, 10, 1), datetime(2024, 10, 31))
+
+    try:
+        resumo = await bot.ler_transacoes(lambda repo: repo.totais_periodo(intervalo, mock_usuario.id))
+    finally:
+        await fechar_engine_async()
+
+    assert resumo == RepoTransacaoLeitura(session).totais_periodo(intervalo, mock_usuario.id)
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from src.infra.database.connection import Session, escopo_sessao, get_session, metricas_pool
+
+
+def test_mesmo_escopo_mesma_sessao_e_fechada_ao_sair():
+    with escopo_sessao():
+        sessao = get_session()
+        assert get_session() is sessao
+        assert Session.registry.has()
+
+    assert get_session() is not sessao
+
+
+@pytest.mark.asyncio
+async def test_tarefas_concorrentes_nao_compartilham_sessao():
+    async def sessao_da_tarefa():
+        with escopo_sessao():
+            sessao = get_session()
+            await asyncio.sleep(0.01)
+            assert get_session() is sessao
+            return sessao
+
+    primeira, segunda = await asyncio.gather(sessao_da_tarefa(), sessao_da_tarefa())
+    assert primeira is not segunda
+
+
+def test_metricas_do_pool(session):
+    session.execute(text("select 1"))
+    metricas = metricas_pool()
+
+    assert metricas["em_uso"] >= 1
+    assert metricas["espera_checkout"]["quantidade"] >= 1
+    assert {"tamanho", "ociosas", "overflow", "esgotamentos", "sessoes_abertas"} <= metricas.keys()
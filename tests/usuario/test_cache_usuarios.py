@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError
+from sqlalchemy import inspect
+
+from src.dominio.usuario.cache import CacheUsuarios
+from src.dominio.usuario.entidade import Usuario
+from src.dominio.usuario.repo import RepoUsuarioLeitura
+
+
+@pytest.fixture
+def repo(session):
+    repo = RepoUsuarioLeitura(session=session)
+    repo.buscar_por_telefones = MagicMock(wraps=repo.buscar_por_telefones)
+    return repo
+
+
+def test_segunda_busca_nao_consulta_o_banco(redis_em_memoria, repo, mock_usuario):
+    cache = CacheUsuarios()
+
+    primeiro = cache.buscar_por_telefone(repo, mock_usuario.telefone)
+    segundo = cache.buscar_por_telefone(repo, mock_usuario.telefone)
+
+    assert primeiro.id == segundo.id == mock_usuario.id
+    repo.buscar_por_telefones.assert_called_once()
+
+
+def test_outro_processo_le_do_redis(redis_em_memoria, repo, mock_usuario):
+    CacheUsuarios().buscar_por_telefone(repo, mock_usuario.telefone)
+    usuario = CacheUsuarios().buscar_por_telefone(repo, mock_usuario.telefone)
+
+    assert usuario.nome == mock_usuario.nome
+    assert usuario.email == mock_usuario.email
+    assert usuario.senha is None
+    assert "assinatura" in inspect(usuario).unloaded
+    repo.buscar_por_telefones.assert_called_once()
+
+
+def test_telefone_sem_cadastro_fica_em_cache_ate_invalidar(redis_em_memoria, repo):
+    cache = CacheUsuarios()
+
+    assert cache.buscar_por_telefone(repo, "5594900000000") is None
+    assert cache.buscar_por_telefone(repo, "5594900000000") is None
+    repo.buscar_por_telefones.assert_called_once()
+
+    cache.invalidar("5594900000000")
+    cache.buscar_por_telefone(repo, "5594900000000")
+    assert repo.buscar_por_telefones.call_count == 2
+
+
+def test_ausencia_nao_sobrescreve_cadastro_concluido(redis_em_memoria, repo):
+    usuario = Usuario(
+        nome="Novo", sobrenome="Usuario", telefone="5594900000000", email="novo@caderneta.com", id=uuid4()
+    )
+    cache = CacheUsuarios()
+    cache.registrar(usuario)
+
+    # uma busca que consultou o banco antes do commit do cadastro grava a ausência depois dele
+    cache._gravar({usuario.telefone}, {})
+
+    encontrado = CacheUsuarios().buscar_por_telefone(repo, usuario.telefone)
+    assert encontrado.id == usuario.id
+    repo.buscar_por_telefones.assert_not_called()
+
+
+def test_redis_fora_consulta_o_banco(repo, mock_usuario):
+    with patch("src.dominio.usuario.cache.obter_redis") as obter_redis:
+        obter_redis.return_value.mget.side_effect = ConnectionError("fora")
+        obter_redis.return_value.pipeline.side_effect = ConnectionError("fora")
+        usuario = CacheUsuarios().buscar_por_telefone(repo, mock_usuario.telefone)
+
+    assert usuario.id == mock_usuario.id
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.dominio.bot.entidade import WhatsAppBot
+from src.infra.http import fechar_cliente_whatsapp, obter_cliente_whatsapp
+
+
+@pytest.mark.asyncio
+async def test_cliente_whatsapp_eh_compartilhado():
+    cliente = obter_cliente_whatsapp()
+
+    assert obter_cliente_whatsapp() is cliente
+
+    await fechar_cliente_whatsapp()
+    assert cliente.is_closed
+    assert obter_cliente_whatsapp() is not cliente
+    await fechar_cliente_whatsapp()
+
+
+def test_payload_de_documento_excel():
+    payload = WhatsAppBot._montar_payload("https://caderneta.chat/static/lancamentos.xlsx", "5594981362600", None, None)
+
+    assert payload["type"] == "document"
+    assert payload["document"]["link"] == "https://caderneta.chat/static/lancamentos.xlsx"
+
+
+def test_envio_sincrono_manda_json():
+    payload = WhatsAppBot._montar_payload("olá", "5594981362600", None, None)
+
+    with patch("src.dominio.bot.entidade.httpx.post") as post:
+        post.return_value = MagicMock(status_code=200, json=MagicMock(return_value={"messages": []}))
+        WhatsAppBot().enviar_requisicao("https://graph.facebook.com/messages", payload)
+
+    assert post.call_args.kwargs["json"] == payload
+    assert "data" not in post.call_args.kwargs
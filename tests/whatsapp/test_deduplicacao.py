@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from redis.exceptions import ConnectionError
+
+from src.dominio.bot.deduplicacao import DeduplicadorWebhook
+
+
+def test_reenvio_do_mesmo_wamid_eh_descartado(redis_em_memoria):
+    deduplicador = DeduplicadorWebhook(ttl=60)
+
+    assert deduplicador.primeira_entrega("wamid.1") is True
+    assert deduplicador.primeira_entrega("wamid.1") is False
+    assert deduplicador.primeira_entrega("wamid.2") is True
+    # o segundo "wamid.1" foi respondido pelo cache local, sem ir ao Redis
+    assert redis_em_memoria.chamadas == 2
+
+
+def test_reenvio_em_outro_processo_eh_descartado_pelo_redis(redis_em_memoria):
+    assert DeduplicadorWebhook(ttl=60).primeira_entrega("wamid.1") is True
+    assert DeduplicadorWebhook(ttl=60).primeira_entrega("wamid.1") is False
+
+
+def test_liberar_permite_reprocessar(redis_em_memoria):
+    deduplicador = DeduplicadorWebhook(ttl=60)
+
+    assert deduplicador.primeira_entrega("wamid.1") is True
+    deduplicador.liberar("wamid.1")
+    assert deduplicador.primeira_entrega("wamid.1") is True
+
+
+def test_sem_wamid_sempre_processa(redis_em_memoria):
+    deduplicador = DeduplicadorWebhook(ttl=60)
+
+    assert deduplicador.primeira_entrega(None) is True
+    assert deduplicador.primeira_entrega(None) is True
+    assert redis_em_memoria.chamadas == 0
+
+
+def test_redis_fora_nao_bloqueia_mensagem():
+    with patch("src.dominio.bot.deduplicacao.obter_redis") as obter_redis:
+        obter_redis.return_value.set.side_effect = ConnectionError("fora")
+        assert DeduplicadorWebhook(ttl=60).primeira_entrega("wamid.1") is True
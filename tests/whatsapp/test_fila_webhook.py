@@ -0,0 +1,164 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.dominio.bot.ingestao import FilaWebhook, processar_mensagens
+from src.utils.whatsapp_api import WhatsAppPayload
+
+
+@pytest.mark.asyncio
+async def test_workers_consomem_a_fila_e_registram_metricas():
+    processados = []
+
+    async def processador(dados):
+        await asyncio.sleep(0.01)
+        processados.append(dados["id"])
+
+    fila = FilaWebhook(processador=processador, workers=3, tamanho_maximo=10)
+    fila.iniciar()
+
+    assert all(fila.enfileirar({"id": i}) for i in range(6))
+    await fila.encerrar()
+
+    assert sorted(processados) == list(range(6))
+    metricas = fila.metricas()
+    assert metricas["enfileiradas"] == 6
+    assert metricas["processamento"]["quantidade"] == 6
+    assert metricas["processamento"]["p50_ms"] >= 10
+    assert metricas["espera"]["quantidade"] == 6
+    assert metricas["profundidade"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fila_cheia_recusa_a_entrega():
+    liberar = asyncio.Event()
+
+    async def processador(dados):
+        await liberar.wait()
+
+    fila = FilaWebhook(processador=processador, workers=1, tamanho_maximo=1)
+    fila.iniciar()
+
+    assert fila.enfileirar({"id": 1})
+    await asyncio.sleep(0)
+    assert fila.enfileirar({"id": 2})
+    assert fila.enfileirar({"id": 3}) is False
+    assert fila.metricas()["rejeitadas"] == 1
+
+    liberar.set()
+    await fila.encerrar()
+
+
+@pytest.mark.asyncio
+async def test_falha_de_um_webhook_nao_derruba_o_worker():
+    processados = []
+
+    async def processador(dados):
+        if dados["id"] == 1:
+            raise ValueError("payload quebrado")
+        processados.append(dados["id"])
+
+    fila = FilaWebhook(processador=processador, workers=1, tamanho_maximo=10)
+    fila.iniciar()
+    fila.enfileirar({"id": 1})
+    fila.enfileirar({"id": 2})
+    await fila.encerrar()
+
+    assert processados == [2]
+    assert fila.metricas()["falhas"] == 1
+
+
+def _mensagem(telefone, wamid):
+    return WhatsAppPayload(nome="", mensagem="ajuda", telefone=telefone, object="", wamid=wamid)
+
+
+@pytest.mark.asyncio
+async def test_lote_busca_cada_telefone_uma_vez_e_isola_falhas():
+    usuario = MagicMock(telefone="5594981362600")
+    cache = MagicMock()
+    cache.buscar_por_telefones.return_value = {"5594981362600": usuario}
+    cache.buscar_por_telefone.return_value = None
+    atendidas = []
+
+    async def atender(robo, usuario, mensagem):
+        if mensagem.wamid == "wamid.2":
+            raise ValueError("falhou")
+        atendidas.append(mensagem.wamid)
+
+    mensagens = [
+        _mensagem("5594981362600", "wamid.1"),
+        _mensagem("5594981362600", "wamid.2"),
+        _mensagem("5594981362601", "wamid.3"),
+        _mensagem("5594981362600", "wamid.4"),
+        _mensagem("5594981362601", "wamid.5"),
+    ]
+
+    with (
+        patch("src.dominio.bot.ingestao.RepoUsuarioLeitura") as repo,
+        patch("src.dominio.bot.ingestao.get_session"),
+        patch("src.dominio.bot.ingestao.cache_usuarios", cache),
+        patch("src.dominio.bot.ingestao.WhatsAppBot") as bot,
+        patch("src.dominio.bot.ingestao.atender_mensagem_whatsapp", side_effect=atender),
+        patch("src.dominio.bot.ingestao.responder_onboarding", new_callable=AsyncMock) as onboarding,
+        patch("src.dominio.bot.ingestao.avisar_assinatura_cancelada", new_callable=AsyncMock) as aviso,
+        patch("src.dominio.bot.ingestao.deduplicador_webhook") as deduplicador,
+    ):
+        bot.return_value.responder_async = AsyncMock()
+        with pytest.raises(ExceptionGroup):
+            await processar_mensagens(mensagens)
+
+    cache.buscar_por_telefones.assert_called_once_with(repo.return_value, {"5594981362600", "5594981362601"})
+    assert atendidas == ["wamid.1", "wamid.4"]
+    assert onboarding.await_count == 2
+    # a assinatura é conferida antes de cada atendimento de quem já tem cadastro
+    assert aviso.await_count == 3
+    # a segunda mensagem de quem está se cadastrando confere de novo se o cadastro foi concluído
+    cache.buscar_por_telefone.assert_called_once_with(repo.return_value, "5594981362601")
+    deduplicador.liberar.assert_called_once_with("wamid.2")
+
+
+@pytest.mark.asyncio
+async def test_falha_na_busca_dos_usuarios_libera_todos_os_wamids():
+    cache = MagicMock()
+    cache.buscar_por_telefones.side_effect = ConnectionError("banco fora")
+    mensagens = [_mensagem("5594981362600", "wamid.1"), _mensagem("5594981362601", "wamid.2")]
+
+    with (
+        patch("src.dominio.bot.ingestao.RepoUsuarioLeitura"),
+        patch("src.dominio.bot.ingestao.get_session"),
+        patch("src.dominio.bot.ingestao.WhatsAppBot"),
+        patch("src.dominio.bot.ingestao.cache_usuarios", cache),
+        patch("src.dominio.bot.ingestao.atender_mensagem_whatsapp", new_callable=AsyncMock) as atender,
+        patch("src.dominio.bot.ingestao.deduplicador_webhook") as deduplicador,
+    ):
+        with pytest.raises(ConnectionError):
+            await processar_mensagens(mensagens)
+
+    atender.assert_not_awaited()
+    assert [chamada.args[0] for chamada in deduplicador.liberar.call_args_list] == ["wamid.1", "wamid.2"]
+
+
+@pytest.mark.asyncio
+async def test_falha_no_aviso_de_assinatura_nao_impede_o_atendimento():
+    usuario = MagicMock(telefone="5594981362600")
+    cache = MagicMock()
+    cache.buscar_por_telefones.return_value = {"5594981362600": usuario}
+
+    with (
+        patch("src.dominio.bot.ingestao.RepoUsuarioLeitura"),
+        patch("src.dominio.bot.ingestao.get_session"),
+        patch("src.dominio.bot.ingestao.WhatsAppBot"),
+        patch("src.dominio.bot.ingestao.cache_usuarios", cache),
+        patch("src.dominio.bot.ingestao.atender_mensagem_whatsapp", new_callable=AsyncMock) as atender,
+        patch(
+            "src.dominio.bot.ingestao.avisar_assinatura_cancelada",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("stripe fora"),
+        ),
+        patch("src.dominio.bot.ingestao.deduplicador_webhook") as deduplicador,
+    ):
+        await processar_mensagens([_mensagem("5594981362600", "wamid.1")])
+
+    atender.assert_awaited_once()
+    deduplicador.liberar.assert_not_called()
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.infra.middlewares.whatsapp import WhatsAppOnboardMiddleware
+from src.utils.whatsapp_api import WhatsAppPayload
+
+
+async def webhook(request: Request) -> JSONResponse:
+    corpo = await request.body()
+    wamids = [mensagem.wamid for mensagem in request.state.mensagens_whatsapp]
+    return JSONResponse({"wamids": wamids, "tamanho": len(corpo)})
+
+
+async def outra_rota(request: Request) -> JSONResponse:
+    return JSONResponse({"tem_mensagens": hasattr(request.state, "mensagens_whatsapp")})
+
+
+@pytest.fixture
+def cliente():
+    app = Starlette(
+        routes=[Route("/bot/whatsapp", webhook, methods=["POST"]), Route("/outra", outra_rota, methods=["POST"])]
+    )
+    app.add_middleware(WhatsAppOnboardMiddleware)
+    return TestClient(app)
+
+
+def _mensagem(wamid):
+    return WhatsAppPayload(nome="", mensagem="ajuda", telefone="5594981362600", object="", wamid=wamid)
+
+
+def test_corpo_interpretado_uma_vez_e_entregue_a_rota(cliente):
+    with patch(
+        "src.infra.middlewares.whatsapp.mensagens_novas", return_value=[_mensagem("wamid.1")]
+    ) as mensagens_novas:
+        resposta = cliente.post("/bot/whatsapp", content=b'{"entry": []}')
+
+    assert resposta.json() == {"wamids": ["wamid.1"], "tamanho": 13}
+    mensagens_novas.assert_called_once_with({"entry": []})
+
+
+def test_sem_mensagens_novas_responde_sem_chamar_a_rota(cliente):
+    with patch("src.infra.middlewares.whatsapp.mensagens_novas", return_value=[]):
+        resposta = cliente.post("/bot/whatsapp", json={"entry": []})
+
+    assert resposta.json() == {"status": "skipped"}
+
+
+def test_json_invalido(cliente):
+    resposta = cliente.post("/bot/whatsapp", content=b"{")
+    assert resposta.status_code == 400
+
+
+def test_outras_rotas_passam_direto(cliente):
+    with patch("src.infra.middlewares.whatsapp.mensagens_novas") as mensagens_novas:
+        resposta = cliente.post("/outra", json={})
+
+    assert resposta.json() == {"tem_mensagens": False}
+    mensagens_novas.assert_not_called()
@@ -1,6 +1,6 @@
 import pytest
 
-from src.utils.whatsapp_api import parse_whatsapp_payload
+from src.utils.whatsapp_api import iterar_mensagens_whatsapp, parse_whatsapp_payload
 from tests.whatsapp.dados_teste import dados_teste
 
 
@@ -9,3 +9,81 @@ def test_whatsapp_payload_parser(payload, mensagem, wamid):
     dados = parse_whatsapp_payload(payload=payload)
     assert dados.mensagem == mensagem
     assert dados.wamid == wamid
+
+
+def _mensagem_texto(telefone, wamid, texto):
+    return {"from": telefone, "id": wamid, "timestamp": "1732065751", "text": {"body": texto}, "type": "text"}
+
+
+def test_iterar_mensagens_percorre_todas_as_entries_e_changes():
+    payload = {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "1",
+                "changes": [
+                    {
+                        "value": {
+                            "contacts": [
+                                {"profile": {"name": "Levy"}, "wa_id": "559481362600"},
+                                {"profile": {"name": "Ana"}, "wa_id": "559481362601"},
+                            ],
+                            "messages": [
+                                _mensagem_texto("559481362600", "wamid.1", "350 fornecedor pix"),
+                                _mensagem_texto("559481362601", "wamid.2", "ajuda"),
+                            ],
+                        },
+                        "field": "messages",
+                    },
+                    {
+                        "value": {
+                            "statuses": [{"id": "wamid.0", "recipient_id": "559481362600", "status": "read"}],
+                        },
+                        "field": "messages",
+                    },
+                ],
+            },
+            {
+                "id": "2",
+                "changes": [
+                    {
+                        "value": {
+                            "contacts": [{"profile": {"name": "Levy"}, "wa_id": "559481362600"}],
+                            "messages": [
+                                {"from": "559481362600", "id": "wamid.quebrado", "type": "text"},
+                                _mensagem_texto("559481362600", "wamid.3", "lucro"),
+                            ],
+                        },
+                        "field": "messages",
+                    }
+                ],
+            },
+        ],
+    }
+
+    mensagens = list(iterar_mensagens_whatsapp(payload))
+
+    assert [mensagem.wamid for mensagem in mensagens] == ["wamid.1", "wamid.2", "wamid.3"]
+    assert [mensagem.nome for mensagem in mensagens] == ["Levy", "Ana", "Levy"]
+    assert mensagens[0].telefone != mensagens[1].telefone
+    assert mensagens[0].telefone == mensagens[2].telefone
+
+
+def test_callback_de_status_nao_tem_mensagens():
+    payload = {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "1",
+                "changes": [
+                    {
+                        "value": {"statuses": [{"id": "wamid.0", "recipient_id": "559481362600", "status": "sent"}]},
+                        "field": "messages",
+                    }
+                ],
+            }
+        ],
+    }
+
+    assert list(iterar_mensagens_whatsapp(payload)) == []
+    assert parse_whatsapp_payload(payload) is None